@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+"""
+Number Predictor Benchmarks
+===========================
+Microbenchmarks for number_predictor.py.
+
+Usage:
+    python benchmarks/bench_number_predictor.py latency
+    python benchmarks/bench_number_predictor.py recurrence
+    python benchmarks/bench_number_predictor.py index
+    python benchmarks/bench_number_predictor.py bulk --rows 200000 --workers 1 2 4
+    python benchmarks/bench_number_predictor.py binary --rows 1000000
+    python benchmarks/bench_number_predictor.py adaptive --skew 0.9
+    python benchmarks/bench_number_predictor.py horizon --horizons 10 100 1000
+    python benchmarks/bench_number_predictor.py exact --bits 64 128
+    python benchmarks/bench_number_predictor.py profile
+"""
+
+import argparse
+import math
+import operator
+import os
+import random
+import sys
+import tempfile
+import time
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from known_sequences import KnownSequenceIndex
+from legacy_number_predictor import LegacyNumberPredictor
+from number_predictor import NumberPredictor, _isqrt, predict_csv
+
+
+# One representative sequence per pattern family
+LATENCY_CASES = [
+    ([1, 3, 5], "Arithmetic"),
+    ([2, 6, 18], "Geometric"),
+    ([1, 4, 9], "Perfect squares"),
+    ([1, 3, 6], "Triangular"),
+    ([2, 3, 5], "Fibonacci"),
+    ([1, 2, 6], "Factorial"),
+    ([1, -2, 4], "Alternating"),
+    ([1.5, 3.1, 5.7], "Approximate"),
+    ([0.37, -12.5, 88.1], "Noise"),
+]
+
+
+def time_call(func, sequence, number, repeat):
+    """Return the best per-call time of func(sequence) in microseconds."""
+    timer = timeit.Timer(lambda: func(sequence))
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e6
+
+
+def bench_latency(number, repeat):
+    """Compare single-sequence predict_next latency against the legacy cascade."""
+    legacy = LegacyNumberPredictor()
+    predictor = NumberPredictor()
+
+    print(f"{'Case':<16}{'legacy (us)':>12}{'current (us)':>14}{'speedup':>10}")
+    print("-" * 52)
+
+    legacy_total = 0.0
+    current_total = 0.0
+    for sequence, label in LATENCY_CASES:
+        expected = legacy.predict_next(sequence)
+        actual = predictor.predict_next(sequence)
+        if actual != expected:
+            raise AssertionError(f"{label}: {actual} != legacy {expected}")
+
+        legacy_time = time_call(legacy.predict_next, sequence, number, repeat)
+        current_time = time_call(predictor.predict_next, sequence, number, repeat)
+        legacy_total += legacy_time
+        current_total += current_time
+        print(f"{label:<16}{legacy_time:>12.2f}{current_time:>14.2f}{legacy_time / current_time:>9.1f}x")
+
+    print("-" * 52)
+    print(f"{'Mean':<16}{legacy_total / len(LATENCY_CASES):>12.2f}"
+          f"{current_total / len(LATENCY_CASES):>14.2f}{legacy_total / current_total:>9.1f}x")
+
+
+def recurrence_inputs(length, seed=0):
+    """Return (label, sequence) pairs of the given length for the recurrence benchmark."""
+    rng = random.Random(seed)
+    tribonacci = [0, 0, 1]
+    while len(tribonacci) < length:
+        tribonacci.append(tribonacci[-1] + tribonacci[-2] + tribonacci[-3])
+    # Random digits have no short recurrence, so Berlekamp-Massey runs to
+    # order length / 2: its worst case
+    digits = [rng.randint(-9, 9) for _ in range(length)]
+    return [("Tribonacci", tribonacci[:length]), ("Random digits", digits)]
+
+
+def bench_recurrence(lengths, repeat):
+    """Time find_recurrence against input length."""
+    predictor = NumberPredictor()
+    
+    print(f"{'Input':<16}{'length':>8}{'time (ms)':>12}{'x previous':>12}{'us / n^2':>10}")
+    print("-" * 58)
+    
+    previous = {}
+    for length in lengths:
+        for label, sequence in recurrence_inputs(length):
+            seconds = min(timeit.repeat(lambda: predictor.find_recurrence(sequence),
+                                        number=1, repeat=repeat))
+            growth = f"{seconds / previous[label]:.1f}x" if label in previous else "-"
+            previous[label] = seconds
+            print(f"{label:<16}{length:>8}{seconds * 1e3:>12.2f}{growth:>12}"
+                  f"{seconds / length ** 2 * 1e6:>10.3f}")
+
+
+def bench_index(max_terms, number, repeat):
+    """Report build time, file size, load time and lookup latency of the known sequence index."""
+    start = time.perf_counter()
+    index = KnownSequenceIndex.build(max_terms)
+    build_time = time.perf_counter() - start
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "known_sequences.bin")
+        index.save(path)
+        file_size = os.path.getsize(path)
+        start = time.perf_counter()
+        KnownSequenceIndex.load(path)
+        load_time = time.perf_counter() - start
+    
+    print(f"Windows indexed: {len(index)} ({len(index.names)} families, max_terms={max_terms})")
+    print(f"Build time:      {build_time * 1e3:.1f} ms")
+    print(f"File size:       {file_size / 1024:.1f} KiB")
+    print(f"Load time:       {load_time * 1e3:.1f} ms")
+    print()
+    
+    print(f"{'Lookup':<28}{'time (us)':>10}")
+    print("-" * 38)
+    for label, integers in [("3-term hit (factorial)", (2, 6, 24)),
+                            ("8-term hit (primes)", (2, 3, 5, 7, 11, 13, 17, 19)),
+                            ("Miss", (4, 9, 17))]:
+        print(f"{label:<28}{time_call(index.lookup, integers, number, repeat):>10.2f}")
+
+
+def write_bulk_input(path, rows, seed=0):
+    """Write a CSV of random 3-8 term sequences drawn from common pattern families."""
+    rng = random.Random(seed)
+    with open(path, "w") as file:
+        for _ in range(rows):
+            length = rng.randint(3, 8)
+            start = rng.randint(-50, 50)
+            step = rng.randint(-9, 9)
+            kind = rng.randrange(3)
+            if kind == 0:
+                sequence = [start + step * i for i in range(length)]
+            elif kind == 1:
+                sequence = [start * 2 ** i for i in range(length)]
+            else:
+                sequence = [round(rng.uniform(-100, 100), 3) for _ in range(length)]
+            file.write(",".join(map(str, sequence)) + "\n")
+
+
+def bench_bulk(rows, worker_counts, chunk_size):
+    """Throughput of predict_csv for each number of worker processes."""
+    with tempfile.TemporaryDirectory() as directory:
+        input_path = os.path.join(directory, "sequences.csv")
+        output_path = os.path.join(directory, "predictions.csv")
+        write_bulk_input(input_path, rows)
+        
+        print(f"{rows} rows, {os.cpu_count()} CPUs")
+        print(f"{'workers':>8}{'time (s)':>10}{'rows/sec':>12}{'speedup':>9}")
+        print("-" * 39)
+        baseline = None
+        for workers in worker_counts:
+            start = time.perf_counter()
+            predict_csv(input_path, output_path, workers, chunk_size)
+            seconds = time.perf_counter() - start
+            baseline = baseline or seconds
+            print(f"{workers:>8}{seconds:>10.2f}{rows / seconds:>12,.0f}{baseline / seconds:>8.1f}x")
+
+
+def bench_binary(rows):
+    """Compare a vectorized job fed from CSV text with one fed from a memory-mapped file."""
+    import numpy as np
+    from number_predictor_io import predict_file, write_input
+    
+    rng = np.random.default_rng(0)
+    starts = rng.integers(-50, 50, size=(rows, 1)).astype(np.float64)
+    steps = rng.integers(-9, 9, size=(rows, 1)).astype(np.float64)
+    sequences = starts + steps * np.arange(3)
+    sequences[::3] = rng.uniform(-100, 100, size=sequences[::3].shape).round(3)
+    
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, "jobs.csv")
+        binary_path = os.path.join(directory, "jobs.bin")
+        output_path = os.path.join(directory, "predictions.bin")
+        np.savetxt(csv_path, sequences, delimiter=",", fmt="%.17g")
+        write_input(binary_path, sequences)
+        
+        predictor = NumberPredictor()
+        start = time.perf_counter()
+        parsed = np.loadtxt(csv_path, delimiter=",")
+        parse_time = time.perf_counter() - start
+        start = time.perf_counter()
+        predictor.predict_batch(parsed)
+        csv_predict_time = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        predict_file(binary_path, output_path, predictor)
+        binary_time = time.perf_counter() - start
+        
+        print(f"{rows} rows")
+        print(f"{'Input':<10}{'size (MiB)':>12}{'read (s)':>10}{'total (s)':>11}{'rows/sec':>13}")
+        print("-" * 56)
+        csv_total = parse_time + csv_predict_time
+        print(f"{'CSV':<10}{os.path.getsize(csv_path) / 2 ** 20:>12.1f}{parse_time:>10.2f}"
+              f"{csv_total:>11.2f}{rows / csv_total:>13,.0f}")
+        print(f"{'Binary':<10}{os.path.getsize(binary_path) / 2 ** 20:>12.1f}{'mapped':>10}"
+              f"{binary_time:>11.2f}{rows / binary_time:>13,.0f}")
+
+
+def skewed_workload(kind, size, skew, seed=0):
+    """3-8 term sequences of which a skew fraction are of one kind and the rest noise."""
+    rng = random.Random(seed)
+    sequences = []
+    for _ in range(size):
+        length = rng.randint(3, 8)
+        start = rng.randint(1, 50)
+        step = rng.randint(1, 9)
+        if rng.random() >= skew:
+            sequences.append([round(rng.uniform(-100, 100), 3) for _ in range(length)])
+        elif kind == "arithmetic":
+            sequences.append([start + step * i for i in range(length)])
+        elif kind == "geometric":
+            sequences.append([start * 3 ** i for i in range(length)])
+        elif kind == "squares":
+            sequences.append([(start + i) ** 2 for i in range(length)])
+        elif kind == "factorial":
+            sequences.append([math.factorial(start % 10 + i) for i in range(length)])
+        elif kind == "noise":
+            sequences.append([round(rng.uniform(-100, 100), 3) for _ in range(length)])
+    return sequences
+
+
+def bench_adaptive(size, skew, repeat):
+    """Compare the full detector scan with the adaptive cascade on skewed workloads."""
+    print(f"{size} sequences per workload, {skew:.0%} of one kind")
+    print(f"{'Workload':<12}{'full (us)':>11}{'adaptive (us)':>15}{'speedup':>9}  first detectors")
+    print("-" * 80)
+    for kind in ["arithmetic", "geometric", "squares", "factorial", "noise"]:
+        sequences = skewed_workload(kind, size, skew)
+        full = NumberPredictor()
+        adaptive = NumberPredictor(adaptive=True)
+        # One pass to check the answers and let the cascade settle
+        for sequence in sequences:
+            expected = full.predict_next(sequence)
+            actual = adaptive.predict_next(sequence)
+            if actual != expected and expected == expected:
+                raise AssertionError(f"{sequence}: {actual} != full scan {expected}")
+        
+        def run(predictor):
+            return min(timeit.repeat(lambda: [predictor.predict_next(s) for s in sequences],
+                                     number=1, repeat=repeat)) / size * 1e6
+        
+        full_time = run(full)
+        adaptive_time = run(adaptive)
+        order = ", ".join(name.strip("_").replace("_sequence", "")
+                          for name in adaptive.detector_order[:3])
+        print(f"{kind:<12}{full_time:>11.2f}{adaptive_time:>15.2f}"
+              f"{full_time / adaptive_time:>8.1f}x  {order}")
+
+
+def repeated_prediction(predictor, sequence, k):
+    """The next k terms by appending each prediction and detecting again."""
+    sequence = list(sequence)
+    for _ in range(k):
+        sequence.append(predictor.predict_next(sequence)[0])
+    return sequence[-k:]
+
+
+def bench_horizon(horizons, repeat):
+    """Compare predict_horizon with re-running predict_next once per term."""
+    predictor = NumberPredictor()
+    cases = [([3, 7, 11], "Arithmetic"), ([1, 1, 2], "Fibonacci"), ([1, 4, 9, 16], "Squares"),
+             ([0, 0, 1, 1, 2, 4, 7], "Recurrence")]
+    
+    print(f"{'Case':<12}{'k':>6}{'repeated (ms)':>15}{'horizon (ms)':>14}{'speedup':>10}")
+    print("-" * 57)
+    for sequence, label in cases:
+        for k in horizons:
+            repeated = min(timeit.repeat(lambda: repeated_prediction(predictor, sequence, k),
+                                         number=1, repeat=repeat))
+            horizon = min(timeit.repeat(lambda: list(predictor.predict_horizon(sequence, k)[0]),
+                                        number=1, repeat=repeat))
+            print(f"{label:<12}{k:>6}{repeated * 1e3:>15.2f}{horizon * 1e3:>14.3f}"
+                  f"{repeated / horizon:>9.0f}x")
+
+
+def bench_profile(size, repeat):
+    """Per-detector profile of a mixed workload, and what profiling costs."""
+    kinds = ["arithmetic", "geometric", "squares", "factorial", "noise"]
+    sequences = [s for i, kind in enumerate(kinds)
+                 for s in skewed_workload(kind, size // len(kinds), 1.0, seed=i)]
+    random.Random(0).shuffle(sequences)
+    predictor = NumberPredictor()
+    
+    def run():
+        return min(timeit.repeat(lambda: [predictor.predict_next(s) for s in sequences],
+                                 number=1, repeat=repeat)) / len(sequences) * 1e6
+    
+    plain = run()
+    with predictor.profile():
+        profiled = run()
+    predictor.clear_stats()
+    with predictor.profile():
+        for sequence in sequences:
+            predictor.predict_next(sequence)
+    
+    stats = predictor.stats()
+    total_ns = sum(counters.time_ns for counters in stats.values())
+    print(f"{len(sequences)} mixed sequences: {plain:.2f} us per prediction, "
+          f"{profiled:.2f} us while profiling")
+    print(f"{'Detector':<28}{'calls':>8}{'hits':>8}{'errors':>8}{'ns/call':>10}{'share':>8}")
+    print("-" * 70)
+    for name, counters in sorted(stats.items(), key=lambda item: -item[1].time_ns):
+        print(f"{name:<28}{counters.calls:>8}{counters.hits:>8}{counters.errors:>8}"
+              f"{counters.time_ns / max(counters.calls, 1):>10.0f}"
+              f"{counters.time_ns / max(total_ns, 1):>8.1%}")
+
+
+def large_integer_corpus(family, bits, size, seed=0):
+    """Random 5-term int sequences of one family with terms of roughly bits bits."""
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(size):
+        start = rng.getrandbits(bits) | 1 << (bits - 1)
+        if family == "Arithmetic":
+            step = rng.randint(1, 1000)
+            corpus.append([start + step * i for i in range(5)])
+        elif family == "Geometric":
+            first = 3 ** (bits * 2 // 3 - rng.randrange(4))
+            corpus.append([first * 3 ** i for i in range(5)])
+        elif family == "Perfect squares":
+            root = _isqrt(start)
+            corpus.append([(root + i) ** 2 for i in range(5)])
+        elif family == "Triangular":
+            n = _isqrt(2 * start)
+            corpus.append([(n + i) * (n + i + 1) // 2 for i in range(5)])
+        else:
+            corpus.append([rng.getrandbits(bits) for _ in range(5)])
+    return corpus
+
+
+def bench_exact(bit_sizes, size, repeat):
+    """
+    Time large int sequences on the exact path against the same values as
+    floats, and count how often each predicts the true next term exactly.
+    """
+    predictor = NumberPredictor()
+    families = ["Arithmetic", "Geometric", "Perfect squares", "Triangular", "Noise"]
+    
+    print(f"{'Family':<17}{'bits':>6}{'float (us)':>12}{'exact (us)':>12}"
+          f"{'float exact':>13}{'int exact':>11}")
+    print("-" * 71)
+    for bits in bit_sizes:
+        for family in families:
+            sequences = large_integer_corpus(family, bits, size)
+            answers = [sequence.pop() for sequence in sequences]
+            floats = [[float(x) for x in sequence] for sequence in sequences]
+            times, correct = [], []
+            for corpus in (floats, sequences):
+                seconds = min(timeit.repeat(lambda: list(map(predictor.predict_next, corpus)),
+                                            number=1, repeat=repeat))
+                times.append(seconds / size * 1e6)
+                predictions = [predictor.predict_next(sequence)[0] for sequence in corpus]
+                correct.append(sum(map(operator.eq, predictions, answers)) / size)
+            accuracy = "" if family == "Noise" else f"{correct[0]:>13.0%}{correct[1]:>11.0%}"
+            print(f"{family:<17}{bits:>6}{times[0]:>12.2f}{times[1]:>12.2f}{accuracy}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    latency = subparsers.add_parser("latency", help="single-call predict_next latency")
+    latency.add_argument("--number", type=int, default=20000, help="calls per timing run")
+    latency.add_argument("--repeat", type=int, default=5, help="timing runs per case")
+
+    recurrence = subparsers.add_parser("recurrence", help="find_recurrence scaling with length")
+    recurrence.add_argument("--lengths", type=int, nargs="+", default=[32, 64, 128, 256],
+                            help="sequence lengths to time")
+    recurrence.add_argument("--repeat", type=int, default=3, help="timing runs per length")
+
+    index = subparsers.add_parser("index", help="known sequence index size and speed")
+    index.add_argument("--max-terms", type=int, default=10000, help="terms per open-ended family")
+    index.add_argument("--number", type=int, default=100000, help="calls per timing run")
+    index.add_argument("--repeat", type=int, default=5, help="timing runs per case")
+
+    bulk = subparsers.add_parser("bulk", help="predict_csv throughput by worker count")
+    bulk.add_argument("--rows", type=int, default=200000, help="rows in the generated CSV")
+    bulk.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4],
+                      help="worker counts to time")
+    bulk.add_argument("--chunk-size", type=int, default=10000, help="rows per chunk")
+
+    binary = subparsers.add_parser("binary", help="CSV text against memory-mapped binary jobs")
+    binary.add_argument("--rows", type=int, default=1000000, help="rows in the generated job")
+
+    adaptive = subparsers.add_parser("adaptive", help="adaptive cascade on skewed workloads")
+    adaptive.add_argument("--size", type=int, default=20000, help="sequences per workload")
+    adaptive.add_argument("--skew", type=float, default=0.9,
+                          help="fraction of each workload drawn from its dominant kind")
+    adaptive.add_argument("--repeat", type=int, default=3, help="timing runs per workload")
+
+    horizon = subparsers.add_parser("horizon", help="predict_horizon against repeated predict_next")
+    horizon.add_argument("--horizons", type=int, nargs="+", default=[10, 100, 1000],
+                         help="numbers of terms to predict")
+    horizon.add_argument("--repeat", type=int, default=3, help="timing runs per case")
+
+    exact = subparsers.add_parser("exact", help="large integers: exact path against floats")
+    exact.add_argument("--bits", type=int, nargs="+", default=[48, 64, 128, 256],
+                       help="approximate sizes of the terms, in bits")
+    exact.add_argument("--size", type=int, default=2000, help="sequences per family")
+    exact.add_argument("--repeat", type=int, default=3, help="timing runs per case")
+
+    profile = subparsers.add_parser("profile", help="per-detector calls, hits and time")
+    profile.add_argument("--size", type=int, default=20000, help="sequences in the workload")
+    profile.add_argument("--repeat", type=int, default=3, help="timing runs")
+
+    args = parser.parse_args()
+    if args.benchmark == "latency":
+        bench_latency(args.number, args.repeat)
+    elif args.benchmark == "recurrence":
+        bench_recurrence(args.lengths, args.repeat)
+    elif args.benchmark == "index":
+        bench_index(args.max_terms, args.number, args.repeat)
+    elif args.benchmark == "bulk":
+        bench_bulk(args.rows, args.workers, args.chunk_size)
+    elif args.benchmark == "binary":
+        bench_binary(args.rows)
+    elif args.benchmark == "adaptive":
+        bench_adaptive(args.size, args.skew, args.repeat)
+    elif args.benchmark == "horizon":
+        bench_horizon(args.horizons, args.repeat)
+    elif args.benchmark == "exact":
+        bench_exact(args.bits, args.size, args.repeat)
+    elif args.benchmark == "profile":
+        bench_profile(args.size, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Snake Game Benchmarks
+=====================
+Microbenchmarks for snake_game.py and snake_sim.py.
+
+Usage:
+    python benchmarks/bench_snake_game.py body --lengths 100 1000 4000 8000
+    python benchmarks/bench_snake_game.py sim --ticks 1000000
+    python benchmarks/bench_snake_game.py pathfinding --sizes 32 64 128 256
+    python benchmarks/bench_snake_game.py swarm --enemies 1 50 100 250 500 --grid 128
+"""
+
+import argparse
+import os
+import random
+import subprocess
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import legacy_snake_game
+from legacy_snake_game import LegacyGame
+from snake_sim import ACTIONS, AntiSnake, Body, DistanceField, SnakeSim
+
+
+def hamiltonian_cycle(size):
+    """
+    Cells of an even size x size grid in an order that visits each once and
+    returns to the start: along the top row, snaking down the other columns,
+    then back up the first column.
+    """
+    cycle = [(x, 0) for x in range(size)]
+    for y in range(1, size):
+        columns = range(size - 1, 0, -1) if y % 2 else range(1, size)
+        cycle.extend((x, y) for x in columns)
+    cycle.extend((0, y) for y in range(size - 1, 0, -1))
+    return cycle
+
+
+def bench_body(lengths, grid, ticks):
+    """Time per tick for snakes thousands of cells long: list bodies against the deque body."""
+    # The legacy module reads the grid size from CELL_NUMBER; widen it so long snakes fit
+    legacy_snake_game.CELL_NUMBER = grid
+    cycle = hamiltonian_cycle(grid)
+    steps = [(b[0] - a[0], b[1] - a[1]) for a, b in zip(cycle, cycle[1:] + cycle[:1])]
+
+    def run(game, make_body, make_direction, length):
+        game.snake.body = make_body([cycle[i] for i in range(length - 1, -1, -1)])
+        game.food.pos = make_direction((-1, -1))  # Off the grid: never eaten, always checked
+        directions = [make_direction(step) for step in steps]
+        snake, anti_snake = game.snake, game.anti_snake
+        start = time.perf_counter()
+        for tick in range(ticks):
+            # The per-tick work of Game.update, without moving the anti-snake
+            snake.direction = directions[(length - 1 + tick) % len(cycle)]
+            snake.move_snake()
+            anti_snake.ai_pathfinding(snake.body[0])
+            game.check_collision()
+            game.check_fail()
+            game.check_anti_snake_collision()
+        return (time.perf_counter() - start) / ticks * 1e6
+
+    vector = legacy_snake_game.pygame.Vector2
+    print(f"{ticks} ticks on a {grid}x{grid} grid, the snake following a cycle through every cell")
+    print(f"{'length':>8}{'list (us/tick)':>16}{'deque (us/tick)':>17}{'speedup':>9}")
+    print("-" * 50)
+    for length in lengths:
+        legacy = run(LegacyGame(), lambda cells: [vector(cell) for cell in cells], vector, length)
+        current = run(SnakeSim(grid), Body, tuple, length)
+        print(f"{length:>8,}{legacy:>16.1f}{current:>17.1f}{legacy / current:>8.0f}x")
+
+
+def bench_sim(ticks, seed):
+    """
+    Headless ticks per second with random turns, restarting after each game:
+    the pygame game's update loop against SnakeSim.step.
+    """
+    rng = random.Random(seed)
+    actions = [rng.choice(ACTIONS) if rng.random() < 0.1 else None for _ in range(4096)]
+
+    def run_legacy():
+        vectors = {action: legacy_snake_game.pygame.Vector2(action) for action in ACTIONS}
+        game = LegacyGame()
+        start = time.perf_counter()
+        for tick in range(ticks):
+            action = actions[tick % len(actions)]
+            if action is not None and vectors[action] != -game.snake.direction:
+                game.snake.direction = vectors[action]
+            game.update()
+            if game.game_over:
+                game.restart_game()
+        return time.perf_counter() - start
+
+    def run_sim():
+        sim = SnakeSim(seed=seed)
+        start = time.perf_counter()
+        for tick in range(ticks):
+            if not sim.step(actions[tick % len(actions)]):
+                sim.restart_game()
+        return time.perf_counter() - start
+
+    # Whether the core loads pygame is checked in a fresh interpreter
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    check = subprocess.run([sys.executable, "-c", "import sys, snake_sim; print('pygame' in sys.modules)"],
+                           cwd=root, capture_output=True, text=True, check=True)
+    print(f"{ticks:,} ticks on a {legacy_snake_game.CELL_NUMBER}x{legacy_snake_game.CELL_NUMBER} grid, "
+          f"random turns; snake_sim imports pygame: {check.stdout.strip()}")
+    print(f"{'engine':<12}{'ticks/s':>12}{'us/tick':>10}")
+    print("-" * 34)
+    for name, run in (("pygame game", run_legacy), ("SnakeSim", run_sim)):
+        seconds = run()
+        print(f"{name:<12}{ticks / seconds:>12,.0f}{seconds / ticks * 1e6:>10.2f}")
+
+
+def bench_pathfinding(sizes, repeats):
+    """
+    Per-tick pathfinding cost against grid size: the greedy step, against
+    one BFS distance field over the whole grid plus a chaser reading its
+    move from it.
+    """
+    def per_call(function, calls):
+        start = time.perf_counter()
+        for _ in range(calls):
+            function()
+        return (time.perf_counter() - start) / calls * 1e6
+
+    print("Player snake of grid-size cells in the middle of the grid, chaser in a corner")
+    print(f"{'grid':>6}{'cells':>8}{'greedy (us)':>13}{'BFS field (us)':>16}{'ns/cell':>9}"
+          f"{'read move (us)':>16}")
+    print("-" * 68)
+    for size in sizes:
+        middle = size // 2
+        player = Body([(x, middle) for x in range(size - 3, 2, -1)])
+        chaser = AntiSnake(size)
+        target = player.head
+        field = DistanceField(size)
+        field.compute(target, (player, chaser.body))
+        calls = max(repeats * 32 // size, 3)
+        greedy = per_call(lambda: chaser.ai_pathfinding(target), calls * 100)
+        bfs = per_call(lambda: field.compute(target, (player, chaser.body)), calls)
+        read = per_call(lambda: field.next_move(chaser.body.head), calls * 100)
+        print(f"{size:>6}{size * size:>8,}{greedy:>13.2f}{bfs:>16.0f}"
+              f"{bfs * 1000 / (size * size):>9.0f}{read:>16.2f}")
+
+
+def bench_swarm(counts, grid, ticks, seed):
+    """
+    Tick time against the number of anti-snakes on a large grid: greedy
+    steps, one shared BFS field per tick, and (for one tick) a separate BFS
+    for every anti-snake.
+    """
+    def run(pathfinding, enemies):
+        sim = SnakeSim(grid, seed=seed, pathfinding=pathfinding, enemies=enemies)
+        rng = random.Random(seed)
+        spent = 0.0
+        for _ in range(ticks):
+            action = rng.choice(ACTIONS) if rng.random() < 0.1 else None
+            start = time.perf_counter()
+            playing = sim.step(action)
+            spent += time.perf_counter() - start
+            if not playing:
+                sim.restart_game()  # Not timed: spawning the swarm is not part of a tick
+        return spent / ticks * 1e3
+
+    def run_per_enemy(enemies):
+        # What each anti-snake searching on its own would cost for one tick
+        sim = SnakeSim(grid, seed=seed, enemies=enemies)
+        field = DistanceField(grid)
+        bodies = [sim.snake.body] + [anti_snake.body for anti_snake in sim.anti_snakes]
+        start = time.perf_counter()
+        for anti_snake in sim.anti_snakes:
+            field.compute(sim.snake.body.head, bodies)
+            anti_snake.follow_field(field)
+        return (time.perf_counter() - start) * 1e3
+
+    print(f"{ticks} ticks per row on a {grid}x{grid} grid, random turns (restarts not timed)")
+    print(f"{'enemies':>8}{'greedy (ms)':>13}{'shared BFS (ms)':>17}{'BFS each (ms)':>15}")
+    print("-" * 53)
+    for enemies in counts:
+        greedy = run("greedy", enemies)
+        shared = run("bfs", enemies)
+        each = run_per_enemy(enemies)
+        print(f"{enemies:>8}{greedy:>13.2f}{shared:>17.2f}{each:>15.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    body = subparsers.add_parser("body", help="per-tick cost against snake length")
+    body.add_argument("--lengths", type=int, nargs="+", default=[100, 1000, 4000, 8000],
+                      help="snake lengths")
+    body.add_argument("--grid", type=int, default=100, help="grid size (even)")
+    body.add_argument("--ticks", type=int, default=500, help="ticks per length")
+
+    sim = subparsers.add_parser("sim", help="headless ticks per second")
+    sim.add_argument("--ticks", type=int, default=1000000, help="ticks to run")
+    sim.add_argument("--seed", type=int, default=0, help="seed for the turns and the game")
+
+    pathfinding = subparsers.add_parser("pathfinding", help="per-tick pathfinding cost against grid size")
+    pathfinding.add_argument("--sizes", type=int, nargs="+", default=[32, 64, 128, 256],
+                             help="grid sizes")
+    pathfinding.add_argument("--repeats", type=int, default=200,
+                             help="BFS runs on a 32x32 grid, scaled down for larger grids")
+
+    swarm = subparsers.add_parser("swarm", help="tick time against the number of anti-snakes")
+    swarm.add_argument("--enemies", type=int, nargs="+", default=[1, 50, 100, 250, 500],
+                       help="anti-snake counts")
+    swarm.add_argument("--grid", type=int, default=128, help="grid size")
+    swarm.add_argument("--ticks", type=int, default=200, help="ticks per count")
+    swarm.add_argument("--seed", type=int, default=0, help="seed for the turns and the games")
+
+    args = parser.parse_args()
+    if args.benchmark == "body":
+        bench_body(args.lengths, args.grid, args.ticks)
+    elif args.benchmark == "sim":
+        bench_sim(args.ticks, args.seed)
+    elif args.benchmark == "pathfinding":
+        bench_pathfinding(args.sizes, args.repeats)
+    elif args.benchmark == "swarm":
+        bench_swarm(args.enemies, args.grid, args.ticks, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""
+Tic-Tac-Toe Benchmarks
+======================
+Microbenchmarks for tic_tac_toe.py.
+
+Usage:
+    python benchmarks/bench_tic_tac_toe.py evaluate
+    python benchmarks/bench_tic_tac_toe.py solved
+    python benchmarks/bench_tic_tac_toe.py search
+    python benchmarks/bench_tic_tac_toe.py scaling --sizes 3 15 50 100
+    python benchmarks/bench_tic_tac_toe.py mcts --sizes 9 15 --workers 1 4
+    python benchmarks/bench_tic_tac_toe.py selfplay --games 1000000 --workers 1 2 4 8
+    python benchmarks/bench_tic_tac_toe.py redraw
+"""
+
+import argparse
+import os
+import random
+import statistics
+import struct
+import sys
+import tempfile
+import threading
+import time
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from legacy_tic_tac_toe import LegacyTicTacToe
+from tic_tac_toe import ComputerPlayer, MCTSPlayer, TicTacToe, bitboard_winner
+from tic_tac_toe_selfplay import DEFAULT_CHUNK_SIZE, play_games
+from tic_tac_toe_solver import SolvedTable
+
+
+def random_positions(count, seed=0):
+    """
+    Positions reached by random play, as lists of the positions played in
+    order; play stops early at a random move or when the game is over.
+    """
+    rng = random.Random(seed)
+    games = []
+    for _ in range(count):
+        moves = list(range(1, 10))
+        rng.shuffle(moves)
+        game = TicTacToe()
+        played = []
+        for position in moves[:rng.randint(0, 9)]:
+            game.make_move(position)
+            played.append(position)
+            if game.check_winner():
+                break
+            game.switch_player()
+        games.append(played)
+    return games
+
+
+def bench_evaluate(count, repeat):
+    """Winner checks per second: nested lists, the TicTacToe API and raw bitboards."""
+    legacy_games, games, bitboards = [], [], []
+    for moves in random_positions(count):
+        legacy, game = LegacyTicTacToe(), TicTacToe()
+        for position in moves:
+            for state in (legacy, game):
+                state.make_move(position)
+                state.switch_player()
+        if legacy.check_winner() != game.check_winner():
+            raise AssertionError(f"{moves}: {game.check_winner()} != {legacy.check_winner()}")
+        legacy_games.append(legacy)
+        games.append(game)
+        bitboards.append((game.x_bits, game.o_bits))
+    
+    def rate(function):
+        return count / min(timeit.repeat(function, number=1, repeat=repeat))
+    
+    cases = [
+        ("nested lists", rate(lambda: [g.check_winner() for g in legacy_games])),
+        ("check_winner", rate(lambda: [g.check_winner() for g in games])),
+        ("bitboard_winner", rate(lambda: [bitboard_winner(x, o) for x, o in bitboards])),
+    ]
+    print(f"{count} random positions")
+    print(f"{'Evaluation':<18}{'positions/sec':>16}{'speedup':>10}")
+    print("-" * 44)
+    for label, positions_per_second in cases:
+        print(f"{label:<18}{positions_per_second:>16,.0f}{positions_per_second / cases[0][1]:>9.1f}x")
+
+
+def bench_solved(count, repeat):
+    """Solving at start-up against mapping the solved table, and lookups per second."""
+    start = time.perf_counter()
+    built = SolvedTable.build()
+    solve_time = time.perf_counter() - start
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "solved.bin")
+        built.save(path)
+        size = os.path.getsize(path)
+        load_time = min(timeit.repeat(lambda: SolvedTable.load(path), number=1, repeat=repeat))
+        table = SolvedTable.load(path)
+        
+        positions = []
+        for moves in random_positions(count):
+            game = TicTacToe()
+            for position in moves:
+                game.make_move(position)
+                game.switch_player()
+            positions.append((game.x_bits, game.o_bits))
+        lookup = table.lookup
+        seconds = min(timeit.repeat(lambda: [lookup(x, o) for x, o in positions],
+                                    number=1, repeat=repeat))
+        del table, lookup
+    
+    print(f"Solve all {built.reachable} positions: {solve_time * 1e3:8.1f} ms")
+    print(f"Map the {size}-byte table:     {load_time * 1e3:8.3f} ms")
+    print(f"Perfect-play lookups:          {count / seconds:,.0f} per second")
+
+
+SEARCH_CONFIGURATIONS = [
+    ("minimax", dict(pruning=False, transpositions=False, symmetry=False)),
+    ("+ alpha-beta", dict(transpositions=False, symmetry=False)),
+    ("+ table", dict(symmetry=False)),
+    ("+ symmetry", dict()),
+]
+
+
+def self_play(player):
+    """Play one game of player against itself; returns its SearchStats, one per move."""
+    game = TicTacToe()
+    moves = []
+    while True:
+        game.make_move(player.choose_move(game))
+        moves.append(player.last_search)
+        if game.check_winner():
+            return moves
+        game.switch_player()
+
+
+def bench_search():
+    """Positions searched and time for a self-play game, adding one reduction at a time."""
+    print("One self-play game from the empty board (the table is kept between moves)")
+    print(f"{'Search':<14}{'first move':>12}{'whole game':>12}{'hit rate':>10}{'time (ms)':>11}"
+          f"{'saving':>9}")
+    print("-" * 68)
+    baseline = None
+    for label, options in SEARCH_CONFIGURATIONS:
+        player = ComputerPlayer(**options)
+        start = time.perf_counter()
+        moves = self_play(player)
+        elapsed = time.perf_counter() - start
+        nodes = sum(stats.nodes for stats in moves)
+        lookups = sum(stats.lookups for stats in moves)
+        hits = sum(stats.hits for stats in moves)
+        baseline = baseline or nodes
+        hit_rate = f"{hits / lookups:.0%}" if lookups else "-"
+        print(f"{label:<14}{moves[0].nodes:>12,}{nodes:>12,}{hit_rate:>10}{elapsed * 1e3:>11.1f}"
+              f"{baseline / nodes:>8.0f}x")
+
+
+def random_game(size, win_length, max_moves, rng):
+    """The positions of one random game on a size x size board, to its end or max_moves."""
+    game = TicTacToe(size, win_length)
+    played = []
+    for position in rng.sample(range(1, size * size + 1), min(max_moves, size * size)):
+        game.make_move(position)
+        played.append(position)
+        if game.check_winner():
+            break
+        game.switch_player()
+    return played
+
+
+def bench_scaling(sizes, games, max_moves):
+    """Time per move on N x N boards: checking the last move's lines against a full scan."""
+    rng = random.Random(0)
+    print(f"{games} random games per board, up to {max_moves} moves each; "
+          "time per move includes make_move")
+    print(f"{'Board':<10}{'K':>3}{'moves':>8}{'incremental (us)':>18}{'full scan (us)':>16}"
+          f"{'speedup':>9}")
+    print("-" * 64)
+    for size in sizes:
+        win_length = min(size, 5)
+        played = [random_game(size, win_length, max_moves, rng) for _ in range(games)]
+        moves = sum(len(positions) for positions in played)
+        
+        def replay(check):
+            elapsed = 0.0
+            for positions in played:
+                game = TicTacToe(size, win_length)
+                start = time.perf_counter()
+                for position in positions:
+                    game.make_move(position)
+                    check(game)
+                    game.switch_player()
+                elapsed += time.perf_counter() - start
+            return elapsed / moves * 1e6
+        
+        incremental = replay(TicTacToe.check_winner)
+        full_scan = replay(lambda game: game._scan_winner() or game.empty_count == 0)
+        print(f"{f'{size}x{size}':<10}{win_length:>3}{moves:>8}{incremental:>18.2f}"
+              f"{full_scan:>16.2f}{full_scan / incremental:>8.0f}x")
+
+
+def bench_mcts(sizes, workers_list, time_limit, moves):
+    """Simulations per second for the MCTS player over the opening moves of a self-play game."""
+    print(f"MCTS self-play, {moves} moves at {time_limit:g} s each (the tree is kept between moves)")
+    print(f"{'Board':<10}{'K':>3}{'workers':>9}{'simulations/move':>18}{'per second':>12}"
+          f"{'reused/move':>13}")
+    print("-" * 65)
+    for size in sizes:
+        win_length = min(size, 5)
+        for workers in workers_list:
+            player = MCTSPlayer(time_limit, workers=workers, seed=0)
+            game = TicTacToe(size, win_length)
+            searches = []
+            try:
+                for _ in range(moves):
+                    game.make_move(player.choose_move(game))
+                    searches.append(player.last_search)
+                    if game.check_winner():
+                        break
+                    game.switch_player()
+            finally:
+                player.close()
+            simulations = sum(stats.simulations for stats in searches)
+            seconds = sum(stats.seconds for stats in searches)
+            reused = sum(stats.reused for stats in searches)
+            print(f"{f'{size}x{size}':<10}{win_length:>3}{workers:>9}"
+                  f"{simulations / len(searches):>18,.0f}{simulations / seconds:>12,.0f}"
+                  f"{reused / len(searches):>13,.0f}")
+    print(f"({os.cpu_count()} CPUs; workers beyond that share them)")
+
+
+def bench_selfplay(x_policy, o_policy, games, workers_list, chunk_size):
+    """Self-play games per second by worker processes, with the speedup over one worker."""
+    print(f"{games:,} games of {x_policy} (X) against {o_policy} (O), "
+          f"{chunk_size:,} games per shard, {os.cpu_count()} CPUs")
+    print(f"{'workers':>8}{'games/sec':>14}{'speedup':>10}{'efficiency':>12}")
+    print("-" * 44)
+    baseline = None
+    for workers in workers_list:
+        start = time.perf_counter()
+        stats = play_games(x_policy, o_policy, games, workers=workers, chunk_size=chunk_size)
+        rate = stats.games / (time.perf_counter() - start)
+        baseline = baseline or rate
+        print(f"{workers:>8}{rate:>14,.0f}{rate / baseline:>9.1f}x{rate / baseline / workers:>12.0%}")
+    print(f"X wins {stats.x_wins / games:.1%}, O wins {stats.o_wins / games:.1%}, "
+          f"draws {stats.draws / games:.1%}, {stats.mean_length:.2f} moves per game")
+
+
+def _on_pseudo_terminal(draw, redraws, rows, columns):
+    """
+    Time draw() redraws with stdout on a pseudo-terminal of the given size,
+    drained by a thread as a terminal would; returns (latencies, bytes written).
+    """
+    import fcntl
+    import pty
+    import termios
+
+    master, slave = pty.openpty()
+    fcntl.ioctl(slave, termios.TIOCSWINSZ, struct.pack("HHHH", rows, columns, 0, 0))
+    received = [0]
+
+    def drain():
+        while True:
+            try:
+                data = os.read(master, 65536)
+            except OSError:
+                return
+            if not data:
+                return
+            received[0] += len(data)
+
+    thread = threading.Thread(target=drain, daemon=True)
+    thread.start()
+    sys.stdout.flush()
+    saved = os.dup(1)
+    os.dup2(slave, 1)
+    latencies = []
+    try:
+        for _ in range(redraws):
+            start = time.perf_counter()
+            draw()
+            sys.stdout.flush()
+            latencies.append(time.perf_counter() - start)
+    finally:
+        sys.stdout.flush()
+        os.dup2(saved, 1)
+        os.close(saved)
+    time.sleep(0.2)  # Let the drain catch up before counting
+    os.close(slave)
+    os.close(master)
+    thread.join(1)
+    return latencies, received[0]
+
+
+def bench_redraw(redraws):
+    """Redraw latency per turn: clearing through a shell command against the diff renderer."""
+    os.environ.setdefault("TERM", "xterm")
+    moves = [1, 5, 9, 2, 8, 7, 3, 6, 4]  # A drawn game: a redraw for each of 9 moves
+    
+    def turns(game):
+        """A draw function playing through the moves, one move per redraw, over and over."""
+        state = {"turn": 0}
+        
+        def draw():
+            if state["turn"] == len(moves):
+                getattr(game, "reset_game", game.__init__)()
+                state["turn"] = 0
+            game.make_move(moves[state["turn"]])
+            game.switch_player()
+            state["turn"] += 1
+            game.display_board()
+        return draw
+    
+    cases = [
+        ("os.system('clear')", turns(LegacyTicTacToe())),
+        ("ANSI diff renderer", turns(TicTacToe())),
+    ]
+    results = [(label,) + _on_pseudo_terminal(draw, redraws, 24, 80) for label, draw in cases]
+    print(f"{redraws} redraws of the 3x3 board on an 80x24 pseudo-terminal")
+    print(f"{'Redraw':<20}{'mean (ms)':>11}{'p95 (ms)':>10}{'bytes/redraw':>14}")
+    print("-" * 55)
+    for label, latencies, written in results:
+        p95 = sorted(latencies)[int(len(latencies) * 0.95)]
+        print(f"{label:<20}{statistics.mean(latencies) * 1e3:>11.3f}{p95 * 1e3:>10.3f}"
+              f"{written / redraws:>14.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    evaluate = subparsers.add_parser("evaluate", help="winner checks per second")
+    evaluate.add_argument("--count", type=int, default=200000, help="positions to evaluate")
+    evaluate.add_argument("--repeat", type=int, default=5, help="timing runs per case")
+
+    solved = subparsers.add_parser("solved", help="solved table start-up and lookup speed")
+    solved.add_argument("--count", type=int, default=200000, help="positions to look up")
+    solved.add_argument("--repeat", type=int, default=5, help="timing runs")
+
+    subparsers.add_parser("search", help="positions searched by the computer player")
+
+    scaling = subparsers.add_parser("scaling", help="winner checks on N x N boards")
+    scaling.add_argument("--sizes", type=int, nargs="+", default=[3, 15, 50, 100],
+                         help="board sizes to play")
+    scaling.add_argument("--games", type=int, default=20, help="random games per board")
+    scaling.add_argument("--max-moves", type=int, default=200, help="moves per game at most")
+
+    mcts = subparsers.add_parser("mcts", help="MCTS simulations per second")
+    mcts.add_argument("--sizes", type=int, nargs="+", default=[3, 9, 15], help="board sizes")
+    mcts.add_argument("--workers", type=int, nargs="+", default=[1, 2],
+                      help="worker process counts (1 searches in this process)")
+    mcts.add_argument("--time", type=float, default=0.5, help="seconds per move")
+    mcts.add_argument("--moves", type=int, default=6, help="moves of self-play per board")
+
+    selfplay = subparsers.add_parser("selfplay", help="self-play games per second by workers")
+    selfplay.add_argument("--x", default="random", help="policy for X")
+    selfplay.add_argument("--o", default="greedy", help="policy for O")
+    selfplay.add_argument("--games", type=int, default=200000, help="games per run")
+    selfplay.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4],
+                          help="worker process counts")
+    selfplay.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                          help="games per shard")
+
+    redraw = subparsers.add_parser("redraw", help="board redraw latency on a terminal")
+    redraw.add_argument("--redraws", type=int, default=200, help="redraws per case")
+
+    args = parser.parse_args()
+    if args.benchmark == "evaluate":
+        bench_evaluate(args.count, args.repeat)
+    elif args.benchmark == "solved":
+        bench_solved(args.count, args.repeat)
+    elif args.benchmark == "search":
+        bench_search()
+    elif args.benchmark == "scaling":
+        bench_scaling(args.sizes, args.games, args.max_moves)
+    elif args.benchmark == "mcts":
+        bench_mcts(args.sizes, args.workers, args.time, args.moves)
+    elif args.benchmark == "selfplay":
+        bench_selfplay(args.x, args.o, args.games, args.workers, args.chunk_size)
+    elif args.benchmark == "redraw":
+        bench_redraw(args.redraws)
+
+
+if __name__ == "__main__":
+    main()
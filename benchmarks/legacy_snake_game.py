@@ -0,0 +1,230 @@
+"""
+Legacy Snake Game
+=================
+The Snake, AntiSnake, Food and Game logic of snake_game.py as it stood
+before the deque body: bodies are lists of pygame.Vector2, copied on every
+move and scanned for every collision.  Drawing is left out.  Kept only as
+the reference point for bench_snake_game.py; do not use it from
+application code.
+"""
+
+import random
+
+import pygame
+
+CELL_NUMBER = 640 // 20
+
+
+class LegacySnake:
+    def __init__(self):
+        self.body = [pygame.Vector2(5, 10), pygame.Vector2(4, 10), pygame.Vector2(3, 10)]
+        self.direction = pygame.Vector2(1, 0)
+        self.new_block = False
+        
+    def move_snake(self):
+        if self.new_block:
+            body_copy = self.body[:]
+            body_copy.insert(0, body_copy[0] + self.direction)
+            self.body = body_copy[:]
+            self.new_block = False
+        else:
+            body_copy = self.body[:-1]
+            body_copy.insert(0, body_copy[0] + self.direction)
+            self.body = body_copy[:]
+    
+    def add_block(self):
+        self.new_block = True
+    
+    def check_collision(self):
+        # Check if snake hits walls
+        if not 0 <= self.body[0].x < CELL_NUMBER or not 0 <= self.body[0].y < CELL_NUMBER:
+            return True
+        
+        # Check if snake hits itself
+        for block in self.body[1:]:
+            if block == self.body[0]:
+                return True
+        
+        return False
+
+class LegacyAntiSnake:
+    def __init__(self):
+        # Start at opposite corner from player snake
+        self.body = [pygame.Vector2(CELL_NUMBER-5, CELL_NUMBER-10), 
+                     pygame.Vector2(CELL_NUMBER-4, CELL_NUMBER-10), 
+                     pygame.Vector2(CELL_NUMBER-3, CELL_NUMBER-10)]
+        self.direction = pygame.Vector2(-1, 0)
+        self.new_block = False
+        self.move_timer = 0
+        self.move_delay = 200  # Move slower than player initially
+        
+    def move_anti_snake(self, target_pos):
+        if self.new_block:
+            body_copy = self.body[:]
+            body_copy.insert(0, body_copy[0] + self.direction)
+            self.body = body_copy[:]
+            self.new_block = False
+        else:
+            body_copy = self.body[:-1]
+            body_copy.insert(0, body_copy[0] + self.direction)
+            self.body = body_copy[:]
+    
+    def add_block(self):
+        self.new_block = True
+    
+    def ai_pathfinding(self, target_pos):
+        """Simple AI to chase the player snake"""
+        head = self.body[0]
+        
+        # Calculate distances for each possible direction
+        possible_moves = [
+            pygame.Vector2(1, 0),   # Right
+            pygame.Vector2(-1, 0),  # Left
+            pygame.Vector2(0, 1),   # Down
+            pygame.Vector2(0, -1)   # Up
+        ]
+        
+        best_direction = self.direction
+        best_distance = float('inf')
+        
+        for move in possible_moves:
+            new_pos = head + move
+            
+            # Skip if move would hit walls
+            if not (0 <= new_pos.x < CELL_NUMBER and 0 <= new_pos.y < CELL_NUMBER):
+                continue
+            
+            # Skip if move would hit own body
+            if new_pos in self.body:
+                continue
+            
+            # Skip if moving backwards
+            if move == -self.direction:
+                continue
+            
+            # Calculate distance to target
+            distance = abs(new_pos.x - target_pos.x) + abs(new_pos.y - target_pos.y)
+            
+            if distance < best_distance:
+                best_distance = distance
+                best_direction = move
+        
+        self.direction = best_direction
+    
+    def check_wall_collision(self):
+        """Check if anti-snake hits walls"""
+        if not 0 <= self.body[0].x < CELL_NUMBER or not 0 <= self.body[0].y < CELL_NUMBER:
+            return True
+        return False
+    
+    def check_self_collision(self):
+        """Check if anti-snake hits itself"""
+        for block in self.body[1:]:
+            if block == self.body[0]:
+                return True
+        return False
+
+class LegacyFood:
+    def __init__(self):
+        self.randomize()
+    
+    def randomize(self):
+        self.x = random.randint(0, CELL_NUMBER - 1)
+        self.y = random.randint(0, CELL_NUMBER - 1)
+        self.pos = pygame.Vector2(self.x, self.y)
+
+class LegacyGame:
+    def __init__(self):
+        self.snake = LegacySnake()
+        self.food = LegacyFood()
+        self.anti_snake = LegacyAntiSnake()
+        self.score = 0
+        self.game_over = False
+        self.game_over_reason = ""
+        
+    def update(self):
+        if not self.game_over:
+            self.snake.move_snake()
+            
+            # Move anti-snake with AI pathfinding
+            self.anti_snake.ai_pathfinding(self.snake.body[0])
+            self.anti_snake.move_anti_snake(self.snake.body[0])
+            
+            self.check_collision()
+            self.check_fail()
+            self.check_anti_snake_collision()
+    
+    def check_collision(self):
+        if self.food.pos == self.snake.body[0]:
+            self.food.randomize()
+            self.snake.add_block()
+            self.score += 1
+            
+        for block in self.snake.body[1:]:
+            if block == self.food.pos:
+                self.food.randomize()
+    
+    def check_fail(self):
+        if self.snake.check_collision():
+            self.game_over = True
+            self.game_over_reason = "Hit wall or yourself!"
+    
+    def check_anti_snake_collision(self):
+        """Check if anti-snake catches the player or hits obstacles"""
+        # Check if anti-snake catches player
+        if self.anti_snake.body[0] == self.snake.body[0]:
+            self.game_over = True
+            self.game_over_reason = "Caught by Anti-Snake!"
+            return
+        
+        # Check if anti-snake hits player's body
+        for block in self.snake.body:
+            if self.anti_snake.body[0] == block:
+                self.game_over = True
+                self.game_over_reason = "Anti-Snake hit you!"
+                return
+        
+        # Anti-snake collision with walls - respawn it
+        if self.anti_snake.check_wall_collision():
+            self.respawn_anti_snake()
+        
+        # Anti-snake collision with itself - respawn it
+        if self.anti_snake.check_self_collision():
+            self.respawn_anti_snake()
+    
+    def respawn_anti_snake(self):
+        """Respawn anti-snake at a safe location"""
+        # Find a corner far from player
+        player_head = self.snake.body[0]
+        corners = [
+            pygame.Vector2(2, 2),
+            pygame.Vector2(CELL_NUMBER-3, 2),
+            pygame.Vector2(2, CELL_NUMBER-3),
+            pygame.Vector2(CELL_NUMBER-3, CELL_NUMBER-3)
+        ]
+        
+        best_corner = corners[0]
+        max_distance = 0
+        
+        for corner in corners:
+            distance = abs(corner.x - player_head.x) + abs(corner.y - player_head.y)
+            if distance > max_distance:
+                max_distance = distance
+                best_corner = corner
+        
+        # Reset anti-snake at the farthest corner
+        self.anti_snake.body = [
+            best_corner,
+            best_corner + pygame.Vector2(1, 0),
+            best_corner + pygame.Vector2(2, 0)
+        ]
+        self.anti_snake.direction = pygame.Vector2(-1, 0)
+    
+    def restart_game(self):
+        """Restart the game"""
+        self.snake = LegacySnake()
+        self.food = LegacyFood()
+        self.anti_snake = LegacyAntiSnake()
+        self.score = 0
+        self.game_over = False
+        self.game_over_reason = ""
@@ -0,0 +1,75 @@
+"""
+Legacy Tic-Tac-Toe
+==================
+The nested-list TicTacToe board and full-scan check_winner as they stood
+before the bitboard core, and display_board as it stood before the console
+renderer.  Kept only as the reference point for bench_tic_tac_toe.py; do
+not use it from application code.
+"""
+
+import os
+
+
+class LegacyTicTacToe:
+    """The original nested-list TicTacToe game state."""
+    
+    def __init__(self):
+        self.board = [[' ' for _ in range(3)] for _ in range(3)]
+        self.current_player = 'X'
+        
+    def display_board(self):
+        os.system('cls' if os.name == 'nt' else 'clear')
+        print("\n" + "="*30)
+        print("    TIC-TAC-TOE GAME")
+        print("="*30)
+        print(f"   Current Player: {self.current_player}")
+        print("-"*30)
+        print("   Position Guide:")
+        print("   1 | 2 | 3")
+        print("  ---|---|---")
+        print("   4 | 5 | 6")
+        print("  ---|---|---")
+        print("   7 | 8 | 9")
+        print("-"*30)
+        print("   Current Board:")
+        
+        for i in range(3):
+            row = f"   {self.board[i][0]} | {self.board[i][1]} | {self.board[i][2]}"
+            print(row)
+            if i < 2:
+                print("  ---|---|---")
+        print("-"*30)
+        
+    def get_position_from_number(self, num):
+        num -= 1
+        return num // 3, num % 3
+        
+    def is_valid_move(self, position):
+        if position < 1 or position > 9:
+            return False, "Position must be between 1 and 9!"
+        row, col = self.get_position_from_number(position)
+        if self.board[row][col] != ' ':
+            return False, "Position already taken!"
+        return True, ""
+        
+    def make_move(self, position):
+        row, col = self.get_position_from_number(position)
+        self.board[row][col] = self.current_player
+        
+    def check_winner(self):
+        for row in self.board:
+            if row[0] == row[1] == row[2] != ' ':
+                return row[0]
+        for col in range(3):
+            if self.board[0][col] == self.board[1][col] == self.board[2][col] != ' ':
+                return self.board[0][col]
+        if self.board[0][0] == self.board[1][1] == self.board[2][2] != ' ':
+            return self.board[0][0]
+        if self.board[0][2] == self.board[1][1] == self.board[2][0] != ' ':
+            return self.board[0][2]
+        if all(self.board[i][j] != ' ' for i in range(3) for j in range(3)):
+            return 'TIE'
+        return None
+        
+    def switch_player(self):
+        self.current_player = 'O' if self.current_player == 'X' else 'X'
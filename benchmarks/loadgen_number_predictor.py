@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Number Predictor Load Generator
+===============================
+Drives number_predictor_server.py with many concurrent connections and
+reports client-side throughput and latency, followed by the server's own
+latency percentiles and batch size histogram.
+
+Start the server, then point the load generator at it:
+    python number_predictor_server.py --port 8765
+    python benchmarks/loadgen_number_predictor.py --port 8765 --connections 64
+
+Without --port or --unix an in-process server on a free port is used.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from number_predictor_server import MicroBatcher, PredictionServer, _percentile
+
+
+def request_lines(count, seed):
+    """Encoded requests for random 3-number sequences from common pattern families."""
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(count):
+        start = rng.randint(-50, 50)
+        step = rng.randint(-9, 9)
+        kind = rng.randrange(3)
+        if kind == 0:
+            sequence = [start + step * i for i in range(3)]
+        elif kind == 1:
+            sequence = [start * 2 ** i for i in range(3)]
+        else:
+            sequence = [round(rng.uniform(-100, 100), 3) for _ in range(3)]
+        lines.append(json.dumps(sequence).encode() + b"\n")
+    return lines
+
+
+async def open_connection(args):
+    if args.unix:
+        return await asyncio.open_unix_connection(args.unix)
+    return await asyncio.open_connection(args.host, args.port)
+
+
+async def run_client(args, client, latencies):
+    """Send this client's requests, keeping up to --pipeline of them in flight."""
+    reader, writer = await open_connection(args)
+    lines = request_lines(args.requests, seed=client)
+    sent_at = []
+
+    async def send():
+        for line in lines:
+            await in_flight.acquire()
+            sent_at.append(time.perf_counter())
+            writer.write(line)
+            await writer.drain()
+
+    in_flight = asyncio.Semaphore(args.pipeline)
+    sender = asyncio.ensure_future(send())
+    for i in range(len(lines)):
+        response = json.loads(await reader.readline())
+        latencies.append(time.perf_counter() - sent_at[i])
+        in_flight.release()
+        if "error" in response:
+            raise RuntimeError(f"Server error: {response['error']}")
+    await sender
+    writer.close()
+    await writer.wait_closed()
+
+
+async def server_stats(args):
+    reader, writer = await open_connection(args)
+    writer.write(b'{"command": "stats"}\n')
+    stats = json.loads(await reader.readline())
+    writer.close()
+    await writer.wait_closed()
+    return stats
+
+
+async def run(args):
+    server = None
+    if not args.port and not args.unix:
+        batcher = MicroBatcher(max_batch_size=args.max_batch_size,
+                               max_delay=args.max_delay_ms / 1e3)
+        server = PredictionServer(batcher)
+        await server.start_tcp(args.host, 0)
+        args.port = server.address[1]
+
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(run_client(args, client, latencies)
+                           for client in range(args.connections)))
+    elapsed = time.perf_counter() - start
+    stats = await server_stats(args)
+    if server is not None:
+        await server.close()
+
+    latencies.sort()
+    total = len(latencies)
+    print(f"{args.connections} connections x {args.requests} requests, pipeline {args.pipeline}")
+    print(f"Throughput:      {total / elapsed:,.0f} requests/sec ({total} in {elapsed:.2f}s)")
+    print(f"Client latency:  p50 {_percentile(latencies, 0.50) * 1e3:.2f} ms, "
+          f"p99 {_percentile(latencies, 0.99) * 1e3:.2f} ms")
+    server_latency = stats["latency_ms"]
+    print(f"Server latency:  p50 {server_latency['p50']:.2f} ms, "
+          f"p99 {server_latency['p99']:.2f} ms")
+    print(f"Batches:         {stats['batches']} "
+          f"(mean size {stats['requests'] / max(stats['batches'], 1):.1f})")
+    print()
+    print(f"{'batch size':>10}{'batches':>10}")
+    print("-" * 20)
+    for size, count in stats["batch_sizes"].items():
+        print(f"{size:>10}{count:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1", help="server host")
+    parser.add_argument("--port", type=int, help="server port")
+    parser.add_argument("--unix", help="server Unix socket path")
+    parser.add_argument("--connections", type=int, default=64, help="concurrent connections")
+    parser.add_argument("--requests", type=int, default=1000, help="requests per connection")
+    parser.add_argument("--pipeline", type=int, default=1,
+                        help="requests each connection keeps in flight")
+    parser.add_argument("--max-batch-size", type=int, default=256,
+                        help="batch size of the in-process server")
+    parser.add_argument("--max-delay-ms", type=float, default=2.0,
+                        help="batch deadline of the in-process server")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
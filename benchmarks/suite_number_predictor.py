@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+Number Predictor Benchmark Suite
+================================
+Regression benchmarks for number_predictor.py on a seeded synthetic corpus
+that mixes every supported pattern family with noise.  Measures
+predict_next latency per family, predict_next and predict_batch
+throughput, and peak memory, writes the results as JSON and compares them
+with a stored baseline.
+
+Usage:
+    # Record a baseline
+    python benchmarks/suite_number_predictor.py --output baseline.json
+
+    # Measure again and fail (exit status 1) on regressions beyond 10%,
+    # or 25% for memory and latency percentiles
+    python benchmarks/suite_number_predictor.py --output current.json \\
+        --baseline baseline.json --threshold 0.10 --threshold-for memory=0.25
+
+Timings depend on the machine, so compare runs from the same one.
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import sys
+import time
+import timeit
+import tracemalloc
+from fractions import Fraction
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from known_sequences import KnownSequenceIndex
+from number_predictor import NumberPredictor, np
+
+# Fraction of a metric's baseline value it may get worse by
+DEFAULT_THRESHOLD = 0.10
+# Thresholds by metric name prefix, unless --threshold-for sets them: single
+# calls are noisier than means over many, even at their best of a few passes
+DEFAULT_OVERRIDES = {"latency.all": 0.25}
+
+FAMILIES = [
+    "arithmetic", "approximate arithmetic", "geometric", "polynomial", "fibonacci",
+    "squares", "triangular", "exponential", "factorial", "primes", "powers", "harmonic",
+    "alternating", "recurrence", "large integers", "fractions", "noise",
+]
+
+_PRIMES = [p for p in range(2, 200) if all(p % d for d in range(2, int(p ** 0.5) + 1))]
+
+
+def family_sequence(family, rng, length):
+    """One random sequence of length terms from a pattern family."""
+    start = rng.randint(-50, 50)
+    step = rng.randint(1, 9) * rng.choice([-1, 1])
+    n = rng.randint(1, 30)
+    if family == "arithmetic":
+        return [start + step * i for i in range(length)]
+    if family == "approximate arithmetic":
+        return [round(start + step * i + rng.uniform(-0.05, 0.05) * step, 4) for i in range(length)]
+    if family == "geometric":
+        ratio = rng.choice([-3, -2, 0.5, 1.5, 2, 3])
+        return [(start or 1) * ratio ** i for i in range(length)]
+    if family == "polynomial":
+        a, b, c = rng.randint(1, 5), rng.randint(-9, 9), rng.randint(-9, 9)
+        return [a * (n + i) ** 3 + b * (n + i) + c for i in range(length)]
+    if family == "fibonacci":
+        terms = [rng.randint(0, 9), rng.randint(1, 9)]
+        while len(terms) < length:
+            terms.append(terms[-2] + terms[-1])
+        return terms
+    if family == "squares":
+        return [(n + i) ** 2 for i in range(length)]
+    if family == "triangular":
+        return [(n + i) * (n + i + 1) // 2 for i in range(length)]
+    if family == "exponential":
+        rate = rng.uniform(0.2, 1.5)
+        return [math.exp(rate * (n + i)) for i in range(length)]
+    if family == "factorial":
+        first = rng.randint(1, 12)
+        return [math.factorial(first + i) for i in range(length)]
+    if family == "primes":
+        first = rng.randrange(len(_PRIMES) - length)
+        return _PRIMES[first:first + length]
+    if family == "powers":
+        base = rng.choice([2, 3, 5, 10])
+        return [float(base) ** (n + i) for i in range(length)]
+    if family == "harmonic":
+        return [1 / (n + i) for i in range(length)]
+    if family == "alternating":
+        return [(-1) ** i * (abs(start) + abs(step) * i) for i in range(length)]
+    if family == "recurrence":
+        terms = [rng.randint(0, 3) for _ in range(3)]
+        while len(terms) < length:
+            terms.append(terms[-1] + terms[-2] + terms[-3])
+        return terms
+    if family == "large integers":
+        first = rng.getrandbits(80) | 1 << 79
+        return [first * 3 ** i for i in range(length)]
+    if family == "fractions":
+        return [Fraction(1, n + i) for i in range(length)]
+    return [round(rng.uniform(-100, 100), 3) for _ in range(length)]
+
+
+def generate_corpus(size, seed=0, noise=0.2, min_terms=3, max_terms=8):
+    """
+    A seeded list of (family, sequence) pairs: a noise fraction of random
+    sequences and the rest spread evenly over the other families, with
+    min_terms to max_terms terms each.
+    """
+    rng = random.Random(seed)
+    families = [family for family in FAMILIES if family != "noise"]
+    corpus = []
+    for _ in range(size):
+        family = "noise" if rng.random() < noise else rng.choice(families)
+        length = rng.randint(min_terms, max_terms)
+        if family in ("fibonacci", "recurrence"):
+            length = max(length, 5)
+        corpus.append((family, family_sequence(family, rng, length)))
+    return corpus
+
+
+def _metric(value, unit, higher_is_better=False):
+    return {"value": value, "unit": unit, "higher_is_better": higher_is_better}
+
+
+def _seconds_per_run(function, repeat):
+    return min(timeit.repeat(function, number=1, repeat=repeat))
+
+
+def measure_latency(corpus, repeat):
+    """
+    Mean predict_next latency per family, and percentiles over the whole
+    corpus, from each call's best time in repeat passes over the corpus.
+    Taking every call at its best, with the passes interleaving the
+    families, keeps a stray interrupt or collection from moving the
+    results of an unchanged tree.
+    """
+    predictor = NumberPredictor()
+    clock = time.perf_counter_ns
+    samples = [math.inf] * len(corpus)
+    for _ in range(repeat):
+        for i, (_, sequence) in enumerate(corpus):
+            start = clock()
+            predictor.predict_next(sequence)
+            elapsed = clock() - start
+            if elapsed < samples[i]:
+                samples[i] = elapsed
+
+    metrics = {}
+    by_family = {}
+    for (family, _), elapsed in zip(corpus, samples):
+        by_family.setdefault(family, []).append(elapsed)
+    for family, times in sorted(by_family.items()):
+        metrics[f"latency.{family.replace(' ', '_')}.mean"] = _metric(
+            sum(times) / len(times) / 1e3, "us")
+
+    samples.sort()
+    for name, fraction in (("p50", 0.50), ("p99", 0.99)):
+        metrics[f"latency.all.{name}"] = _metric(
+            samples[min(len(samples) - 1, int(fraction * len(samples)))] / 1e3, "us")
+    return metrics
+
+
+def measure_throughput(corpus, batch_rows, repeat, seed):
+    """predict_next over the corpus, and predict_batch over batch_rows 3-term rows."""
+    predictor = NumberPredictor()
+    sequences = [sequence for _, sequence in corpus]
+    seconds = _seconds_per_run(lambda: [predictor.predict_next(s) for s in sequences], repeat)
+    metrics = {"throughput.predict_next": _metric(len(sequences) / seconds, "sequences/s", True)}
+
+    if np is not None:
+        rows = batch_corpus(batch_rows, seed)
+        predictor.predict_batch(rows[:1])  # Build the known sequence table outside the timing
+        seconds = _seconds_per_run(lambda: predictor.predict_batch(rows), repeat)
+        metrics["throughput.predict_batch"] = _metric(batch_rows / seconds, "rows/s", True)
+    return metrics
+
+
+def batch_corpus(rows, seed):
+    """An (rows, 3) float array of 3-term sequences from the corpus families."""
+    rng = random.Random(seed)
+    families = [f for f in FAMILIES if f not in ("large integers", "fractions")]
+    data = []
+    while len(data) < rows:
+        sequence = family_sequence(rng.choice(families), rng, 3)
+        if all(abs(x) < 1e300 for x in sequence):
+            data.append([float(x) for x in sequence])
+    return np.array(data)
+
+
+def _traced(function):
+    """Run function with tracemalloc on; returns (result, current KiB, peak KiB)."""
+    tracemalloc.start()
+    try:
+        result = function()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, current / 1024, peak / 1024
+
+
+def measure_memory(corpus, batch_rows, seed):
+    """Memory held by a predictor and its index, and peak allocations while predicting."""
+    def build():
+        predictor = NumberPredictor(known_sequences=KnownSequenceIndex.build())
+        predictor.predict_next([1, 2, 6])
+        return predictor
+
+    def predict_corpus():
+        for _, sequence in corpus:
+            predictor.predict_next(sequence)
+
+    predictor, held, _ = _traced(build)
+    _, _, corpus_peak = _traced(predict_corpus)
+    metrics = {
+        "memory.predictor": _metric(held, "KiB"),
+        "memory.predict_next_peak": _metric(corpus_peak, "KiB"),
+    }
+    if np is not None:
+        rows = batch_corpus(batch_rows, seed)
+        predictor.predict_batch(rows[:1])  # Build the known sequence table outside the trace
+        _, _, batch_peak = _traced(lambda: predictor.predict_batch(rows))
+        metrics["memory.predict_batch_peak"] = _metric(batch_peak, "KiB")
+    return metrics
+
+
+def run_suite(size, seed, noise, batch_rows, repeat):
+    """Run every benchmark and return the results document."""
+    corpus = generate_corpus(size, seed, noise)
+    metrics = {}
+    metrics.update(measure_latency(corpus, repeat))
+    metrics.update(measure_throughput(corpus, batch_rows, repeat, seed))
+    metrics.update(measure_memory(corpus, batch_rows, seed))
+    return {
+        "settings": {"size": size, "seed": seed, "noise": noise, "batch_rows": batch_rows,
+                     "repeat": repeat},
+        "environment": {"python": platform.python_version(), "platform": platform.platform(),
+                        "numpy": np.__version__ if np is not None else None},
+        "metrics": metrics,
+    }
+
+
+def threshold_for(name, threshold, overrides):
+    """The threshold of the longest override prefix matching name, else threshold."""
+    matches = [prefix for prefix in overrides if name == prefix or name.startswith(prefix + ".")]
+    return overrides[max(matches, key=len)] if matches else threshold
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD, overrides=None):
+    """
+    Compare each metric with the baseline.  Returns a list of (name,
+    baseline value, value, relative change, status) where the change is
+    positive when the metric got worse and status is "ok", "regression",
+    "new" or "missing".  overrides maps metric name prefixes to their own
+    thresholds (default: DEFAULT_OVERRIDES).
+    """
+    overrides = DEFAULT_OVERRIDES if overrides is None else overrides
+    current = results["metrics"]
+    previous = baseline["metrics"]
+    rows = []
+    for name in sorted(set(current) | set(previous)):
+        if name not in previous:
+            rows.append((name, None, current[name]["value"], None, "new"))
+            continue
+        if name not in current:
+            rows.append((name, previous[name]["value"], None, None, "missing"))
+            continue
+        old, new = previous[name]["value"], current[name]["value"]
+        change = (new - old) / old if old else 0.0
+        if current[name]["higher_is_better"]:
+            change = -change
+        status = "regression" if change > threshold_for(name, threshold, overrides) else "ok"
+        rows.append((name, old, new, change, status))
+    return rows
+
+
+def print_results(results):
+    print(f"{'Metric':<40}{'value':>14}  unit")
+    print("-" * 66)
+    for name, metric in sorted(results["metrics"].items()):
+        print(f"{name:<40}{metric['value']:>14,.2f}  {metric['unit']}")
+
+
+def print_comparison(rows):
+    print(f"{'Metric':<40}{'baseline':>14}{'current':>14}{'change':>9}  status")
+    print("-" * 87)
+    for name, old, new, change, status in rows:
+        old_text = "-" if old is None else f"{old:,.2f}"
+        new_text = "-" if new is None else f"{new:,.2f}"
+        change_text = "-" if change is None else f"{change:+.1%}"
+        print(f"{name:<40}{old_text:>14}{new_text:>14}{change_text:>9}  {status}")
+
+
+def parse_override(text):
+    """NAME=FRACTION, as given to --threshold-for."""
+    name, _, value = text.partition("=")
+    try:
+        return name, float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected METRIC=FRACTION, got {text!r}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=20000, help="sequences in the corpus")
+    parser.add_argument("--seed", type=int, default=0, help="corpus seed")
+    parser.add_argument("--noise", type=float, default=0.2, help="fraction of noise sequences")
+    parser.add_argument("--batch-rows", type=int, default=200000, help="rows per predict_batch")
+    parser.add_argument("--repeat", type=int, default=5, help="timing runs per measurement")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="fraction a metric may get worse by before it is a regression")
+    parser.add_argument("--threshold-for", type=parse_override, action="append", default=[],
+                        metavar="METRIC=FRACTION",
+                        help="threshold for metrics with this name or prefix, e.g. memory=0.25 "
+                             "(latency.all defaults to 0.25)")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.size, args.seed, args.noise, args.batch_rows, args.repeat)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+    if not args.baseline:
+        print_results(results)
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get("settings") != results["settings"]:
+        print(f"Warning: baseline settings {baseline.get('settings')} differ from "
+              f"{results['settings']}", file=sys.stderr)
+    overrides = dict(DEFAULT_OVERRIDES, **dict(args.threshold_for))
+    rows = compare(results, baseline, args.threshold, overrides)
+    print_comparison(rows)
+    regressions = [row[0] for row in rows if row[4] == "regression"]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Console Renderer
+================
+Redraws a text screen for the console games without clearing it through a
+shell command.  Each frame is a list of lines.  On a terminal, the first
+frame clears the screen and later frames move the cursor with ANSI escape
+sequences and rewrite only the characters that changed.  Anything printed
+below the last frame, such as prompts and messages, is erased.  Every frame
+goes out as one write.  When the output is not a terminal (a pipe, a file
+or a test harness) frames are written in full, one after another, with no
+escape sequences.
+"""
+
+import os
+import shutil
+import sys
+
+CLEAR_SCREEN = "\x1b[H\x1b[2J"
+CLEAR_LINE_END = "\x1b[K"
+CLEAR_BELOW = "\x1b[J"
+
+# Changed runs closer together than this are written as one run, since
+# rewriting a few unchanged characters is cheaper than another cursor move
+_MERGE_GAP = 8
+
+# Lines kept free below a frame for prompts and messages; taller frames
+# would scroll the screen, so they are always redrawn in full
+_PROMPT_LINES = 4
+
+
+def move_to(row, col):
+    """Escape sequence moving the cursor to row, col (both counted from 0)."""
+    return f"\x1b[{row + 1};{col + 1}H"
+
+
+def changed_runs(old, new):
+    """
+    Column ranges (start, end) of new that differ from old, including any
+    part of new beyond the end of old, with nearby runs merged.
+    """
+    runs = []
+    start = None
+    for col in range(len(new)):
+        if col < len(old) and old[col] == new[col]:
+            if start is not None:
+                runs.append([start, col])
+                start = None
+        elif start is None:
+            start = col
+    if start is not None:
+        runs.append([start, len(new)])
+
+    merged = runs[:1]
+    for run in runs[1:]:
+        if run[0] - merged[-1][1] < _MERGE_GAP:
+            merged[-1][1] = run[1]
+        else:
+            merged.append(run)
+    return [tuple(run) for run in merged]
+
+
+class ConsoleRenderer:
+    """Draws frames of text lines, rewriting only what changed since the last frame."""
+
+    def __init__(self, stream=None, ansi=None):
+        """
+        Args:
+            stream: Text stream to draw on (default: sys.stdout at each frame)
+            ansi: Use escape sequences; by default, when the stream is a
+                terminal that understands them
+        """
+        self._stream = stream
+        self._ansi = ansi
+        self._screen = None  # The lines on screen, or None before the first frame
+
+    @property
+    def stream(self):
+        """The stream frames are written to."""
+        return self._stream if self._stream is not None else sys.stdout
+
+    @property
+    def ansi(self):
+        """Whether frames are drawn with escape sequences."""
+        if self._ansi is not None:
+            return self._ansi
+        stream = self.stream
+        if not (hasattr(stream, "isatty") and stream.isatty()):
+            return False
+        if os.environ.get("TERM") == "dumb":
+            return False
+        # The classic Windows console needs its own API; Windows Terminal does not
+        return os.name != "nt" or "WT_SESSION" in os.environ
+
+    def reset(self):
+        """Forget what is on screen, e.g. after other output, so the next frame is drawn in full."""
+        self._screen = None
+
+    def render(self, lines):
+        """Draw one frame, given as a list of lines without newlines."""
+        lines = list(lines)
+        if not self.ansi:
+            text = "\n".join(lines) + "\n"
+        elif self._screen is None or not self._fits(lines):
+            text = CLEAR_SCREEN + "\n".join(lines) + "\n"
+        else:
+            text = self._diff(self._screen, lines)
+        self._screen = lines
+        stream = self.stream
+        stream.write(text)
+        stream.flush()
+
+    def _fits(self, lines):
+        """Whether the frame and a few prompt lines fit on the terminal without scrolling."""
+        columns, rows = shutil.get_terminal_size()
+        return len(lines) + _PROMPT_LINES <= rows and all(len(line) < columns for line in lines)
+
+    def _diff(self, old_lines, new_lines):
+        """Escape sequences turning the screen from old_lines into new_lines."""
+        parts = []
+        for row, line in enumerate(new_lines):
+            old = old_lines[row] if row < len(old_lines) else ""
+            if line == old:
+                continue
+            for start, end in changed_runs(old, line):
+                parts.append(move_to(row, start) + line[start:end])
+            if len(line) < len(old):
+                parts.append(move_to(row, len(line)) + CLEAR_LINE_END)
+        # Erase old lines past the end of the frame and anything printed
+        # after it, leaving the cursor where the next prompt goes
+        parts.append(move_to(len(new_lines), 0) + CLEAR_BELOW)
+        return "".join(parts)
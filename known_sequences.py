@@ -0,0 +1,294 @@
+"""
+Known Integer Sequences
+=======================
+A precomputed hash index of well-known integer sequences (factorials,
+powers, squares, cubes, triangular, Catalan and prime numbers) that maps
+every window of 3 consecutive terms to where it occurs, so that an exact
+integer sequence is recognised with a single dictionary lookup.
+
+The index can be saved to and loaded from a compact binary file:
+
+    index = KnownSequenceIndex.build()
+    index.save("known_sequences.bin")
+    index = KnownSequenceIndex.load("known_sequences.bin")
+    index.lookup([1, 2, 6, 24])  # (120, "Factorial", 0.9)
+"""
+
+import json
+import math
+import sys
+import zlib
+from array import array
+from itertools import accumulate, count, islice
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+# Every indexed term (and predicted next term) fits in a signed 64-bit integer
+MAX_VALUE = 2 ** 63 - 1
+
+# Powers of every base from 2 up to this one are indexed
+MAX_POWER_BASE = 100
+
+# Terms per family for the families that never outgrow MAX_VALUE quickly
+DEFAULT_MAX_TERMS = 10000
+
+# Number of consecutive terms each index key holds
+WINDOW = 3
+
+_MAGIC = b"KSEQ1\n"
+
+
+def power_family_names() -> List[str]:
+    """Names of the power families, in index order."""
+    return [f"Powers of {base}" for base in range(2, MAX_POWER_BASE + 1)]
+
+
+def _factorials() -> List[int]:
+    terms = [1]
+    while terms[-1] * len(terms) <= MAX_VALUE:
+        terms.append(terms[-1] * len(terms))
+    return terms
+
+
+def _powers(base: int) -> List[int]:
+    terms = [1]
+    while terms[-1] * base <= MAX_VALUE:
+        terms.append(terms[-1] * base)
+    return terms
+
+
+def _catalan_numbers() -> List[int]:
+    terms = [1]
+    while True:
+        n = len(terms)
+        # C(n) = C(n-1) * 2(2n - 1) / (n + 1)
+        term = terms[-1] * 2 * (2 * n - 1) // (n + 1)
+        if term > MAX_VALUE:
+            return terms
+        terms.append(term)
+
+
+def _primes(count: int) -> List[int]:
+    """The first count primes, by sieving up to a bound on the count-th prime."""
+    limit = 15
+    while _prime_count_bound(limit) < count:
+        limit *= 2
+    sieve = bytearray([1]) * (limit + 1)
+    sieve[0:2] = b"\x00\x00"
+    for n in range(2, int(limit ** 0.5) + 1):
+        if sieve[n]:
+            sieve[n * n::n] = bytes(len(range(n * n, limit + 1, n)))
+    return [n for n in range(limit + 1) if sieve[n]][:count]
+
+
+def _prime_count_bound(limit: int) -> int:
+    """A lower bound on the number of primes up to limit (for limit >= 15)."""
+    # pi(x) > x / ln(x) for x >= 17; a small margin covers 15 and 16
+    return int(limit / math.log(limit)) - 1
+
+
+def _next_prime(n: int) -> int:
+    """The smallest prime above n, by trial division."""
+    candidate = max(n + 1, 2)
+    while True:
+        if candidate < 4 or all(candidate % d for d in range(2, int(candidate ** 0.5) + 1)):
+            return candidate
+        candidate += 1
+
+
+def _next_term(name: str, position: int, previous: int) -> Optional[int]:
+    """Term at position of a built-in family given the one before it, or None."""
+    if name == "Factorial":
+        return previous * position
+    if name.startswith("Powers of "):
+        return previous * int(name[len("Powers of "):])
+    if name == "Perfect Squares":
+        return position * position
+    if name == "Cubes":
+        return position ** 3
+    if name == "Triangular Numbers":
+        return position * (position + 1) // 2
+    if name == "Catalan Numbers":
+        return previous * 2 * (2 * position - 1) // (position + 1)
+    if name == "Primes":
+        return _next_prime(previous)
+    return None
+
+
+def _continue_family(name: str, terms: Sequence[int], position: int) -> Iterator[int]:
+    """Terms of a family from position on, computed once the indexed ones run out."""
+    yield from islice(terms, position, None)
+    previous = terms[-1]
+    for position in count(len(terms)):
+        previous = _next_term(name, position, previous)
+        if previous is None:
+            return
+        yield previous
+
+
+def _families(max_terms: int) -> List[Tuple[str, float, List[int]]]:
+    """(name, confidence, terms) of every indexed family, in priority order."""
+    families = [("Factorial", 0.9, _factorials())]
+    for base, name in zip(range(2, MAX_POWER_BASE + 1), power_family_names()):
+        families.append((name, 0.85, _powers(base)))
+    families.extend([
+        ("Perfect Squares", 0.85, [n * n for n in range(max_terms)]),
+        ("Cubes", 0.85, [n ** 3 for n in range(max_terms)]),
+        ("Triangular Numbers", 0.85, [n * (n + 1) // 2 for n in range(max_terms)]),
+        ("Catalan Numbers", 0.85, _catalan_numbers()),
+        ("Primes", 0.85, _primes(max_terms)),
+    ])
+    return families
+
+
+class KnownSequenceIndex:
+    """Hash index from 3-term windows of known integer sequences to their position."""
+
+    def __init__(self, families: Sequence[Tuple[str, float, Sequence[int]]]):
+        """
+        Args:
+            families: (name, confidence, terms) triples.  When a window
+                occurs in several families the most confident one wins,
+                then the one listed first.
+        """
+        self.names = [name for name, _, _ in families]
+        self.confidences = [confidence for _, confidence, _ in families]
+        self.terms = [tuple(terms) for _, _, terms in families]
+
+        # Window -> ((family, start), ...) for every window with a next term
+        self._index = index = {}
+        for family, terms in enumerate(self.terms):
+            starts = [terms[i:len(terms) - WINDOW + i] for i in range(WINDOW)]
+            for start, window in enumerate(zip(*starts)):
+                candidates = index.get(window)
+                if candidates is None:
+                    index[window] = ((family, start),)
+                elif candidates[-1][0] != family:  # Keep a family's first occurrence
+                    index[window] = candidates + ((family, start),)
+
+        # Windows found in several families were added in listed order
+        def priority(candidate):
+            return -self.confidences[candidate[0]], candidate[0]
+
+        for window, candidates in index.items():
+            if len(candidates) > 1:
+                index[window] = tuple(sorted(candidates, key=priority))
+
+    @classmethod
+    def build(cls, max_terms: int = DEFAULT_MAX_TERMS) -> "KnownSequenceIndex":
+        """Generate every family from scratch."""
+        if max_terms < WINDOW + 1:
+            raise ValueError(f"max_terms must be at least {WINDOW + 1}")
+        return cls(_families(max_terms))
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def lookup(self, integers: Sequence[int]) -> Optional[Tuple[int, str, float]]:
+        """
+        Find the family whose consecutive terms are exactly integers.
+
+        Args:
+            integers: 3 or more integers
+
+        Returns:
+            Tuple of (next_term, family_name, confidence), or None
+        """
+        found = self.locate(integers)
+        if found is None:
+            return None
+        family, end = found
+        return self.terms[family][end], self.names[family], self.confidences[family]
+
+    def locate(self, integers: Sequence[int]) -> Optional[Tuple[int, int]]:
+        """
+        Find where integers occur, like lookup.
+
+        Returns:
+            Tuple of (family, position of the next term), or None
+        """
+        candidates = self._index.get(tuple(integers[:WINDOW]))
+        if candidates is None:
+            return None
+
+        length = len(integers)
+        for family, start in candidates:
+            terms = self.terms[family]
+            end = start + length
+            if end < len(terms) and (length == WINDOW or terms[start:end] == tuple(integers)):
+                return family, end
+        return None
+
+    def continuation(self, integers: Sequence[int]) -> Optional[Iterator[int]]:
+        """
+        Iterate over the terms that follow integers in their family.
+
+        The built-in families carry on past their indexed terms without
+        end; a family of a custom index stops at its last term.
+
+        Returns:
+            Iterator of the following terms, or None if integers are not found
+        """
+        found = self.locate(integers)
+        if found is None:
+            return None
+        family, end = found
+        return _continue_family(self.names[family], self.terms[family], end)
+
+    def windows(self):
+        """Yield (window, next_term, family_name, confidence) for the best family of every window."""
+        for window, candidates in self._index.items():
+            family, start = candidates[0]
+            yield (window, self.terms[family][start + WINDOW],
+                   self.names[family], self.confidences[family])
+
+    def save(self, path: str):
+        """
+        Write the families to a compact binary file.
+
+        The file is a short header followed by a zlib stream holding a JSON
+        description of the families and the differences between their
+        consecutive terms as little-endian 64-bit integers.
+        """
+        header = json.dumps([[name, confidence, len(terms)] for name, confidence, terms
+                             in zip(self.names, self.confidences, self.terms)])
+        deltas = array("q")
+        for terms in self.terms:
+            deltas.extend(b - a for a, b in zip((0,) + terms, terms))
+        if sys.byteorder == "big":
+            deltas.byteswap()
+
+        with open(path, "wb") as file:
+            file.write(_MAGIC)
+            file.write(zlib.compress(header.encode() + b"\n" + deltas.tobytes(), 9))
+
+    @classmethod
+    def load(cls, path: str) -> "KnownSequenceIndex":
+        """Read an index written by save."""
+        with open(path, "rb") as file:
+            if file.read(len(_MAGIC)) != _MAGIC:
+                raise ValueError(f"{path} is not a known sequence index file")
+            payload = zlib.decompress(file.read())
+
+        header, _, data = payload.partition(b"\n")
+        deltas = array("q")
+        deltas.frombytes(data)
+        if sys.byteorder == "big":
+            deltas.byteswap()
+
+        families = []
+        position = 0
+        for name, confidence, count in json.loads(header):
+            families.append((name, confidence, accumulate(deltas[position:position + count])))
+            position += count
+        return cls(families)
+
+
+_default_index = None
+
+
+def default_index() -> KnownSequenceIndex:
+    """The index built with default settings, built on first use and shared."""
+    global _default_index
+    if _default_index is None:
+        _default_index = KnownSequenceIndex.build()
+    return _default_index
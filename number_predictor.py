@@ -1,18 +1,298 @@
 """
 Number Sequence Predictor
 ========================
-Predicts the next number in a sequence based on 3 given numbers.
+Predicts the next number in a sequence based on 3 or more given numbers.
 Supports various sequence types: arithmetic, geometric, polynomial, fibonacci-like, etc.
 """
 
+import argparse
+import csv
+import io
 import math
-from typing import List, Tuple, Optional
+import os
+import sys
+import time
+from collections import OrderedDict, deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from itertools import count, islice
+from fractions import Fraction
+from functools import partial
+from math import isfinite
+from operator import le, lt, mul, sub, truediv
+from typing import Iterable, Iterator, List, Tuple, Optional
+
+from known_sequences import KnownSequenceIndex, MAX_POWER_BASE, MAX_VALUE, default_index, power_family_names
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for predict_batch
+    np = None
+
+try:
+    from math import isqrt as _isqrt
+except ImportError:  # Python < 3.8
+    def _isqrt(n: int) -> int:
+        """Largest integer whose square is at most n, by Newton's method."""
+        if n < 0:
+            raise ValueError("isqrt() argument must be nonnegative")
+        if n == 0:
+            return 0
+        x = 1 << ((n.bit_length() + 1) // 2)
+        while True:
+            y = (x + n // x) // 2
+            if y >= x:
+                return x
+            x = y
+
+
+# Every pattern name predict_next can report, indexed by the integer codes
+# returned from predict_batch.  Append new names at the end so that codes
+# stay stable.
+PATTERN_NAMES = (
+    "Arithmetic Sequence",
+    "Approximate Arithmetic",
+    "Geometric Sequence",
+    "Approximate Geometric",
+    "Linear Polynomial",
+    "Quadratic Polynomial",
+    "Fibonacci-like",
+    "Weighted Fibonacci",
+    "Perfect Squares",
+    "Triangular Numbers",
+    "Exponential",
+    "Factorial",
+    "Powers of 2",
+    "Powers of 3",
+    "Powers of 4",
+    "Powers of 5",
+    "Powers of 10",
+    "Harmonic",
+    "Alternating Arithmetic Sequence",
+    "Alternating Approximate Arithmetic",
+    "Higher Order Polynomial",
+    "Linear Extrapolation",
+    "Linear Recurrence",
+    "Cubes",
+    "Catalan Numbers",
+    "Primes",
+)
+PATTERN_NAMES += tuple(name for name in power_family_names() if name not in PATTERN_NAMES)
+PATTERN_CODES = {name: code for code, name in enumerate(PATTERN_NAMES)}
+
+
+# Shared tolerance for "equal" floating point quantities
+_TOLERANCE = 1e-10
+
+# math.exp raises OverflowError above this exponent
+_MAX_LOG = math.log(sys.float_info.max)
+
+_is_positive = partial(lt, 0)
+_is_non_negative = partial(le, 0)
+_reciprocal = partial(truediv, 1)
+
+# Sequences made only of these types take the exact path: checks compare
+# integers and rationals exactly instead of floats within _TOLERANCE
+_EXACT_TYPES = frozenset([int, Fraction])
+
+# Deepest finite-difference row the polynomial detector examines
+_MAX_POLYNOMIAL_DEGREE = 6
+
+# Degree of the fallback fit in _custom_patterns for 4+ terms
+_CUSTOM_FIT_DEGREE = 3
+
+# Linear recurrences are only looked for in sequences at least this long,
+# and only up to this order, which keeps the search O(length * order)
+_MIN_RECURRENCE_TERMS = 5
+_MAX_RECURRENCE_ORDER = 8
+
+# Prime for the fixed-width Berlekamp-Massey pass that finds the order
+_RECURRENCE_PRIME = (1 << 61) - 1
+
+_POWER_BASES = [(base, math.log(base)) for base in [2, 3, 4, 5, 10]]
+
+# Rows handed to a worker process at a time by predict_csv
+DEFAULT_CHUNK_SIZE = 10000
+
+# Highest confidence each detector can return, and whether that confidence
+# is scaled up with _length_confidence for longer sequences.  The adaptive
+# cascade skips detectors that cannot beat the best result found so far.
+# None stands for the most confident family of the known sequence index.
+_CONFIDENCE_BOUNDS = {
+    "_arithmetic_sequence": (0.95, True),
+    "_geometric_sequence": (0.95, True),
+    "_polynomial_sequence": (0.9, True),
+    "_fibonacci_like_sequence": (0.9, True),
+    "_quadratic_sequence": (0.85, True),
+    "_exponential_sequence": (0.8, True),
+    "_known_sequence": (None, True),
+    "_power_sequence": (0.85, True),
+    "_harmonic_sequence": (0.8, True),
+    "_custom_patterns": (0.8, False),
+    "_linear_recurrence": (0.85, True),
+}
+
+# Predictions between reorderings of the adaptive cascade, and between
+# the predictions whose detectors it times
+_REORDER_INTERVAL = 1024
+_TIMING_INTERVAL = 16
+
+# _length_confidence reaches exactly 1.0 well before this many terms, so
+# confidence bounds are shared by all longer sequences
+_BOUND_LENGTH_CAP = 64
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "evictions", "maxsize", "currsize"])
+
+# Profiling counters of one detector: calls, calls that returned a match,
+# calls that raised, and nanoseconds spent in it
+DetectorStats = namedtuple("DetectorStats", ["calls", "hits", "errors", "time_ns"])
+
+# a(n) = coefficients[0] * a(n-1) + ... + coefficients[order - 1] * a(n-order)
+Recurrence = namedtuple("Recurrence", ["order", "coefficients"])
+
+
+class SequenceFeatures:
+    """Quantities shared by the detectors, computed once per sequence.
+
+    Features that do not exist for a sequence (ratios when a divisor is zero,
+    logs of non-positive numbers, ...) are stored as None.
+    """
+
+    __slots__ = ("seq", "diffs", "second_diffs", "ratios", "logs",
+                 "reciprocals", "integers", "finite", "exact")
+
+    def __init__(self, seq: List[float]):
+        self.seq = seq
+        self.exact = _EXACT_TYPES.issuperset(map(type, seq))
+        if self.exact:
+            self._init_exact(seq)
+            return
+        if len(seq) == 3:
+            self._init_three(seq)
+            return
+        
+        following = seq[1:]
+        self.diffs = diffs = list(map(sub, following, seq))
+        self.second_diffs = list(map(sub, diffs[1:], diffs))
+        self.ratios = None if 0 in seq[:-1] else list(map(truediv, following, seq))
+        self.reciprocals = None if 0 in seq else list(map(_reciprocal, seq))
+        self.logs = list(map(math.log, seq)) if all(map(_is_positive, seq)) else None
+        self.finite = finite = all(map(isfinite, seq))
+
+        # The nearest integers, if every term is within tolerance of one
+        self.integers = None
+        if finite:
+            integers = tuple(map(round, seq))
+            if max(map(abs, map(sub, seq, integers))) < _TOLERANCE:
+                self.integers = integers
+
+    def _init_exact(self, seq: List[float]):
+        """__init__ for int and Fraction terms, which are never rounded."""
+        self.finite = True
+        if len(seq) == 3 and type(seq[0]) is type(seq[1]) is type(seq[2]) is int:
+            self._init_three_ints(seq)
+            return
+        
+        following = seq[1:]
+        self.diffs = diffs = list(map(sub, following, seq))
+        self.second_diffs = list(map(sub, diffs[1:], diffs))
+        self.integers = tuple(x.numerator for x in seq) if all(x.denominator == 1 for x in seq) else None
+
+        # For the approximate checks; None where a value is out of float range
+        self.ratios = None if 0 in seq[:-1] else _map_in_range(truediv, following, seq)
+        self.reciprocals = None if 0 in seq else _map_in_range(_reciprocal, seq)
+        self.logs = _map_in_range(math.log, seq) if all(map(_is_positive, seq)) else None
+
+    def _init_three_ints(self, seq: List[int]):
+        """Unrolled _init_exact for the common case of 3 ints."""
+        a, b, c = seq
+        diff1 = b - a
+        diff2 = c - b
+        self.diffs = (diff1, diff2)
+        self.second_diffs = (diff2 - diff1,)
+        self.integers = (a, b, c)
+        try:
+            if a != 0 and b != 0:
+                self.ratios = (b / a, c / b)
+                self.reciprocals = (1 / a, 1 / b, 1 / c) if c != 0 else None
+            else:
+                self.ratios = self.reciprocals = None
+        except OverflowError:
+            self.ratios = self.reciprocals = None
+        if a > 0 and b > 0 and c > 0:
+            self.logs = (math.log(a), math.log(b), math.log(c))
+        else:
+            self.logs = None
+
+    def _init_three(self, seq: List[float]):
+        """Unrolled __init__ for the common 3-term case."""
+        a, b, c = seq
+        diff1 = b - a
+        diff2 = c - b
+        self.diffs = (diff1, diff2)
+        self.second_diffs = (diff2 - diff1,)
+        if a != 0 and b != 0:
+            self.ratios = (b / a, c / b)
+            self.reciprocals = (1 / a, 1 / b, 1 / c) if c != 0 else None
+        else:
+            self.ratios = self.reciprocals = None
+        if a > 0 and b > 0 and c > 0:
+            self.logs = (math.log(a), math.log(b), math.log(c))
+        else:
+            self.logs = None
+        self.finite = finite = isfinite(a) and isfinite(b) and isfinite(c)
+
+        self.integers = None
+        if finite:
+            ia, ib, ic = round(a), round(b), round(c)
+            if abs(a - ia) < _TOLERANCE and abs(b - ib) < _TOLERANCE and abs(c - ic) < _TOLERANCE:
+                self.integers = (ia, ib, ic)
 
 
 class NumberPredictor:
     """A class to predict the next number in a sequence."""
     
-    def __init__(self):
+    def __init__(self, cache_size: int = 0, known_sequences: Optional[KnownSequenceIndex] = None,
+                 adaptive: bool = False, profiling: bool = False):
+        """
+        Args:
+            cache_size: Number of predictions to keep in an LRU cache keyed
+                on the sequence; 0 disables caching
+            known_sequences: Index of well-known integer sequences, for
+                example one loaded with KnownSequenceIndex.load; defaults to
+                one built on first use
+            adaptive: Order the detectors by how often they win and how
+                long they take on the workload seen so far, and skip those
+                that cannot beat the best result (see _detect_adaptive)
+            profiling: Count and time every detector call (see stats);
+                profile() turns this on for a block of work
+        """
+        if cache_size < 0:
+            raise ValueError("cache_size must not be negative")
+        
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._cache_evictions = 0
+        self._known_sequences = known_sequences
+        self._known_sequence_table = None
+        
+        self.adaptive = adaptive
+        self._detector_order = []
+        self._cascade = []
+        self._detector_calls = []
+        self._detector_wins = []
+        self._detector_ns = []
+        self._adaptive_predictions = 0
+        self._bounds = {}
+        
+        self.profiling = profiling
+        self._profile_calls = []
+        self._profile_hits = []
+        self._profile_errors = []
+        self._profile_ns = []
+        
         self.prediction_methods = [
             self._arithmetic_sequence,
             self._geometric_sequence,
@@ -20,252 +300,683 @@ class NumberPredictor:
             self._fibonacci_like_sequence,
             self._quadratic_sequence,
             self._exponential_sequence,
-            self._factorial_like_sequence,
+            self._known_sequence,
             self._power_sequence,
             self._harmonic_sequence,
-            self._custom_patterns
+            self._custom_patterns,
+            self._linear_recurrence
         ]
+        
+        # Vectorized counterparts of prediction_methods for predict_batch
+        self._batch_methods = [
+            _batch_arithmetic,
+            _batch_geometric,
+            _batch_polynomial,
+            _batch_fibonacci_like,
+            _batch_quadratic,
+            _batch_exponential,
+            self._batch_known_sequence,
+            _batch_power,
+            _batch_harmonic,
+            _batch_custom,
+        ]
+    
+    @property
+    def known_sequences(self) -> KnownSequenceIndex:
+        """The index of well-known integer sequences used for exact lookups."""
+        if self._known_sequences is None:
+            self._known_sequences = default_index()
+        return self._known_sequences
     
     def predict_next(self, sequence: List[float]) -> Tuple[float, str, float]:
         """
         Predict the next number in the sequence.
         
+        When the predictor was created with a cache_size, repeated sequences
+        (up to the 1e-10 tolerance) are answered from an LRU cache.
+        
+        Longer sequences are checked against every term, and each extra term
+        that fits the detected pattern raises the confidence.
+        
         Args:
-            sequence: List of 3 numbers
+            sequence: List of 3 or more numbers
             
         Returns:
             Tuple of (predicted_number, pattern_type, confidence_score)
         """
-        if len(sequence) != 3:
-            raise ValueError("Exactly 3 numbers are required for prediction")
+        if len(sequence) < 3:
+            raise ValueError("At least 3 numbers are required for prediction")
         
-        best_prediction = None
-        best_confidence = 0
-        best_pattern = "Unknown"
+        if not self.cache_size:
+            return self._detect(sequence)
+        
+        key = _cache_key(sequence)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self._cache_hits += 1
+            return cached
+        
+        self._cache_misses += 1
+        result = self._detect(sequence)
+        self._cache[key] = result
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+            self._cache_evictions += 1
+        return result
+    
+    def cache_info(self) -> CacheInfo:
+        """Return hit, miss and eviction counts along with the cache size."""
+        return CacheInfo(self._cache_hits, self._cache_misses, self._cache_evictions,
+                         self.cache_size, len(self._cache))
+    
+    def clear_cache(self):
+        """Empty the prediction cache and reset its counters."""
+        self._cache.clear()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._cache_evictions = 0
+    
+    def stats(self) -> "OrderedDict[str, DetectorStats]":
+        """
+        Snapshot of the profiling counters: a DetectorStats for each detector,
+        by name, in prediction_methods order.  Only predictions made while
+        profiling is on are counted; cached predictions and predict_batch
+        do not run the detectors.
+        """
+        methods = self.prediction_methods
+        if len(self._profile_calls) != len(methods):
+            self.clear_stats()
+        return OrderedDict(
+            (method.__name__, DetectorStats(*counters))
+            for method, *counters in zip(methods, self._profile_calls, self._profile_hits,
+                                         self._profile_errors, self._profile_ns))
+    
+    def clear_stats(self):
+        """Reset the profiling counters of every detector."""
+        count = len(self.prediction_methods)
+        self._profile_calls = [0] * count
+        self._profile_hits = [0] * count
+        self._profile_errors = [0] * count
+        self._profile_ns = [0] * count
+    
+    @contextmanager
+    def profile(self):
+        """
+        Turn profiling on for the body of a with block:
+        
+            with predictor.profile():
+                for sequence in sequences:
+                    predictor.predict_next(sequence)
+            print(predictor.stats())
+        
+        The counters accumulate across blocks until clear_stats().
+        """
+        previous = self.profiling
+        self.profiling = True
+        try:
+            yield self
+        finally:
+            self.profiling = previous
+    
+    def predict_horizon(self, sequence: List[float], k: int) -> Tuple[Iterator[float], str, float]:
+        """
+        Predict the next k numbers of the sequence.
+        
+        The pattern is detected once and its fitted model (step, ratio,
+        difference table, recurrence, ...) then generates the terms, so the
+        cost is one detection plus O(k) rather than k detections.  The terms
+        are produced lazily, so k can be large.
         
+        Args:
+            sequence: List of 3 or more numbers
+            k: Number of terms to predict
+            
+        Returns:
+            Tuple of (terms, pattern_type, confidence_score).  terms is an
+            iterator over the next k numbers, the first of which is what
+            predict_next returns; the confidence is that of predict_next.
+            The terms of a family from a custom known sequence index end
+            with its last indexed term.
+        """
+        if len(sequence) < 3:
+            raise ValueError("At least 3 numbers are required for prediction")
+        if k < 0:
+            raise ValueError("k must not be negative")
+        
+        features = SequenceFeatures(sequence)
+        best, method = self._best_match(features)
+        if best is None:
+            step = _mean_and_spread(features.diffs)[0]
+            best = (sequence[-1] + step, "Linear Extrapolation", 0.3)
+            terms = _linear_terms(sequence[-1], step)
+        else:
+            horizon = _HORIZONS.get(method.__name__)
+            if horizon is None:
+                terms = self._redetected_terms(sequence)
+            else:
+                terms = horizon(self, features, best[1])
+        
+        prediction, pattern, confidence = best
+        return islice(terms, k), pattern, confidence
+    
+    def _redetected_terms(self, sequence: List[float]) -> Iterator[float]:
+        """Terms of a detector without a horizon model: extend and detect again."""
+        sequence = list(sequence)
+        while True:
+            prediction = self._detect(sequence)[0]
+            yield prediction
+            sequence.append(prediction)
+    
+    @property
+    def detector_order(self) -> List[str]:
+        """Names of the detectors in the order the adaptive cascade runs them."""
+        methods = self.prediction_methods
+        if len(self._detector_order) != len(methods):
+            return [method.__name__ for method in methods]
+        return [methods[index].__name__ for index in self._detector_order]
+    
+    def _detect(self, sequence: List[float]) -> Tuple[float, str, float]:
+        """Run every detector over the sequence and keep the most confident."""
+        features = SequenceFeatures(sequence)
+        best, _ = self._best_match(features)
+        if best is None:
+            # Fallback: simple linear extrapolation
+            best = (sequence[-1] + _mean_and_spread(features.diffs)[0], "Linear Extrapolation", 0.3)
+        
+        return best
+    
+    def _best_match(self, features: SequenceFeatures):
+        """The most confident detector result and the detector, or (None, None)."""
+        if self.profiling:
+            return self._best_match_profiled(features)
+        if self.adaptive:
+            return self._detect_adaptive(features)
+        
+        best = best_method = None
+        best_confidence = 0
         for method in self.prediction_methods:
+            result = method(features)
+            if result is not None and result[2] > best_confidence:
+                best = result
+                best_method = method
+                best_confidence = result[2]
+        return best, best_method
+    
+    def _best_match_profiled(self, features: SequenceFeatures):
+        """
+        The full scan of _best_match, counting and timing every detector.
+        
+        Every detector runs, so the adaptive cascade does not skip or
+        reorder any while profiling.
+        """
+        methods = self.prediction_methods
+        if len(self._profile_calls) != len(methods):
+            self.clear_stats()
+        calls = self._profile_calls
+        hits = self._profile_hits
+        elapsed = self._profile_ns
+        clock = time.perf_counter_ns
+        
+        best = best_method = None
+        best_confidence = 0
+        for index, method in enumerate(methods):
+            calls[index] += 1
+            start = clock()
             try:
-                prediction, pattern, confidence = method(sequence)
-                if confidence > best_confidence:
-                    best_prediction = prediction
-                    best_confidence = confidence
-                    best_pattern = pattern
+                result = method(features)
             except Exception:
-                continue
+                self._profile_errors[index] += 1
+                raise
+            finally:
+                elapsed[index] += clock() - start
+            
+            if result is not None:
+                hits[index] += 1
+                if result[2] > best_confidence:
+                    best = result
+                    best_method = method
+                    best_confidence = result[2]
+        return best, best_method
+    
+    def _detect_adaptive(self, features: SequenceFeatures):
+        """
+        The result of the full scan in _best_match, running fewer detectors.
         
-        if best_prediction is None:
-            # Fallback: simple linear extrapolation
-            diff1 = sequence[1] - sequence[0]
-            diff2 = sequence[2] - sequence[1]
-            best_prediction = sequence[2] + (diff1 + diff2) / 2
-            best_pattern = "Linear Extrapolation"
-            best_confidence = 0.3
+        The full scan keeps the first most confident result, so it returns
+        the result that is largest by (confidence, -position in
+        prediction_methods).  This loop keeps the largest by that same key
+        whatever order it runs the detectors in, so it returns the same
+        result.  It only skips a detector whose confidence bound is below
+        the best confidence so far, or equal to it while the detector comes
+        later in prediction_methods: that detector cannot be larger by the
+        key.
+        """
+        if len(self._detector_order) != len(self.prediction_methods):
+            self._reset_adaptive()
+        bounds = self._confidence_bounds(len(features.seq))
+        # Only every _TIMING_INTERVAL-th prediction is timed, which keeps
+        # the clock reads off the common path
+        self._adaptive_predictions += 1
+        timed = self._adaptive_predictions % _TIMING_INTERVAL == 0
         
-        return best_prediction, best_pattern, best_confidence
-    
-    def _arithmetic_sequence(self, seq: List[float]) -> Tuple[float, str, float]:
-        """Check for arithmetic sequence (constant difference)."""
-        diff1 = seq[1] - seq[0]
-        diff2 = seq[2] - seq[1]
+        best = None
+        best_confidence = 0
+        best_index = -1
+        for index, method in self._cascade:
+            bound = bounds[index]
+            if bound < best_confidence or (bound == best_confidence and index > best_index):
+                continue
+            
+            if timed:
+                start = time.perf_counter_ns()
+                result = method(features)
+                self._detector_ns[index] += time.perf_counter_ns() - start
+                self._detector_calls[index] += 1
+            else:
+                result = method(features)
+            
+            if result is not None:
+                confidence = result[2]
+                if confidence > best_confidence or (confidence == best_confidence
+                                                    and index < best_index):
+                    best = result
+                    best_confidence = confidence
+                    best_index = index
         
-        if abs(diff1 - diff2) < 1e-10:  # Equal differences
-            next_num = seq[2] + diff1
-            return next_num, "Arithmetic Sequence", 0.95
+        if best is not None:
+            self._detector_wins[best_index] += 1
+        if self._adaptive_predictions % _REORDER_INTERVAL == 0:
+            self._reorder_detectors()
+        if best is None:
+            return None, None
+        return best, self.prediction_methods[best_index]
+    
+    def _reorder_detectors(self):
+        """Run the detectors that win most often per nanosecond spent on them first."""
+        calls = self._detector_calls
+        wins = self._detector_wins
+        elapsed = self._detector_ns
         
-        # Check if it's close to arithmetic
-        avg_diff = (diff1 + diff2) / 2
-        if abs(diff1 - diff2) / max(abs(avg_diff), 1) < 0.1:
-            next_num = seq[2] + avg_diff
-            return next_num, "Approximate Arithmetic", 0.7
+        # A win ends the search early most of the time: every detector with a
+        # lower bound is skipped.  Detectors that were never timed sort last.
+        def priority(index):
+            return -(wins[index] + 1) * calls[index] / max(elapsed[index], 1), index
         
-        raise ValueError("Not arithmetic")
+        self._detector_order.sort(key=priority)
+        self._cascade = [(index, self.prediction_methods[index]) for index in self._detector_order]
     
-    def _geometric_sequence(self, seq: List[float]) -> Tuple[float, str, float]:
+    def _reset_adaptive(self):
+        """Start the adaptive cascade over, in prediction_methods order."""
+        count = len(self.prediction_methods)
+        self._detector_order = list(range(count))
+        self._cascade = list(enumerate(self.prediction_methods))
+        self._detector_calls = [0] * count
+        self._detector_wins = [0] * count
+        self._detector_ns = [0] * count
+        self._adaptive_predictions = 0
+        self._bounds = {}
+    
+    def _confidence_bounds(self, terms: int) -> List[float]:
+        """Highest confidence each detector can return for a sequence of terms terms."""
+        terms = min(terms, _BOUND_LENGTH_CAP)
+        bounds = self._bounds.get(terms)
+        if bounds is None:
+            bounds = []
+            for method in self.prediction_methods:
+                confidence, scaled = _CONFIDENCE_BOUNDS.get(method.__name__, (math.inf, False))
+                if confidence is None:
+                    confidence = max(self.known_sequences.confidences, default=0)
+                bounds.append(_length_confidence(confidence, terms) if scaled else confidence)
+            self._bounds[terms] = bounds
+        return bounds
+
+    def predict_batch(self, sequences):
+        """
+        Predict the next number for many 3-number sequences at once.
+
+        Every detector runs as masked NumPy operations over the whole batch,
+        in the same order and with the same tie-breaking as predict_next, so
+        row i of the result matches predict_next(sequences[i]).
+
+        Args:
+            sequences: Array-like of shape (N, 3)
+
+        Returns:
+            Tuple of (predictions, pattern_codes, confidences) arrays of
+            length N.  Pattern codes index into PATTERN_NAMES.
+        """
+        if np is None:
+            raise ImportError("predict_batch requires NumPy (pip install numpy)")
+
+        seqs = np.asarray(sequences, dtype=np.float64)
+        if seqs.ndim != 2 or seqs.shape[1] != 3:
+            raise ValueError("Expected an array of shape (N, 3)")
+
+        a, b, c = seqs[:, 0], seqs[:, 1], seqs[:, 2]
+        best_prediction = np.zeros(len(seqs))
+        best_code = np.full(len(seqs), PATTERN_CODES["Linear Extrapolation"], dtype=np.int16)
+        best_confidence = np.zeros(len(seqs))
+
+        with np.errstate(all="ignore"):
+            for method in self._batch_methods:
+                prediction, code, confidence = method(a, b, c)
+                better = confidence > best_confidence
+                best_prediction = np.where(better, prediction, best_prediction)
+                best_code = np.where(better, code, best_code).astype(np.int16)
+                best_confidence = np.where(better, confidence, best_confidence)
+
+            # Fallback: simple linear extrapolation
+            unmatched = best_confidence == 0
+            fallback = c + ((b - a) + (c - b)) / 2
+            best_prediction = np.where(unmatched, fallback, best_prediction)
+            best_confidence = np.where(unmatched, 0.3, best_confidence)
+
+        return best_prediction, best_code, best_confidence
+
+    def _arithmetic_sequence(self, features: SequenceFeatures) -> Optional[Tuple[float, str, float]]:
+        """Check for arithmetic sequence (constant difference)."""
+        return _arithmetic_fit(features.seq[-1], features.diffs, "Arithmetic Sequence",
+                               "Approximate Arithmetic")
+    
+    def _geometric_sequence(self, features: SequenceFeatures) -> Optional[Tuple[float, str, float]]:
         """Check for geometric sequence (constant ratio)."""
-        if seq[0] == 0 or seq[1] == 0:
-            raise ValueError("Cannot have zero in geometric sequence")
+        exact = features.exact
+        if exact:
+            next_num = _exact_geometric_next(features)
+            if next_num is not None:
+                return next_num, "Geometric Sequence", _length_confidence(0.95, len(features.seq))
         
-        ratio1 = seq[1] / seq[0]
-        ratio2 = seq[2] / seq[1]
+        ratios = features.ratios
+        if ratios is None:
+            return None
         
-        if abs(ratio1 - ratio2) < 1e-10:  # Equal ratios
-            next_num = seq[2] * ratio1
-            return next_num, "Geometric Sequence", 0.95
+        avg_ratio, spread = _mean_and_spread(ratios)
+        if spread < _TOLERANCE and not exact:  # Equal ratios
+            return (features.seq[-1] * ratios[0], "Geometric Sequence",
+                    _length_confidence(0.95, len(features.seq)))
         
         # Check if it's close to geometric
-        avg_ratio = (ratio1 + ratio2) / 2
-        if abs(ratio1 - ratio2) / abs(avg_ratio) < 0.1:
-            next_num = seq[2] * avg_ratio
-            return next_num, "Approximate Geometric", 0.7
+        if avg_ratio != 0 and spread / abs(avg_ratio) < 0.1:
+            return features.seq[-1] * avg_ratio, "Approximate Geometric", 0.7
         
-        raise ValueError("Not geometric")
+        return None
     
-    def _polynomial_sequence(self, seq: List[float]) -> Tuple[float, str, float]:
+    def _polynomial_sequence(self, features: SequenceFeatures) -> Optional[Tuple[float, str, float]]:
         """Check for polynomial patterns using finite differences."""
-        # First differences
-        diff1_1 = seq[1] - seq[0]
-        diff1_2 = seq[2] - seq[1]
-        
-        # Second difference
-        diff2 = diff1_2 - diff1_1
+        seq = features.seq
+        row = features.second_diffs
+        if len(seq) == 3 and not abs(row[0]) < _TOLERANCE:
+            # Three terms always fit a quadratic
+            next_diff1 = features.diffs[1] + row[0]
+            return seq[2] + next_diff1, "Quadratic Polynomial", 0.8
         
-        if abs(diff2) < 1e-10:  # Linear
-            next_num = seq[2] + diff1_2
-            return next_num, "Linear Polynomial", 0.9
+        # Difference until a row vanishes; its depth gives the degree
+        table = [seq, features.diffs]
+        while not max(map(abs, row)) < _TOLERANCE:
+            if len(row) == 1:
+                return None
+            if len(table) > _MAX_POLYNOMIAL_DEGREE:
+                return None
+            table.append(row)
+            row = list(map(sub, row[1:], row))
         
-        # Quadratic pattern
-        next_diff1 = diff1_2 + diff2
-        next_num = seq[2] + next_diff1
-        return next_num, "Quadratic Polynomial", 0.8
+        return _polynomial_result([row[-1] for row in table], len(seq))
     
-    def _fibonacci_like_sequence(self, seq: List[float]) -> Tuple[float, str, float]:
+    def _fibonacci_like_sequence(self, features: SequenceFeatures) -> Optional[Tuple[float, str, float]]:
         """Check for Fibonacci-like sequences (sum of previous two)."""
-        if abs(seq[2] - (seq[0] + seq[1])) < 1e-10:
-            next_num = seq[1] + seq[2]
-            return next_num, "Fibonacci-like", 0.9
+        seq = features.seq
+        for i in range(2, len(seq)):
+            if not abs(seq[i] - (seq[i - 2] + seq[i - 1])) < _TOLERANCE:
+                break
+        else:
+            return (seq[-2] + seq[-1], "Fibonacci-like",
+                    _length_confidence(0.9, len(seq)))
         
         # Weighted Fibonacci
         if seq[0] != 0:
-            weight = seq[2] / (seq[0] + seq[1]) if (seq[0] + seq[1]) != 0 else 1
-            if 0.8 <= weight <= 1.2:
-                next_num = weight * (seq[1] + seq[2])
-                return next_num, "Weighted Fibonacci", 0.6
+            weights = []
+            for i in range(2, len(seq)):
+                pair = seq[i - 2] + seq[i - 1]
+                try:
+                    weight = seq[i] / pair if pair != 0 else 1
+                except OverflowError:  # Integers far apart, so not near 1 either
+                    return None
+                if not 0.8 <= weight <= 1.2:
+                    return None
+                weights.append(weight)
+            weight = sum(weights) / len(weights)
+            return weight * (seq[-2] + seq[-1]), "Weighted Fibonacci", 0.6
         
-        raise ValueError("Not Fibonacci-like")
+        return None
     
-    def _quadratic_sequence(self, seq: List[float]) -> Tuple[float, str, float]:
+    def _quadratic_sequence(self, features: SequenceFeatures) -> Optional[Tuple[float, str, float]]:
         """Check for quadratic patterns like squares, triangular numbers."""
+        if not features.finite:
+            return None
+        if features.exact and features.integers is not None:
+            return _exact_quadratic(features.integers)
+        seq = features.seq
+        
         # Check for perfect squares
-        sqrt_vals = [math.sqrt(abs(x)) for x in seq if x >= 0]
-        if len(sqrt_vals) == 3 and all(abs(x - round(x)) < 1e-10 for x in sqrt_vals):
-            sqrt_ints = [round(x) for x in sqrt_vals]
-            if sqrt_ints[1] - sqrt_ints[0] == sqrt_ints[2] - sqrt_ints[1]:
-                next_sqrt = sqrt_ints[2] + (sqrt_ints[1] - sqrt_ints[0])
-                next_num = next_sqrt ** 2
-                return next_num, "Perfect Squares", 0.85
-        
-        # Check for triangular numbers (n*(n+1)/2)
-        triangular_check = []
+        if min(seq) >= 0:
+            root_ints = _nearest_integers(map(math.sqrt, seq))
+            if root_ints is not None and _has_constant_step(root_ints):
+                next_root = root_ints[-1] + (root_ints[1] - root_ints[0])
+                return (next_root ** 2, "Perfect Squares",
+                        _length_confidence(0.85, len(seq)))
+        
+        # Check for triangular numbers (n*(n+1)/2); terms <= 0 count as n = 0
+        if min(seq) < -0.125:  # 1 + 8 * x < 0 has no real index
+            return None
+        indices = []
         for x in seq:
-            # Solve n*(n+1)/2 = x for n
-            n = (-1 + math.sqrt(1 + 8*x)) / 2 if x > 0 else 0
-            triangular_check.append(abs(n - round(n)) < 1e-10)
+            index = _triangular_index(x)
+            if index is None:
+                return None
+            indices.append(index)
         
-        if all(triangular_check):
-            n_vals = [round((-1 + math.sqrt(1 + 8*x)) / 2) for x in seq]
-            if n_vals[1] - n_vals[0] == n_vals[2] - n_vals[1]:
-                next_n = n_vals[2] + (n_vals[1] - n_vals[0])
-                next_num = next_n * (next_n + 1) / 2
-                return next_num, "Triangular Numbers", 0.85
+        if _has_constant_step(indices):
+            next_n = indices[-1] + (indices[1] - indices[0])
+            return (next_n * (next_n + 1) / 2, "Triangular Numbers",
+                    _length_confidence(0.85, len(seq)))
         
-        raise ValueError("Not quadratic pattern")
+        return None
     
-    def _exponential_sequence(self, seq: List[float]) -> Tuple[float, str, float]:
+    def _exponential_sequence(self, features: SequenceFeatures) -> Optional[Tuple[float, str, float]]:
         """Check for exponential patterns."""
-        if all(x > 0 for x in seq):
-            log_seq = [math.log(x) for x in seq]
-            # Check if log sequence is arithmetic
-            diff1 = log_seq[1] - log_seq[0]
-            diff2 = log_seq[2] - log_seq[1]
-            
-            if abs(diff1 - diff2) < 1e-10:
-                next_log = log_seq[2] + diff1
-                next_num = math.exp(next_log)
-                return next_num, "Exponential", 0.8
+        logs = features.logs
+        if logs is None or features.exact:
+            # Exact terms with a constant ratio are a geometric sequence,
+            # and large ones have logs within _TOLERANCE without one
+            return None
+        
+        # Check if log sequence is arithmetic
+        if _is_arithmetic(logs):
+            next_log = logs[-1] + (logs[1] - logs[0])
+            if next_log <= _MAX_LOG:
+                return math.exp(next_log), "Exponential", _length_confidence(0.8, len(logs))
+        
+        return None
+    
+    def _known_sequence(self, features: SequenceFeatures) -> Optional[Tuple[float, str, float]]:
+        """Look up factorials, powers, primes and other well-known integer sequences."""
+        integers = features.integers
+        if integers is None:
+            return None
         
-        raise ValueError("Not exponential")
+        found = self.known_sequences.lookup(integers)
+        if found is None:
+            return None
+        next_term, pattern, confidence = found
+        return next_term, pattern, _length_confidence(confidence, len(integers))
     
-    def _factorial_like_sequence(self, seq: List[float]) -> Tuple[float, str, float]:
-        """Check for factorial-like patterns."""
-        # Check if sequence matches factorials
-        factorials = [1, 1, 2, 6, 24, 120, 720, 5040]
+    def _batch_known_sequence(self, a, b, c):
+        """Vectorized _known_sequence: one sorted search of the index per batch."""
+        if self._known_sequence_table is None:
+            self._known_sequence_table = _batch_index_table(self.known_sequences)
+        keys, next_terms, codes, confidences = self._known_sequence_table
         
-        for i in range(len(factorials) - 2):
-            if (abs(seq[0] - factorials[i]) < 1e-10 and 
-                abs(seq[1] - factorials[i+1]) < 1e-10 and 
-                abs(seq[2] - factorials[i+2]) < 1e-10):
-                next_num = factorials[i+3]
-                return next_num, "Factorial", 0.9
+        seqs = np.stack([a, b, c], axis=1)
+        rounded = np.round(seqs)
+        whole = np.all((np.abs(seqs - rounded) < _TOLERANCE) & (np.abs(rounded) < 2.0 ** 63), axis=1)
+        queries = _batch_void_keys(np.where(whole[:, None], rounded, 0).astype(np.int64))
         
-        raise ValueError("Not factorial")
+        position = np.minimum(np.searchsorted(keys, queries), len(keys) - 1)
+        found = whole & (keys[position] == queries)
+        return (np.where(found, next_terms[position], 0.0),
+                np.where(found, codes[position], 0),
+                np.where(found, confidences[position], 0.0))
     
-    def _power_sequence(self, seq: List[float]) -> Tuple[float, str, float]:
+    def _power_sequence(self, features: SequenceFeatures) -> Optional[Tuple[float, str, float]]:
         """Check for power sequences like 2^n, 3^n, etc."""
-        if all(x > 0 for x in seq):
-            # Try different bases
-            for base in [2, 3, 4, 5, 10]:
-                log_base_seq = [math.log(x) / math.log(base) for x in seq]
-                
-                # Check if powers are consecutive integers
-                if all(abs(x - round(x)) < 1e-10 for x in log_base_seq):
-                    powers = [round(x) for x in log_base_seq]
-                    if powers[1] - powers[0] == powers[2] - powers[1] == 1:
-                        next_power = powers[2] + 1
-                        next_num = base ** next_power
-                        return next_num, f"Powers of {base}", 0.85
-        
-        raise ValueError("Not power sequence")
-    
-    def _harmonic_sequence(self, seq: List[float]) -> Tuple[float, str, float]:
-        """Check for harmonic sequences (1/n)."""
-        if all(x != 0 for x in seq):
-            reciprocals = [1/x for x in seq]
-            
-            # Check if reciprocals form arithmetic sequence
-            diff1 = reciprocals[1] - reciprocals[0]
-            diff2 = reciprocals[2] - reciprocals[1]
+        logs = features.logs
+        if logs is None or not features.finite:
+            return None
+        integers = features.integers
+        if integers is not None and max(integers) <= MAX_VALUE // MAX_POWER_BASE:
+            return None  # Found by _known_sequence, next power included
+        if features.exact:
+            return _exact_power(features.seq)
+        
+        log_step = logs[1] - logs[0]
+        for base, log_base in _POWER_BASES:
+            # Consecutive powers of base are log(base) apart; this loose
+            # check only skips bases that cannot pass the exact one below.
+            if abs(log_step / log_base - 1) > 1e-8:
+                continue
             
-            if abs(diff1 - diff2) < 1e-10:
-                next_reciprocal = reciprocals[2] + diff1
-                next_num = 1 / next_reciprocal if next_reciprocal != 0 else float('inf')
-                return next_num, "Harmonic", 0.8
+            power_ints = _nearest_integers(x / log_base for x in logs)
+            if (power_ints is not None and power_ints[1] - power_ints[0] == 1
+                    and _has_constant_step(power_ints)):
+                return (base ** (power_ints[-1] + 1), f"Powers of {base}",
+                        _length_confidence(0.85, len(logs)))
         
-        raise ValueError("Not harmonic")
+        return None
     
-    def _custom_patterns(self, seq: List[float]) -> Tuple[float, str, float]:
+    def _harmonic_sequence(self, features: SequenceFeatures) -> Optional[Tuple[float, str, float]]:
+        """Check for harmonic sequences (1/n)."""
+        reciprocals = features.reciprocals
+        if reciprocals is None:
+            return None
+        if features.exact:
+            return _exact_harmonic(features)
+        
+        # Check if reciprocals form arithmetic sequence
+        if _is_arithmetic(reciprocals):
+            next_reciprocal = reciprocals[-1] + (reciprocals[1] - reciprocals[0])
+            next_num = 1 / next_reciprocal if next_reciprocal != 0 else float('inf')
+            return next_num, "Harmonic", _length_confidence(0.8, len(reciprocals))
+        
+        return None
+    
+    def _custom_patterns(self, features: SequenceFeatures) -> Optional[Tuple[float, str, float]]:
         """Check for other custom patterns."""
-        # Alternating signs
-        if len(set([x >= 0 for x in seq])) == 2:
-            # Pattern might involve alternating signs
-            abs_seq = [abs(x) for x in seq]
-            signs = [1 if x >= 0 else -1 for x in seq]
+        seq = features.seq
+        
+        # Mixed signs: arithmetic on the absolute values, flipping the sign
+        non_negative = list(map(_is_non_negative, seq))
+        if any(non_negative) and not all(non_negative):
+            abs_seq = list(map(abs, seq))
+            abs_diffs = list(map(sub, abs_seq[1:], abs_seq))
+            result = _arithmetic_fit(abs_seq[-1], abs_diffs, "Arithmetic Sequence",
+                                     "Approximate Arithmetic")
+            if result is not None:
+                next_abs, pattern, confidence = result
+                next_sign = -1 if seq[-1] >= 0 else 1
+                return next_sign * next_abs, f"Alternating {pattern}", confidence * 0.8
+        
+        if features.exact:
+            if len(seq) == 3:
+                a, b, c = seq
+                return 3 * (c - b) + a, "Higher Order Polynomial", 0.6
+            # The same polynomial, extended through its difference table
+            window = seq[-(min(len(seq) - 1, _CUSTOM_FIT_DEGREE) + 1):]
+            return (_extend_differences(_last_differences(window)),
+                    "Higher Order Polynomial", 0.6)
+        
+        if len(seq) == 3:
+            # Quadratic through positions 0, 1, 2 evaluated at 3; the same
+            # arithmetic as _fit_polynomial followed by _evaluate_polynomial
+            a, b, c = seq
+            a_plus_b = b - a
+            coeff_b = 2 * a_plus_b - (c - a) / 2
+            coeff_a = a_plus_b - coeff_b
+            return coeff_a * 9 + coeff_b * 3 + a, "Higher Order Polynomial", 0.6
+        
+        # Low-degree polynomial through the last few terms
+        degree = min(len(seq) - 1, _CUSTOM_FIT_DEGREE)
+        coeffs = self._fit_polynomial(list(range(degree + 1)), seq[-(degree + 1):], degree)
+        return self._evaluate_polynomial(coeffs, degree + 1), "Higher Order Polynomial", 0.6
+    
+    def _linear_recurrence(self, features: SequenceFeatures) -> Optional[Tuple[float, str, float]]:
+        """Check for integer linear recurrences like tribonacci or Pell numbers."""
+        integers = features.integers
+        if integers is None or len(integers) < _MIN_RECURRENCE_TERMS:
+            return None
+        
+        coefficients = _find_recurrence(integers, _MAX_RECURRENCE_ORDER)
+        if not coefficients:
+            return None
+        
+        next_num = _recurrence_term(sum(map(mul, coefficients, reversed(integers))), features)
+        # 2 * order terms determine the recurrence; the rest confirm it
+        confidence = _length_confidence(0.85, len(integers) - 2 * len(coefficients) + 2)
+        return next_num, "Linear Recurrence", confidence
+    
+    def find_recurrence(self, sequence: List[float],
+                        max_order: Optional[int] = None) -> Optional[Recurrence]:
+        """
+        Find the shortest linear recurrence with constant coefficients that
+        generates an integer sequence, using the Berlekamp-Massey algorithm.
+        
+        Args:
+            sequence: Integer terms (floats within 1e-10 of an integer count)
+            max_order: Give up on recurrences longer than this
             
-            try:
-                next_abs, pattern, confidence = self._arithmetic_sequence(abs_seq)
-                next_sign = -signs[2] if len(set(signs)) == 2 else signs[2]
-                next_num = next_sign * next_abs
-                return next_num, f"Alternating {pattern}", confidence * 0.8
-            except:
-                pass
-        
-        # Polynomial with different degrees
-        x_vals = [0, 1, 2]  # Assume positions 0, 1, 2
-        try:
-            # Fit polynomial and predict next value
-            coeffs = self._fit_polynomial(x_vals, seq, degree=2)
-            next_num = self._evaluate_polynomial(coeffs, 3)
-            return next_num, "Higher Order Polynomial", 0.6
-        except:
-            pass
+        Returns:
+            Recurrence(order, coefficients), or None if the terms are not
+            integers or too few to pin down and check the recurrence (an
+            order k recurrence needs at least 2k + 1 terms)
+        """
+        integers = SequenceFeatures(sequence).integers
+        if integers is None:
+            return None
         
-        raise ValueError("No pattern found")
+        coefficients = _find_recurrence(integers, max_order)
+        if coefficients is None:
+            return None
+        return Recurrence(len(coefficients), tuple(map(_integral, coefficients)))
     
     def _fit_polynomial(self, x_vals: List[float], y_vals: List[float], degree: int) -> List[float]:
-        """Fit polynomial of given degree to data points."""
-        # Simple polynomial fitting using method of differences
-        if degree == 2 and len(x_vals) == 3:
-            # For quadratic: y = ax^2 + bx + c
-            # System of equations for x=0,1,2
-            c = y_vals[0]
-            a_plus_b = y_vals[1] - c
-            four_a_plus_two_b = y_vals[2] - c
-            
-            b = 2 * a_plus_b - (four_a_plus_two_b) / 2
-            a = a_plus_b - b
-            
-            return [a, b, c]
+        """
+        Fit polynomial of given degree to data points.
+        
+        Interpolates the first degree + 1 points using Newton's divided
+        differences.
+        
+        Returns:
+            Coefficients, highest power first
+        """
+        if degree < 0 or min(len(x_vals), len(y_vals)) < degree + 1:
+            raise ValueError("At least degree + 1 points are required")
+        
+        xs = list(x_vals[:degree + 1])
+        newton = list(y_vals[:degree + 1])
+        for order in range(1, degree + 1):
+            for i in range(degree, order - 1, -1):
+                newton[i] = (newton[i] - newton[i - 1]) / (xs[i] - xs[i - order])
+        
+        # Expand the Newton form into powers of x, lowest power first
+        coeffs = [newton[degree]]
+        for i in range(degree - 1, -1, -1):
+            expanded = [0] + coeffs
+            for k, coeff in enumerate(coeffs):
+                expanded[k] -= coeff * xs[i]
+            expanded[0] += newton[i]
+            coeffs = expanded
         
-        raise ValueError("Polynomial fitting not implemented for this degree")
+        return coeffs[::-1]
     
     def _evaluate_polynomial(self, coeffs: List[float], x: float) -> float:
         """Evaluate polynomial at given x value."""
@@ -275,19 +986,947 @@ class NumberPredictor:
         return result
 
 
-def main():
+class SequenceModel:
+    """
+    Streaming polynomial model of a growing sequence.
+    
+    Only the last entry of each finite-difference row is kept, so append
+    costs O(max_degree) however long the sequence gets.  With the default
+    max_degree, predict_next agrees with the polynomial detector of
+    NumberPredictor run over every term appended so far.
+    
+    Example:
+        model = SequenceModel([1, 4, 9])
+        model.append(16)
+        model.predict_next()  # (25, "Quadratic Polynomial", 0.9)
+    """
+    
+    def __init__(self, sequence: Iterable[float] = (), max_degree: int = _MAX_POLYNOMIAL_DEGREE):
+        """
+        Args:
+            sequence: Initial terms
+            max_degree: Highest polynomial degree to detect
+        """
+        if max_degree < 1:
+            raise ValueError("max_degree must be at least 1")
+        
+        self.max_degree = max_degree
+        self._length = 0
+        # Last entry of difference rows 0 to max_degree + 1
+        self._last = []
+        # Whether every entry of the row so far is within _TOLERANCE of 0
+        self._vanishing = []
+        self.extend(sequence)
+    
+    def __len__(self) -> int:
+        return self._length
+    
+    def append(self, value: float):
+        """Add the next term, updating one entry per difference row."""
+        last = self._last
+        vanishing = self._vanishing
+        entry = value
+        for row, previous in enumerate(last):
+            last[row] = entry
+            vanishing[row] = vanishing[row] and abs(entry) < _TOLERANCE
+            entry = entry - previous
+        
+        # The first entry of the next row down, until the table is deep enough
+        if len(last) < self.max_degree + 2:
+            last.append(entry)
+            vanishing.append(abs(entry) < _TOLERANCE)
+        self._length += 1
+    
+    def extend(self, values: Iterable[float]):
+        """Append every term of values in order."""
+        for value in values:
+            self.append(value)
+    
+    @property
+    def degree(self) -> Optional[int]:
+        """Lowest degree (at least 1) of a polynomial through every term, or None."""
+        for degree in range(1, len(self._last) - 1):
+            if self._vanishing[degree + 1]:
+                return degree
+        return None
+    
+    def predict_next(self) -> Optional[Tuple[float, str, float]]:
+        """
+        Predict the term after the last one appended.
+        
+        Returns:
+            Tuple of (predicted_number, pattern_type, confidence_score), or
+            None if no polynomial up to max_degree fits
+        """
+        if self._length < 3:
+            raise ValueError("At least 3 numbers are required for prediction")
+        
+        degree = self.degree
+        if degree is None:
+            if self._length == 3:
+                # Three terms always fit a quadratic
+                return _extend_differences(self._last), "Quadratic Polynomial", 0.8
+            return None
+        return _polynomial_result(self._last[:degree + 1], self._length)
+
+
+def _extend_differences(last_entries):
+    """Next term from the last entry of each difference row, the deepest held constant."""
+    next_num = last_entries[-1]
+    for entry in reversed(last_entries[:-1]):
+        next_num = entry + next_num
+    return next_num
+
+
+def _polynomial_result(last_entries, terms):
+    """Prediction for a polynomial whose degree is len(last_entries) - 1."""
+    degree = len(last_entries) - 1
+    # Each term beyond the degree + 1 needed for the fit is a check
+    confidence = _length_confidence(0.9, terms - degree + 1)
+    if degree == 1:
+        pattern = "Linear Polynomial"
+    elif degree == 2:
+        pattern = "Quadratic Polynomial"
+    else:
+        pattern = "Higher Order Polynomial"
+    return _extend_differences(last_entries), pattern, confidence
+
+
+def _find_recurrence(integers, max_order=None):
+    """
+    Coefficients of the shortest linear recurrence generating integers, or
+    None if it is longer than max_order or too long to be checked by them.
+    """
+    # Modulo a prime every number fits in a machine word, so finding the
+    # order is O(n^2) however large the rationals of the exact fit would get
+    residues = _berlekamp_massey(integers, max_order, _RECURRENCE_PRIME)
+    if residues is None or 2 * len(residues) >= len(integers):
+        return None
+    order = len(residues)
+    
+    # Recurrences usually have small integer coefficients, which are their
+    # own residues; checking those exactly avoids rational arithmetic
+    half = _RECURRENCE_PRIME // 2
+    coefficients = [residue - _RECURRENCE_PRIME if residue > half else residue
+                    for residue in residues]
+    if _generates(coefficients, integers):
+        return coefficients
+    
+    # The exact fit has the same order unless the prime divides one of its
+    # denominators, in which case this gives up rather than answer wrongly
+    return _berlekamp_massey(integers, order)
+
+
+def _berlekamp_massey(terms, max_order=None, modulus=None):
+    """
+    Shortest linear recurrence generating terms, over the rationals or, if
+    a prime modulus is given, over the integers modulo it.
+    
+    Returns the coefficients [c1, ..., cL] of a(n) = c1 * a(n-1) + ... +
+    cL * a(n-L), or None once L would exceed max_order.
+    """
+    if modulus is not None:
+        terms = [term % modulus for term in terms]
+    
+    # Connection polynomials c0 - c1 * x - ... of the current and last
+    # shorter fit.  Modulo a prime they are kept scaled by an arbitrary c0
+    # rather than divided through, which needs a single inverse at the end.
+    current = [Fraction(1)] if modulus is None else [1]
+    previous = current
+    length = 0
+    shift = 1
+    previous_discrepancy = current[0]
+    
+    for n, term in enumerate(terms):
+        discrepancy = current[0] * term
+        for i in range(1, length + 1):
+            discrepancy += current[i] * terms[n - i]
+        if modulus is not None:
+            discrepancy %= modulus
+        if discrepancy == 0:
+            shift += 1
+            continue
+        
+        padding = [0] * (len(previous) + shift - len(current))
+        if modulus is None:
+            factor = discrepancy / previous_discrepancy
+            update = current + padding
+            for i, coefficient in enumerate(previous):
+                update[i + shift] -= factor * coefficient
+        else:
+            update = [previous_discrepancy * coefficient % modulus for coefficient in current] + padding
+            for i, coefficient in enumerate(previous):
+                update[i + shift] = (update[i + shift] - discrepancy * coefficient) % modulus
+        
+        if 2 * length <= n:
+            length = n + 1 - length
+            if max_order is not None and length > max_order:
+                return None
+            previous, previous_discrepancy, shift = current, discrepancy, 1
+        else:
+            shift += 1
+        current = update
+    
+    coefficients = current[1:length + 1]
+    coefficients += [0] * (length - len(coefficients))
+    if modulus is not None:
+        scale = _inverse_mod(current[0], modulus)
+        return [-coefficient * scale % modulus for coefficient in coefficients]
+    return [-coefficient for coefficient in coefficients]
+
+
+def _inverse_mod(value, modulus):
+    """Inverse of value modulo a prime, by the extended Euclidean algorithm."""
+    remainder, next_remainder = value % modulus, modulus
+    inverse, next_inverse = 1, 0
+    while next_remainder:
+        quotient = remainder // next_remainder
+        remainder, next_remainder = next_remainder, remainder - quotient * next_remainder
+        inverse, next_inverse = next_inverse, inverse - quotient * next_inverse
+    return inverse % modulus
+
+
+def _generates(coefficients, integers):
+    """Return True if every term after the first len(coefficients) follows the recurrence."""
+    order = len(coefficients)
+    for n in range(order, len(integers)):
+        if sum(map(mul, coefficients, reversed(integers[n - order:n]))) != integers[n]:
+            return False
+    return True
+
+
+def _map_in_range(function, *iterables):
+    """list(map(function, *iterables)), or None if a result is out of float range."""
+    try:
+        return list(map(function, *iterables))
+    except OverflowError:
+        return None
+
+
+def _exact_quotient(numerator, denominator, features):
+    """
+    numerator / denominator for exact terms: an int when whole, otherwise a
+    Fraction for rational sequences or the nearest float for integer ones.
+    """
+    if type(numerator) is int and type(denominator) is int:
+        quotient, remainder = divmod(numerator, denominator)
+        if not remainder:
+            return quotient
+        if features.integers is not None:
+            return _nearest_float(numerator, denominator)
+    value = Fraction(numerator, denominator)
+    if value.denominator == 1:
+        return value.numerator if features.integers is not None else value
+    if features.integers is not None:
+        return _nearest_float(value.numerator, value.denominator)
+    return value
+
+
+def _recurrence_term(value, features):
+    """
+    A linear recurrence term (an int or Fraction) as predicted: an int when
+    whole and the terms are exact, otherwise the nearest float, as
+    _exact_quotient does for the other detectors.
+    """
+    if features.exact and type(value) is int:
+        return value
+    return _nearest_float(value.numerator, value.denominator)
+
+
+def _nearest_float(numerator, denominator):
+    """The float nearest numerator / denominator, infinite when out of range."""
+    try:
+        return numerator / denominator
+    except OverflowError:
+        return math.inf if (numerator < 0) == (denominator < 0) else -math.inf
+
+
+def _exact_geometric_next(features):
+    """Next term of exact terms with a constant ratio, or None."""
+    seq = features.seq
+    if 0 in seq[:-1]:
+        return None
+    # b / a == c / b without dividing
+    for a, b, c in zip(seq, seq[1:], seq[2:]):
+        if b * b != a * c:
+            return None
+    return _exact_quotient(seq[-1] * seq[-1], seq[-2], features)
+
+
+def _exact_quadratic(integers):
+    """_quadratic_sequence for integers, using integer square roots."""
+    confidence = _length_confidence(0.85, len(integers))
+    if min(integers) < 0:
+        return None
+    
+    roots = []
+    for x in integers:
+        root = _isqrt(x)
+        if root * root != x:
+            break
+        roots.append(root)
+    else:
+        if _has_constant_step(roots):
+            return (roots[-1] + (roots[1] - roots[0])) ** 2, "Perfect Squares", confidence
+    
+    # x is triangular when 8x + 1 is a perfect square
+    indices = []
+    for x in integers:
+        root = _isqrt(8 * x + 1)
+        if root * root != 8 * x + 1:
+            return None
+        indices.append((root - 1) // 2)
+    if _has_constant_step(indices):
+        next_n = indices[-1] + (indices[1] - indices[0])
+        return next_n * (next_n + 1) // 2, "Triangular Numbers", confidence
+    return None
+
+
+def _exact_power(seq):
+    """_power_sequence for positive exact terms, by repeated division."""
+    for base, _ in _POWER_BASES:
+        if all(b == a * base for a, b in zip(seq, seq[1:])) and _is_power(seq[0], base):
+            return seq[-1] * base, f"Powers of {base}", _length_confidence(0.85, len(seq))
+    return None
+
+
+def _is_power(value, base):
+    """Whether value is base ** n for some integer n (negative for fractions)."""
+    numerator, denominator = value.numerator, value.denominator
+    if numerator == 1:
+        numerator, denominator = denominator, numerator
+    if denominator != 1:
+        return False
+    while numerator % base == 0:
+        numerator //= base
+    return numerator == 1
+
+
+def _exact_harmonic(features):
+    """_harmonic_sequence for exact terms, comparing reciprocal steps exactly."""
+    seq = features.seq
+    # 1/b - 1/a == 1/c - 1/b, multiplied through by a * b * c
+    for a, b, c in zip(seq, seq[1:], seq[2:]):
+        if (a - b) * c != (b - c) * a:
+            return None
+    
+    # 1 / (2/last - 1/previous)
+    previous, last = seq[-2], seq[-1]
+    denominator = 2 * previous - last
+    if denominator == 0:
+        next_num = float('inf')
+    else:
+        next_num = _exact_quotient(previous * last, denominator, features)
+    return next_num, "Harmonic", _length_confidence(0.8, len(seq))
+
+
+def _last_differences(terms):
+    """Last entry of every finite-difference row of terms, down to a single entry."""
+    entries = [terms[-1]]
+    row = terms
+    while len(row) > 1:
+        row = list(map(sub, row[1:], row))
+        entries.append(row[-1])
+    return entries
+
+
+def _integral(value):
+    """Return a Fraction (or int) as an int when it is a whole number."""
+    return value.numerator if value.denominator == 1 else value
+
+
+def _cache_key(sequence):
+    """Quantize a sequence so that terms within _TOLERANCE usually share a key."""
+    if _EXACT_TYPES.issuperset(map(type, sequence)):
+        # Exact terms are compared exactly, so they are their own key
+        return ("exact",) + tuple(sequence)
+    key = []
+    for x in sequence:
+        steps = x / _TOLERANCE
+        # Values too large (or not finite) to quantize are used as-is
+        key.append(round(steps) if isfinite(steps) else x)
+    return tuple(key)
+
+
+def _triangular_index(x):
+    """Return n with n*(n+1)/2 == x (n = 0 for x <= 0), or None."""
+    # Solve n*(n+1)/2 = x for n
+    n = (-1 + math.sqrt(1 + 8 * x)) / 2
+    index = round(n) if n != math.inf else None
+    if x > 0 and (index is None or abs(n - index) >= _TOLERANCE):
+        return None
+    return index
+
+
+def _arithmetic_fit(last, diffs, exact_pattern, approximate_pattern):
+    """Extend a sequence ending in last whose consecutive differences are diffs."""
+    avg_diff, spread = _mean_and_spread(diffs)
+    if spread < _TOLERANCE:  # Equal differences
+        return last + diffs[0], exact_pattern, _length_confidence(0.95, len(diffs) + 1)
+    
+    # Check if it's close to arithmetic
+    if spread / max(abs(avg_diff), 1) < 0.1:
+        return last + avg_diff, approximate_pattern, 0.7
+    
+    return None
+
+
+def _mean_and_spread(values):
+    """
+    Return the mean of values and the distance between the extremes (NaN
+    if any is NaN).  The mean of integers beyond float range is a Fraction.
+    """
+    if len(values) == 2:
+        a, b = values
+        try:
+            return (a + b) / 2, abs(a - b)
+        except OverflowError:
+            return Fraction(a + b, 2), abs(a - b)
+    try:
+        mean = sum(values) / len(values)
+    except OverflowError:
+        mean = Fraction(sum(values), len(values))
+    if mean != mean:  # max and min skip over NaNs
+        return mean, mean
+    return mean, max(values) - min(values)
+
+
+def _is_arithmetic(values):
+    """Return True if consecutive values all differ by the first step (within _TOLERANCE)."""
+    step = values[1] - values[0]
+    if len(values) == 3:
+        return abs((values[2] - values[1]) - step) < _TOLERANCE
+    for a, b in zip(values[1:], values[2:]):
+        if not abs((b - a) - step) < _TOLERANCE:
+            return False
+    return True
+
+
+def _nearest_integers(values):
+    """Round each value, or return None if any is not within _TOLERANCE of an integer."""
+    integers = []
+    for value in values:
+        integer = round(value)
+        if not abs(value - integer) < _TOLERANCE:
+            return None
+        integers.append(integer)
+    return integers
+
+
+def _has_constant_step(integers):
+    """Return True if consecutive integers are all the same distance apart."""
+    step = integers[1] - integers[0]
+    for a, b in zip(integers[1:], integers[2:]):
+        if b - a != step:
+            return False
+    return True
+
+
+def _length_confidence(confidence, terms):
+    """
+    Scale a confidence calibrated on 3 terms to a pattern confirmed by more.
+    
+    Every extra term that agrees with the pattern halves the remaining doubt.
+    """
+    if terms <= 3:
+        return confidence
+    return 1 - (1 - confidence) * 0.5 ** (terms - 3)
+
+
+# Horizon models for predict_horizon.  Each takes the predictor, the features
+# of a sequence and the pattern its detector reported, fits that detector's
+# model again (O(length), without the other detectors) and yields the terms
+# after the sequence, the first being the detector's own prediction.
+
+def _linear_terms(last, step):
+    for i in count(1):
+        yield last + step * i
+
+
+def _arithmetic_horizon(predictor, features, pattern):
+    return _arithmetic_model_terms(features.seq[-1], features.diffs, pattern)
+
+
+def _arithmetic_model_terms(last, diffs, pattern):
+    step = diffs[0] if "Approximate" not in pattern else _mean_and_spread(diffs)[0]
+    return _linear_terms(last, step)
+
+
+def _geometric_horizon(predictor, features, pattern):
+    seq = features.seq
+    if features.exact and pattern == "Geometric Sequence":
+        ratio = Fraction(seq[-1], seq[-2])
+        if ratio.denominator == 1:
+            ratio = ratio.numerator
+        term = seq[-1]
+        while True:
+            term = term * ratio
+            yield _exact_quotient(term.numerator, term.denominator, features)
+    
+    ratios = features.ratios
+    ratio = ratios[0] if pattern == "Geometric Sequence" else _mean_and_spread(ratios)[0]
+    term = features.seq[-1]
+    while True:
+        # Repeated multiplication overflows to inf, where ratio ** i would raise
+        term = term * ratio
+        yield term
+
+
+def _polynomial_horizon(predictor, features, pattern):
+    # Last entry of each difference row down to the first that vanishes,
+    # as in _polynomial_sequence; three terms fit a quadratic
+    entries = [features.seq[-1], features.diffs[-1]]
+    row = features.second_diffs
+    while not max(map(abs, row)) < _TOLERANCE:
+        entries.append(row[-1])
+        if len(row) == 1:
+            break
+        row = list(map(sub, row[1:], row))
+    return _difference_terms(entries)
+
+
+def _difference_terms(entries):
+    """Extend a difference table from the last entry of each row, the deepest held constant."""
+    entries = list(entries)
+    while True:
+        for row in range(len(entries) - 2, -1, -1):
+            entries[row] = entries[row] + entries[row + 1]
+        yield entries[0]
+
+
+def _fibonacci_like_horizon(predictor, features, pattern):
+    seq = features.seq
+    weight = 1
+    if pattern == "Weighted Fibonacci":
+        weights = []
+        for i in range(2, len(seq)):
+            pair = seq[i - 2] + seq[i - 1]
+            weights.append(seq[i] / pair if pair != 0 else 1)
+        weight = sum(weights) / len(weights)
+    
+    a, b = seq[-2], seq[-1]
+    while True:
+        a, b = b, a + b
+        if weight != 1:
+            b = weight * b
+        yield b
+
+
+def _quadratic_horizon(predictor, features, pattern):
+    seq = features.seq
+    exact = features.exact
+    if pattern == "Perfect Squares":
+        roots = list(map(_isqrt, seq)) if exact else _nearest_integers(map(math.sqrt, seq))
+        for root in _linear_terms(roots[-1], roots[1] - roots[0]):
+            yield root ** 2
+    elif exact:
+        indices = [(_isqrt(8 * x + 1) - 1) // 2 for x in features.integers]
+        for n in _linear_terms(indices[-1], indices[1] - indices[0]):
+            yield n * (n + 1) // 2
+    else:
+        indices = list(map(_triangular_index, seq))
+        for n in _linear_terms(indices[-1], indices[1] - indices[0]):
+            yield n * (n + 1) / 2
+
+
+def _exponential_horizon(predictor, features, pattern):
+    logs = features.logs
+    for next_log in _linear_terms(logs[-1], logs[1] - logs[0]):
+        yield math.exp(next_log) if next_log <= _MAX_LOG else math.inf
+
+
+def _known_sequence_horizon(predictor, features, pattern):
+    return predictor.known_sequences.continuation(features.integers)
+
+
+def _power_horizon(predictor, features, pattern):
+    base = int(pattern[len("Powers of "):])
+    if features.exact:
+        term = features.seq[-1]
+        while True:
+            term = term * base
+            yield term
+    power = round(features.logs[-1] / math.log(base))
+    for exponent in count(power + 1):
+        yield base ** exponent
+
+
+def _harmonic_horizon(predictor, features, pattern):
+    if features.exact:
+        previous, last = features.seq[-2:]
+        last_reciprocal = Fraction(1) / last
+        step = last_reciprocal - Fraction(1) / previous
+        for i in count(1):
+            reciprocal = last_reciprocal + step * i
+            if reciprocal == 0:
+                yield float('inf')
+            else:
+                yield _exact_quotient(reciprocal.denominator, reciprocal.numerator, features)
+    
+    reciprocals = features.reciprocals
+    for reciprocal in _linear_terms(reciprocals[-1], reciprocals[1] - reciprocals[0]):
+        yield 1 / reciprocal if reciprocal != 0 else float('inf')
+
+
+def _custom_horizon(predictor, features, pattern):
+    seq = features.seq
+    if pattern.startswith("Alternating"):
+        abs_seq = list(map(abs, seq))
+        abs_diffs = list(map(sub, abs_seq[1:], abs_seq))
+        sign = -1 if seq[-1] >= 0 else 1
+        for next_abs in _arithmetic_model_terms(abs_seq[-1], abs_diffs, pattern):
+            yield sign * next_abs
+            sign = -sign
+    elif features.exact:
+        window = seq[-(min(len(seq) - 1, _CUSTOM_FIT_DEGREE) + 1):]
+        yield from _difference_terms(_last_differences(window))
+    elif len(seq) == 3:
+        # The quadratic of _custom_patterns, evaluated at 3, 4, ...
+        a, b, c = seq
+        a_plus_b = b - a
+        coeff_b = 2 * a_plus_b - (c - a) / 2
+        coeff_a = a_plus_b - coeff_b
+        for x in count(3):
+            yield coeff_a * x ** 2 + coeff_b * x + a
+    else:
+        degree = min(len(seq) - 1, _CUSTOM_FIT_DEGREE)
+        coeffs = predictor._fit_polynomial(list(range(degree + 1)), seq[-(degree + 1):], degree)
+        for x in count(degree + 1):
+            yield predictor._evaluate_polynomial(coeffs, x)
+
+
+def _linear_recurrence_horizon(predictor, features, pattern):
+    integers = features.integers
+    coefficients = _find_recurrence(integers, _MAX_RECURRENCE_ORDER)
+    window = deque(integers[-len(coefficients):], maxlen=len(coefficients))
+    while True:
+        next_num = _integral(sum(map(mul, coefficients, reversed(window))))
+        window.append(next_num)
+        yield _recurrence_term(next_num, features)
+
+
+_HORIZONS = {
+    "_arithmetic_sequence": _arithmetic_horizon,
+    "_geometric_sequence": _geometric_horizon,
+    "_polynomial_sequence": _polynomial_horizon,
+    "_fibonacci_like_sequence": _fibonacci_like_horizon,
+    "_quadratic_sequence": _quadratic_horizon,
+    "_exponential_sequence": _exponential_horizon,
+    "_known_sequence": _known_sequence_horizon,
+    "_power_sequence": _power_horizon,
+    "_harmonic_sequence": _harmonic_horizon,
+    "_custom_patterns": _custom_horizon,
+    "_linear_recurrence": _linear_recurrence_horizon,
+}
+
+
+# Vectorized counterparts of the NumberPredictor detectors used by
+# predict_batch.  Each takes the three columns of an (N, 3) batch and returns
+# (predictions, codes, confidences); a confidence of 0 means "no match", which
+# plays the role of the ValueError raised by the scalar detector.
+
+def _batch_select(shape, *cases):
+    """Combine (mask, prediction, pattern, confidence) cases, first match wins."""
+    prediction = np.zeros(shape)
+    code = np.zeros(shape, dtype=np.int16)
+    confidence = np.zeros(shape)
+    for mask, case_prediction, pattern, case_confidence in reversed(cases):
+        prediction = np.where(mask, case_prediction, prediction)
+        code = np.where(mask, PATTERN_CODES[pattern], code)
+        confidence = np.where(mask, case_confidence, confidence)
+    return prediction, code, confidence
+
+
+def _batch_is_whole(x):
+    """Elementwise version of abs(x - round(x)) < _TOLERANCE."""
+    return np.abs(x - np.round(x)) < _TOLERANCE
+
+
+def _batch_arithmetic(a, b, c, labels=("Arithmetic Sequence", "Approximate Arithmetic")):
+    diff1 = b - a
+    diff2 = c - b
+    exact = np.abs(diff1 - diff2) < _TOLERANCE
+    avg_diff = (diff1 + diff2) / 2
+    approximate = np.abs(diff1 - diff2) / np.maximum(np.abs(avg_diff), 1) < 0.1
+    return _batch_select(
+        a.shape,
+        (exact, c + diff1, labels[0], 0.95),
+        (approximate, c + avg_diff, labels[1], 0.7),
+    )
+
+
+def _batch_geometric(a, b, c):
+    usable = (a != 0) & (b != 0)
+    ratio1 = b / a
+    ratio2 = c / b
+    exact = usable & (np.abs(ratio1 - ratio2) < _TOLERANCE)
+    avg_ratio = (ratio1 + ratio2) / 2
+    approximate = usable & (avg_ratio != 0) & (np.abs(ratio1 - ratio2) / np.abs(avg_ratio) < 0.1)
+    return _batch_select(
+        a.shape,
+        (exact, c * ratio1, "Geometric Sequence", 0.95),
+        (approximate, c * avg_ratio, "Approximate Geometric", 0.7),
+    )
+
+
+def _batch_polynomial(a, b, c):
+    diff1_1 = b - a
+    diff1_2 = c - b
+    diff2 = diff1_2 - diff1_1
+    linear = np.abs(diff2) < _TOLERANCE
+    return _batch_select(
+        a.shape,
+        (linear, c + diff1_2, "Linear Polynomial", 0.9),
+        (np.ones(a.shape, dtype=bool), c + (diff1_2 + diff2), "Quadratic Polynomial", 0.8),
+    )
+
+
+def _batch_fibonacci_like(a, b, c):
+    exact = np.abs(c - (a + b)) < _TOLERANCE
+    pair_sum = a + b
+    weight = np.where(pair_sum != 0, c / pair_sum, 1.0)
+    weighted = (a != 0) & (weight >= 0.8) & (weight <= 1.2)
+    return _batch_select(
+        a.shape,
+        (exact, b + c, "Fibonacci-like", 0.9),
+        (weighted, weight * (b + c), "Weighted Fibonacci", 0.6),
+    )
+
+
+def _batch_quadratic(a, b, c):
+    roots = [np.sqrt(x) for x in (a, b, c)]
+    squares = (a >= 0) & (b >= 0) & (c >= 0)
+    for root in roots:
+        squares &= _batch_is_whole(root)
+    r0, r1, r2 = (np.round(root) for root in roots)
+    squares &= (r1 - r0) == (r2 - r1)
+
+    # Non-positive terms count as the 0th triangular number, but anything
+    # below -1/8 makes the index computation fail (math domain error).
+    indices = [(-1 + np.sqrt(1 + 8 * x)) / 2 for x in (a, b, c)]
+    triangular = np.ones(a.shape, dtype=bool)
+    for x, n in zip((a, b, c), indices):
+        triangular &= (x <= 0) | _batch_is_whole(n)
+        triangular &= 1 + 8 * x >= 0
+    n0, n1, n2 = (np.round(n) for n in indices)
+    triangular &= (n1 - n0) == (n2 - n1)
+    next_n = n2 + (n1 - n0)
+
+    return _batch_select(
+        a.shape,
+        (squares, (r2 + (r1 - r0)) ** 2, "Perfect Squares", 0.85),
+        (triangular, next_n * (next_n + 1) / 2, "Triangular Numbers", 0.85),
+    )
+
+
+def _batch_exponential(a, b, c):
+    positive = (a > 0) & (b > 0) & (c > 0)
+    log_a, log_b, log_c = np.log(a), np.log(b), np.log(c)
+    diff1 = log_b - log_a
+    diff2 = log_c - log_b
+    prediction = np.exp(log_c + diff1)
+    # math.exp raises OverflowError where NumPy returns inf
+    match = positive & (np.abs(diff1 - diff2) < _TOLERANCE) & np.isfinite(prediction)
+    return _batch_select(a.shape, (match, prediction, "Exponential", 0.8))
+
+
+def _batch_void_keys(windows):
+    """View each row of an int64 (N, 3) array as one opaque, sortable key."""
+    windows = np.ascontiguousarray(windows, dtype=np.int64)
+    return windows.view(np.dtype((np.void, windows.itemsize * 3))).ravel()
+
+
+def _batch_index_table(index):
+    """Sorted keys and the next term, code and confidence of every 3-term window."""
+    windows, next_terms, codes, confidences = [], [], [], []
+    for window, next_term, pattern, confidence in index.windows():
+        windows.append(window)
+        next_terms.append(float(next_term))
+        codes.append(PATTERN_CODES[pattern])
+        confidences.append(confidence)
+    
+    keys = _batch_void_keys(np.array(windows, dtype=np.int64).reshape(-1, 3))
+    order = np.argsort(keys)
+    return (keys[order], np.array(next_terms)[order],
+            np.array(codes, dtype=np.int16)[order], np.array(confidences)[order])
+
+
+def _batch_power(a, b, c):
+    positive = (a > 0) & (b > 0) & (c > 0)
+    logs = (np.log(a), np.log(b), np.log(c))
+    cases = []
+    for base in [2, 3, 4, 5, 10]:
+        log_base = [x / math.log(base) for x in logs]
+        match = positive.copy()
+        for x in log_base:
+            match &= _batch_is_whole(x)
+        p0, p1, p2 = (np.round(x) for x in log_base)
+        match &= (p1 - p0 == 1) & (p2 - p1 == 1)
+        cases.append((match, np.power(float(base), p2 + 1), f"Powers of {base}", 0.85))
+    return _batch_select(a.shape, *cases)
+
+
+def _batch_harmonic(a, b, c):
+    nonzero = (a != 0) & (b != 0) & (c != 0)
+    reciprocals = (1 / a, 1 / b, 1 / c)
+    diff1 = reciprocals[1] - reciprocals[0]
+    diff2 = reciprocals[2] - reciprocals[1]
+    next_reciprocal = reciprocals[2] + diff1
+    prediction = np.where(next_reciprocal != 0, 1 / next_reciprocal, np.inf)
+    match = nonzero & (np.abs(diff1 - diff2) < _TOLERANCE)
+    return _batch_select(a.shape, (match, prediction, "Harmonic", 0.8))
+
+
+def _batch_custom(a, b, c):
+    # Alternating signs: arithmetic on the absolute values
+    non_negative = [a >= 0, b >= 0, c >= 0]
+    mixed = ~((non_negative[0] == non_negative[1]) & (non_negative[1] == non_negative[2]))
+    abs_prediction, abs_code, abs_confidence = _batch_arithmetic(
+        np.abs(a), np.abs(b), np.abs(c),
+        labels=("Alternating Arithmetic Sequence", "Alternating Approximate Arithmetic"),
+    )
+    next_sign = np.where(non_negative[2], -1.0, 1.0)
+    alternating = mixed & (abs_confidence > 0)
+
+    # Quadratic fit through x = 0, 1, 2 evaluated at x = 3
+    a_plus_b = b - a
+    four_a_plus_two_b = c - a
+    coeff_b = 2 * a_plus_b - four_a_plus_two_b / 2
+    coeff_a = a_plus_b - coeff_b
+    polynomial = coeff_a * 9 + coeff_b * 3 + a * 1
+
+    prediction = np.where(alternating, next_sign * abs_prediction, polynomial)
+    code = np.where(alternating, abs_code, PATTERN_CODES["Higher Order Polynomial"])
+    confidence = np.where(alternating, abs_confidence * 0.8, 0.6)
+    return prediction, code, confidence
+
+
+def predict_csv(input_path: str, output_path: str, workers: Optional[int] = None,
+                chunk_size: int = DEFAULT_CHUNK_SIZE, skip_header: bool = False) -> int:
+    """
+    Predict the next number for every row of a CSV file of sequences.
+    
+    Chunks of rows are spread over a pool of worker processes, each with its
+    own NumberPredictor, and the results are written in input order.  At most
+    two chunks per worker are in flight, so memory use does not grow with the
+    file.
+    
+    Each output row is prediction,pattern,confidence.  Rows that cannot be
+    predicted get an empty prediction and confidence and an "Error: ..."
+    pattern.
+    
+    Args:
+        input_path: CSV file with 3 or more numbers per row
+        output_path: CSV file to write
+        workers: Number of processes; defaults to the number of CPUs, and 1
+            predicts in this process
+        chunk_size: Rows per chunk
+        skip_header: Whether the first row of the input is a header
+        
+    Returns:
+        Number of rows predicted
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    workers = workers or os.cpu_count() or 1
+    
+    rows = 0
+    with open(input_path, newline="") as source, open(output_path, "w", newline="") as target:
+        if skip_header:
+            next(source, None)
+        target.write("prediction,pattern,confidence\r\n")
+        
+        chunks = iter(lambda: list(islice(source, chunk_size)), [])
+        for text, count in _predict_chunks(chunks, workers):
+            target.write(text)
+            rows += count
+    return rows
+
+
+_worker_predictor = None
+
+
+def _init_worker():
+    """Give this process its own NumberPredictor for _predict_chunk."""
+    global _worker_predictor
+    _worker_predictor = NumberPredictor()
+
+
+def _predict_chunk(lines):
+    """Predict every CSV line of a chunk; returns (output text, row count)."""
+    output = io.StringIO()
+    writer = csv.writer(output)
+    for row in csv.reader(lines):
+        try:
+            sequence = [_parse_number(field) for field in row if field.strip()]
+            writer.writerow(_worker_predictor.predict_next(sequence))
+        except (ValueError, ArithmeticError) as e:
+            writer.writerow(["", f"Error: {e}", ""])
+    return output.getvalue(), len(lines)
+
+
+def _parse_number(text):
+    """An int for integer text, so it takes the exact path; otherwise a float."""
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def _predict_chunks(chunks, workers):
+    """Yield the results of _predict_chunk for each chunk, in order."""
+    if workers == 1:
+        _init_worker()
+        yield from map(_predict_chunk, chunks)
+        return
+    
+    with ProcessPoolExecutor(workers, initializer=_init_worker) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(_predict_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def main(argv: Optional[List[str]] = None):
+    """Predict a CSV file of sequences, or run the interactive predictor."""
+    parser = argparse.ArgumentParser(description="Predict the next number in a sequence.")
+    parser.add_argument("--input", help="CSV file of sequences to predict in bulk")
+    parser.add_argument("--output", help="CSV file for the predictions")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="rows per chunk handed to a worker")
+    parser.add_argument("--skip-header", action="store_true", help="ignore the first input row")
+    args = parser.parse_args(argv)
+    
+    if args.input is None:
+        interactive()
+        return
+    if args.output is None:
+        parser.error("--output is required with --input")
+    
+    start = time.perf_counter()
+    rows = predict_csv(args.input, args.output, args.workers, args.chunk_size, args.skip_header)
+    elapsed = time.perf_counter() - start
+    print(f"Predicted {rows} rows in {elapsed:.2f}s ({rows / elapsed:,.0f} rows/sec)",
+          file=sys.stderr)
+
+
+def interactive():
     """Interactive number sequence predictor."""
     predictor = NumberPredictor()
     
     print("🔮 NUMBER SEQUENCE PREDICTOR")
     print("=" * 50)
-    print("Enter 3 numbers and I'll predict the next one!")
+    print("Enter 3 or more numbers and I'll predict the next one!")
     print("Supports: arithmetic, geometric, polynomial, Fibonacci, and more patterns")
     print("-" * 50)
     
     while True:
         try:
-            print("\n📝 Enter 3 numbers (or 'quit' to exit):")
+            print("\n📝 Enter 3 or more numbers (or 'quit' to exit):")
             user_input = input("Numbers (space-separated): ").strip()
             
             if user_input.lower() in ['quit', 'exit', 'q']:
@@ -295,18 +1934,21 @@ def main():
                 break
             
             # Parse input
-            numbers = [float(x) for x in user_input.split()]
+            numbers = [_parse_number(x) for x in user_input.split()]
             
-            if len(numbers) != 3:
-                print("❌ Please enter exactly 3 numbers.")
+            if len(numbers) < 3:
+                print("❌ Please enter at least 3 numbers.")
                 continue
             
             # Make prediction
             prediction, pattern, confidence = predictor.predict_next(numbers)
             
             print(f"\n🎯 PREDICTION RESULTS:")
-            print(f"📊 Sequence: {numbers[0]} → {numbers[1]} → {numbers[2]} → ?")
-            print(f"🔮 Next number: {prediction:.6g}")
+            print(f"📊 Sequence: {' → '.join(map(str, numbers))} → ?")
+            if isinstance(prediction, int):
+                print(f"🔮 Next number: {prediction}")
+            else:
+                print(f"🔮 Next number: {float(prediction):.6g}")
             print(f"🧠 Pattern detected: {pattern}")
             print(f"📈 Confidence: {confidence:.1%}")
             
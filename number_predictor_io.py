@@ -0,0 +1,191 @@
+"""
+Number Predictor Binary Jobs
+============================
+A compact binary format for bulk NumberPredictor jobs, read and written
+through numpy.memmap so that files larger than RAM are processed in slices
+without ever being loaded whole.
+
+Input file:  a 64-byte header, then an N x 3 matrix of little-endian float64
+             sequences, row by row.
+Output file: a 64-byte header, then N float64 predictions, N float64
+             confidences and N int16 pattern ids (indices into
+             PATTERN_NAMES), each as one contiguous block.
+
+Header: 8-byte magic, uint32 format version, uint32 columns, uint64 rows,
+padded with zeros to 64 bytes.
+
+Usage:
+    python number_predictor_io.py jobs.bin predictions.bin
+"""
+
+import argparse
+import os
+import struct
+import sys
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from number_predictor import NumberPredictor
+
+HEADER_SIZE = 64
+FORMAT_VERSION = 1
+INPUT_MAGIC = b"NPJOBIN\0"
+OUTPUT_MAGIC = b"NPJOBOUT"
+
+# Rows handed to predict_batch at a time by predict_file
+DEFAULT_SLICE_ROWS = 1 << 16
+
+_HEADER = struct.Struct("<8sIIQ")
+_KINDS = {INPUT_MAGIC: "input", OUTPUT_MAGIC: "output"}
+_FLOAT = np.dtype("<f8")
+_PATTERN_ID = np.dtype("<i2")
+
+PredictionOutput = namedtuple("PredictionOutput", ["predictions", "confidences", "pattern_ids"])
+
+
+def create_input(path: str, rows: int) -> np.ndarray:
+    """
+    Create an input file for rows sequences and map its matrix for writing.
+
+    Returns:
+        Writable (rows, 3) float64 array backed by the file
+    """
+    _write_header(path, INPUT_MAGIC, 3, rows, rows * 3 * _FLOAT.itemsize)
+    return _map(path, _FLOAT, "r+", HEADER_SIZE, (rows, 3))
+
+
+def write_input(path: str, sequences) -> int:
+    """
+    Write an (N, 3) array-like of sequences as an input file.
+
+    Returns:
+        Number of rows written
+    """
+    sequences = np.asarray(sequences, dtype=np.float64)
+    if sequences.ndim != 2 or sequences.shape[1] != 3:
+        raise ValueError("Expected an array of shape (N, 3)")
+
+    matrix = create_input(path, len(sequences))
+    matrix[:] = sequences
+    _flush(matrix)
+    return len(sequences)
+
+
+def open_input(path: str) -> np.ndarray:
+    """Map the (N, 3) float64 matrix of an input file read-only."""
+    rows = _read_header(path, INPUT_MAGIC, 3, 3 * _FLOAT.itemsize)
+    return _map(path, _FLOAT, "r", HEADER_SIZE, (rows, 3))
+
+
+def create_output(path: str, rows: int) -> PredictionOutput:
+    """Create an output file for rows predictions and map its blocks for writing."""
+    _write_header(path, OUTPUT_MAGIC, 3, rows, rows * _output_row_size())
+    return _map_output(path, rows, "r+")
+
+
+def open_output(path: str) -> PredictionOutput:
+    """Map the blocks of an output file read-only."""
+    rows = _read_header(path, OUTPUT_MAGIC, 3, _output_row_size())
+    return _map_output(path, rows, "r")
+
+
+def predict_file(input_path: str, output_path: str, predictor: NumberPredictor = None,
+                 slice_rows: int = DEFAULT_SLICE_ROWS) -> int:
+    """
+    Predict every sequence of an input file into a new output file.
+
+    Only slice_rows rows of either file are touched at a time, so memory use
+    is bounded by the slice size rather than the job size.
+
+    Returns:
+        Number of rows predicted
+    """
+    if slice_rows < 1:
+        raise ValueError("slice_rows must be at least 1")
+    predictor = predictor or NumberPredictor()
+
+    sequences = open_input(input_path)
+    output = create_output(output_path, len(sequences))
+    for start in range(0, len(sequences), slice_rows):
+        stop = start + slice_rows
+        predictions, pattern_ids, confidences = predictor.predict_batch(sequences[start:stop])
+        output.predictions[start:stop] = predictions
+        output.confidences[start:stop] = confidences
+        output.pattern_ids[start:stop] = pattern_ids
+
+    for block in output:
+        _flush(block)
+    return len(sequences)
+
+
+def _output_row_size():
+    return 2 * _FLOAT.itemsize + _PATTERN_ID.itemsize
+
+
+def _map_output(path, rows, mode):
+    predictions = _map(path, _FLOAT, mode, HEADER_SIZE, (rows,))
+    confidences = _map(path, _FLOAT, mode, HEADER_SIZE + rows * _FLOAT.itemsize, (rows,))
+    pattern_ids = _map(path, _PATTERN_ID, mode, HEADER_SIZE + 2 * rows * _FLOAT.itemsize, (rows,))
+    return PredictionOutput(predictions, confidences, pattern_ids)
+
+
+def _map(path, dtype, mode, offset, shape):
+    """numpy.memmap that also copes with empty arrays, which mmap cannot map."""
+    if 0 in shape:
+        return np.zeros(shape, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode=mode, offset=offset, shape=shape)
+
+
+def _flush(array):
+    if isinstance(array, np.memmap):
+        array.flush()
+
+
+def _write_header(path, magic, columns, rows, data_size):
+    """Create the file with its header and room for data_size bytes of data."""
+    if rows < 0:
+        raise ValueError("rows must not be negative")
+    with open(path, "wb") as file:
+        file.write(_HEADER.pack(magic, FORMAT_VERSION, columns, rows).ljust(HEADER_SIZE, b"\0"))
+        file.truncate(HEADER_SIZE + data_size)
+
+
+def _read_header(path, magic, columns, row_size):
+    """Check a file's header and size; returns its row count."""
+    with open(path, "rb") as file:
+        header = file.read(HEADER_SIZE)
+    if len(header) < HEADER_SIZE:
+        raise ValueError(f"{path} is too short to be a prediction job file")
+
+    file_magic, version, file_columns, rows = _HEADER.unpack_from(header)
+    if file_magic != magic:
+        raise ValueError(f"{path} is not a prediction job {_KINDS[magic]} file")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"{path} uses unsupported format version {version}")
+    if file_columns != columns:
+        raise ValueError(f"{path} has {file_columns} columns, expected {columns}")
+    if os.path.getsize(path) < HEADER_SIZE + rows * row_size:
+        raise ValueError(f"{path} is truncated")
+    return rows
+
+
+def main(argv=None):
+    """Predict a binary job file from the command line."""
+    parser = argparse.ArgumentParser(description="Predict a binary NumberPredictor job file.")
+    parser.add_argument("input", help="input file of N x 3 float64 sequences")
+    parser.add_argument("output", help="output file to create")
+    parser.add_argument("--slice-rows", type=int, default=DEFAULT_SLICE_ROWS,
+                        help="rows predicted per slice")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    rows = predict_file(args.input, args.output, slice_rows=args.slice_rows)
+    elapsed = time.perf_counter() - start
+    print(f"Predicted {rows} rows in {elapsed:.2f}s ({rows / elapsed:,.0f} rows/sec)",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
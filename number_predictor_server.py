@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Number Predictor Server
+=======================
+An asyncio server that answers newline-delimited JSON prediction requests
+over localhost TCP or a Unix socket.  Requests arriving together, from any
+number of connections, are grouped into micro-batches that are flushed
+when they reach max_batch_size or max_delay after their first request, and
+evaluated in one vectorized NumberPredictor.predict_batch pass.
+
+Protocol (one JSON value per line, one response line per request, in order):
+    [1, 3, 5]                         -> {"prediction": 7.0, "pattern": ..., "confidence": ...}
+    {"id": 7, "sequence": [1, 3, 5]}  -> the same, with "id": 7
+    {"command": "stats"}              -> latency percentiles and batch size histogram
+Malformed requests, and requests that fail, get {"error": "..."}.
+
+Usage:
+    python number_predictor_server.py --port 8765
+    python number_predictor_server.py --unix /tmp/number_predictor.sock
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections import Counter, deque
+from numbers import Real
+from typing import List, Optional, Tuple
+
+from number_predictor import NumberPredictor, PATTERN_NAMES, np
+
+# Latencies kept for the percentiles reported by stats()
+LATENCY_WINDOW = 10000
+
+# Integers beyond this are not all exact in float64, so they skip the batch
+FLOAT_EXACT_LIMIT = 2 ** 53
+
+
+class MicroBatcher:
+    """Collects concurrent predict() calls into batches for one vectorized pass."""
+
+    def __init__(self, predictor: Optional[NumberPredictor] = None,
+                 max_batch_size: int = 256, max_delay: float = 0.002):
+        """
+        Args:
+            predictor: NumberPredictor to evaluate batches with
+            max_batch_size: Flush as soon as this many requests are waiting
+            max_delay: Seconds the first request of a batch may wait for more
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if max_delay < 0:
+            raise ValueError("max_delay must not be negative")
+
+        self.predictor = predictor or NumberPredictor()
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+
+        self._pending = []
+        self._timer = None
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._batch_sizes = Counter()
+        self._requests = 0
+
+    async def predict(self, sequence: List[float]) -> Tuple[float, str, float]:
+        """Predict the next number of sequence as part of the next batch."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((sequence, future, time.perf_counter()))
+
+        if len(self._pending) >= self.max_batch_size:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self.flush)
+        return await future
+
+    def flush(self):
+        """Evaluate every waiting request now."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        results = self._evaluate([sequence for sequence, _, _ in batch])
+        done = time.perf_counter()
+        for (_, future, arrival), result in zip(batch, results):
+            self._latencies.append(done - arrival)
+            if future.cancelled():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+        self._batch_sizes[len(batch)] += 1
+        self._requests += len(batch)
+
+    def _evaluate(self, sequences):
+        """
+        Predict a batch: 3-number sequences that float64 holds exactly in one
+        vectorized pass, the rest one by one (large integers on the exact path).
+        """
+        results = [None] * len(sequences)
+        if np is not None:
+            rows = [i for i, sequence in enumerate(sequences)
+                    if len(sequence) == 3 and _batchable(sequence)]
+            try:
+                predictions, codes, confidences = self.predictor.predict_batch(
+                    [sequences[i] for i in rows])
+            except (ValueError, ArithmeticError):
+                # Predict those rows one by one instead
+                rows = []
+            if rows:
+                for i, prediction, code, confidence in zip(
+                        rows, predictions.tolist(), codes.tolist(), confidences.tolist()):
+                    results[i] = (prediction, PATTERN_NAMES[code], confidence)
+
+        for i, sequence in enumerate(sequences):
+            if results[i] is None:
+                try:
+                    results[i] = self.predictor.predict_next(sequence)
+                except Exception as e:
+                    # One bad sequence must not leave the rest of the batch waiting
+                    results[i] = e
+        return results
+
+    def stats(self) -> dict:
+        """Request count, latency percentiles (ms) and the histogram of batch sizes."""
+        latencies = sorted(self._latencies)
+        return {
+            "requests": self._requests,
+            "batches": sum(self._batch_sizes.values()),
+            "latency_ms": {
+                "p50": _percentile(latencies, 0.50) * 1e3,
+                "p99": _percentile(latencies, 0.99) * 1e3,
+                "max": (latencies[-1] if latencies else 0.0) * 1e3,
+            },
+            "batch_sizes": {str(size): count for size, count in sorted(self._batch_sizes.items())},
+        }
+
+
+class PredictionServer:
+    """Serves newline-delimited JSON predictions through a MicroBatcher."""
+
+    def __init__(self, batcher: Optional[MicroBatcher] = None):
+        self.batcher = batcher or MicroBatcher()
+        self._server = None
+
+    async def start_tcp(self, host: str = "127.0.0.1", port: int = 8765):
+        """Listen on host:port; port 0 picks a free port (see address)."""
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+
+    async def start_unix(self, path: str):
+        """Listen on a Unix domain socket."""
+        self._server = await asyncio.start_unix_server(self._handle_connection, path)
+
+    @property
+    def address(self):
+        """The address the server is listening on."""
+        return self._server.sockets[0].getsockname()
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle_connection(self, reader, writer):
+        # Requests on one connection are answered concurrently, so pipelined
+        # requests share batches, but written back in the order they came.
+        responses = asyncio.Queue(maxsize=self.batcher.max_batch_size)
+        sender = asyncio.ensure_future(self._send_responses(responses, writer))
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                await responses.put(asyncio.ensure_future(self._respond(line)))
+            await responses.put(None)
+            await sender
+        except ConnectionError:
+            pass
+        finally:
+            sender.cancel()
+            writer.close()
+
+    async def _send_responses(self, responses, writer):
+        while True:
+            response = await responses.get()
+            if response is None:
+                return
+            try:
+                line = await response
+            except Exception as e:
+                # Keep answering the connection's later requests
+                line = _encode({"error": str(e) or type(e).__name__}, None)
+            try:
+                writer.write(line)
+                await writer.drain()
+            except ConnectionError:
+                pass
+
+    async def _respond(self, line: bytes) -> bytes:
+        """Turn one request line into one response line."""
+        request_id = None
+        try:
+            request = json.loads(line)
+            if isinstance(request, dict):
+                request_id = request.get("id")
+                if request.get("command") == "stats":
+                    return _encode(self.batcher.stats(), request_id)
+                sequence = request.get("sequence")
+            else:
+                sequence = request
+            _check_sequence(sequence)
+
+            prediction, pattern, confidence = await self.batcher.predict(sequence)
+            return _encode({"prediction": _json_number(prediction), "pattern": pattern,
+                            "confidence": float(confidence)}, request_id)
+        except Exception as e:
+            return _encode({"error": str(e) or type(e).__name__}, request_id)
+
+
+def _check_sequence(sequence):
+    if not isinstance(sequence, list) or not all(
+            isinstance(x, Real) and not isinstance(x, bool) for x in sequence):
+        raise ValueError("Expected a list of numbers")
+    if len(sequence) < 3:
+        raise ValueError("At least 3 numbers are required for prediction")
+
+
+def _batchable(sequence):
+    """Whether predict_batch gives this sequence's answer: all floats, or all float64-exact ints."""
+    if all(type(x) is float for x in sequence):
+        return True
+    return all(type(x) is int and abs(x) < FLOAT_EXACT_LIMIT for x in sequence)
+
+
+def _json_number(value):
+    """A prediction as a JSON number: ints stay exact, anything else (e.g. a Fraction) is a float."""
+    return value if type(value) is int else float(value)
+
+
+def _encode(response, request_id):
+    if request_id is not None:
+        response = dict(response, id=request_id)
+    return json.dumps(response).encode() + b"\n"
+
+
+def _percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list (0.0 if empty)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+async def serve(args):
+    batcher = MicroBatcher(max_batch_size=args.max_batch_size, max_delay=args.max_delay_ms / 1e3)
+    server = PredictionServer(batcher)
+    if args.unix:
+        await server.start_unix(args.unix)
+    else:
+        await server.start_tcp(args.host, args.port)
+    print(f"Serving predictions on {server.address}")
+    await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve NumberPredictor over newline-delimited JSON.")
+    parser.add_argument("--host", default="127.0.0.1", help="TCP host to listen on")
+    parser.add_argument("--port", type=int, default=8765, help="TCP port to listen on")
+    parser.add_argument("--unix", help="listen on this Unix socket path instead of TCP")
+    parser.add_argument("--max-batch-size", type=int, default=256, help="requests per batch")
+    parser.add_argument("--max-delay-ms", type=float, default=2.0,
+                        help="longest a request waits for its batch to fill")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
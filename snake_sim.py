@@ -0,0 +1,536 @@
+#!/usr/bin/env python3
+"""
+Snake Simulation
+================
+The rules of the Snake game in pure Python, with no pygame: integer grid
+cells, a seeded random number generator and an explicit step(action) for
+each tick.  snake_game.py draws a SnakeSim with pygame; on its own it can
+run many thousands of games for balancing or for evaluating the AI.
+
+Usage:
+    from snake_sim import SnakeSim, UP
+
+    sim = SnakeSim(seed=1)
+    while sim.step(UP if sim.ticks % 10 == 0 else None):
+        pass
+    print(sim.score, sim.game_over_reason)
+"""
+
+import random
+from collections import deque
+
+GRID_SIZE = 32
+
+# Directions as (dx, dy) steps; y grows downwards
+UP = (0, -1)
+DOWN = (0, 1)
+LEFT = (-1, 0)
+RIGHT = (1, 0)
+ACTIONS = (UP, DOWN, LEFT, RIGHT)
+
+# The anti-snake weighs its moves in this order, taking the first of equals
+_CHASE_MOVES = (RIGHT, LEFT, DOWN, UP)
+_OPPOSITE = {UP: DOWN, DOWN: UP, LEFT: RIGHT, RIGHT: LEFT}
+
+# How the anti-snake chases the player: a greedy step towards the head, or
+# the shortest path to it around the snakes' bodies
+PATHFINDING_MODES = ("greedy", "bfs")
+
+
+class Body:
+    """
+    A snake's cells as (x, y) integer tuples, head first, in a deque, with
+    a count of the snake's blocks on each cell.  Moving is a push at the
+    head and a pop at the tail, and "is this cell part of the snake?" is a
+    dictionary lookup, so both are O(1) however long the snake grows.
+    """
+
+    def __init__(self, cells):
+        self.cells = deque()
+        self.occupied = {}
+        for cell in cells:
+            self.cells.append(cell)
+            self.occupied[cell] = self.occupied.get(cell, 0) + 1
+
+    def __iter__(self):
+        return iter(self.cells)
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __getitem__(self, index):
+        return self.cells[index]
+
+    def __contains__(self, cell):
+        return cell in self.occupied
+
+    @property
+    def head(self):
+        return self.cells[0]
+
+    def move(self, direction, grow=False):
+        """Push a new head one step in direction; the tail follows unless growing."""
+        cells, occupied = self.cells, self.occupied
+        if not grow:
+            tail = cells.pop()
+            count = occupied[tail] - 1
+            if count:
+                occupied[tail] = count
+            else:
+                del occupied[tail]
+        x, y = cells[0]
+        head = (x + direction[0], y + direction[1])
+        cells.appendleft(head)
+        occupied[head] = occupied.get(head, 0) + 1
+
+    def head_overlaps(self):
+        """Whether the head is on a cell the rest of the body also covers."""
+        return self.occupied[self.cells[0]] > 1
+
+    def behind_head(self, cell):
+        """Whether cell is covered by the body other than the head."""
+        return self.occupied.get(cell, 0) > (cell == self.cells[0])
+
+
+class DistanceField:
+    """
+    Steps from every cell of the grid to a target cell, found by one
+    breadth-first search around the cells snakes' bodies cover.  Computed
+    once per tick, it is shared by every chaser: reading a chaser's next
+    move is four lookups, however many chasers there are.
+    """
+
+    def __init__(self, grid_size=GRID_SIZE):
+        self.grid_size = grid_size
+        # The on-grid neighbours of each cell, by index y * grid_size + x
+        self.neighbours = []
+        for y in range(grid_size):
+            for x in range(grid_size):
+                self.neighbours.append(tuple(
+                    (y + dy) * grid_size + x + dx for dx, dy in ACTIONS
+                    if 0 <= x + dx < grid_size and 0 <= y + dy < grid_size))
+        self.target = None
+        self.distances = [-1] * (grid_size * grid_size)
+
+    def compute(self, target, bodies):
+        """
+        Search outwards from target.
+
+        Args:
+            target: (x, y) cell the distances lead to; if it is off the
+                grid, no cell is reachable
+            bodies: Bodies whose cells, apart from target, cannot be passed
+        """
+        size = self.grid_size
+        neighbours = self.neighbours
+        distances = [-1] * (size * size)
+        for body in bodies:
+            for x, y in body.occupied:
+                if 0 <= x < size and 0 <= y < size:
+                    distances[y * size + x] = -2
+        x, y = target
+        if 0 <= x < size and 0 <= y < size:
+            start = y * size + x
+            distances[start] = 0
+            frontier = [start]
+        else:
+            frontier = []  # The player has left the grid; nothing is reachable
+        distance = 0
+        while frontier:
+            distance += 1
+            reached = []
+            for cell in frontier:
+                for neighbour in neighbours[cell]:
+                    if distances[neighbour] == -1:
+                        distances[neighbour] = distance
+                        reached.append(neighbour)
+            frontier = reached
+        self.target = target
+        self.distances = distances
+
+    def distance(self, cell):
+        """Steps from cell to the target, or None if it is blocked, unreachable or off the grid."""
+        x, y = cell
+        size = self.grid_size
+        if not (0 <= x < size and 0 <= y < size):
+            return None
+        distance = self.distances[y * size + x]
+        return distance if distance >= 0 else None
+
+    def next_move(self, cell):
+        """The move from cell to the reachable neighbour nearest the target, or None if there is none."""
+        x, y = cell
+        size = self.grid_size
+        distances = self.distances
+        best_move = None
+        best_distance = None
+        for move in _CHASE_MOVES:
+            new_x, new_y = x + move[0], y + move[1]
+            if not (0 <= new_x < size and 0 <= new_y < size):
+                continue
+            distance = distances[new_y * size + new_x]
+            if distance >= 0 and (best_distance is None or distance < best_distance):
+                best_distance = distance
+                best_move = move
+        return best_move
+
+
+class SpatialHash:
+    """
+    Counts of blocks on each grid cell over many bodies, in one dictionary:
+    a spatial hash with a bucket per cell.  Whether a cell is covered, and
+    by how many blocks, is one lookup however many bodies there are.
+    """
+
+    def __init__(self, bodies=()):
+        self.occupied = {}
+        for body in bodies:
+            self.add(body)
+
+    def __contains__(self, cell):
+        return cell in self.occupied
+
+    def add(self, body):
+        occupied = self.occupied
+        for cell in body:
+            occupied[cell] = occupied.get(cell, 0) + 1
+
+    def remove(self, body):
+        occupied = self.occupied
+        for cell in body:
+            count = occupied[cell] - 1
+            if count:
+                occupied[cell] = count
+            else:
+                del occupied[cell]
+
+    def count(self, cell):
+        """Blocks on cell."""
+        return self.occupied.get(cell, 0)
+
+
+class Snake:
+    """The player's snake."""
+
+    def __init__(self, grid_size=GRID_SIZE):
+        self.grid_size = grid_size
+        self.body = Body([(5, 10), (4, 10), (3, 10)])
+        self.direction = RIGHT
+        self.new_block = False
+
+    def move_snake(self):
+        self.body.move(self.direction, grow=self.new_block)
+        self.new_block = False
+
+    def add_block(self):
+        self.new_block = True
+
+    def check_collision(self):
+        """Whether the snake has left the grid or run into itself."""
+        x, y = self.body.cells[0]
+        if not (0 <= x < self.grid_size and 0 <= y < self.grid_size):
+            return True
+        return self.body.head_overlaps()
+
+
+class AntiSnake:
+    """The computer's snake, which chases the player's head."""
+
+    def __init__(self, grid_size=GRID_SIZE):
+        self.grid_size = grid_size
+        # Start at opposite corner from player snake
+        self.body = Body([(grid_size - 5, grid_size - 10),
+                          (grid_size - 4, grid_size - 10),
+                          (grid_size - 3, grid_size - 10)])
+        self.direction = LEFT
+        self.new_block = False
+        self.move_timer = 0
+        self.move_delay = 200  # Move slower than player initially
+
+    def move_anti_snake(self, target_pos=None):
+        self.body.move(self.direction, grow=self.new_block)
+        self.new_block = False
+
+    def add_block(self):
+        self.new_block = True
+
+    def ai_pathfinding(self, target_pos):
+        """
+        Turn to the neighbouring cell nearest target_pos (Manhattan distance)
+        that is on the grid, off the anti-snake's body and not straight back.
+        """
+        x, y = self.body.cells[0]
+        target_x, target_y = target_pos
+        occupied = self.body.occupied
+        size = self.grid_size
+        back = _OPPOSITE.get(self.direction)
+
+        best_direction = self.direction
+        best_distance = None
+        for move in _CHASE_MOVES:
+            if move == back:
+                continue
+            new_x, new_y = x + move[0], y + move[1]
+            if not (0 <= new_x < size and 0 <= new_y < size):
+                continue
+            if (new_x, new_y) in occupied:
+                continue
+            distance = abs(new_x - target_x) + abs(new_y - target_y)
+            if best_distance is None or distance < best_distance:
+                best_distance = distance
+                best_direction = move
+        self.direction = best_direction
+
+    def follow_field(self, field):
+        """
+        Turn along the shortest path in a DistanceField to its target, or
+        fall back on ai_pathfinding when the target cannot be reached.
+        """
+        move = field.next_move(self.body.cells[0])
+        if move is None:
+            self.ai_pathfinding(field.target)
+        else:
+            self.direction = move
+
+    def check_wall_collision(self):
+        """Check if anti-snake hits walls"""
+        x, y = self.body.cells[0]
+        return not (0 <= x < self.grid_size and 0 <= y < self.grid_size)
+
+    def check_self_collision(self):
+        """Check if anti-snake hits itself"""
+        return self.body.head_overlaps()
+
+
+class Food:
+    """The food, placed on a random cell."""
+
+    def __init__(self, rng, grid_size=GRID_SIZE):
+        self.rng = rng
+        self.grid_size = grid_size
+        self.randomize()
+
+    def randomize(self):
+        self.x = self.rng.randint(0, self.grid_size - 1)
+        self.y = self.rng.randint(0, self.grid_size - 1)
+        self.pos = (self.x, self.y)
+
+
+class SnakeSim:
+    """
+    One game of Snake against the anti-snake, or a swarm of them, advanced a
+    tick at a time by step().  All randomness comes from the game's own
+    random.Random, so a seed replays the same game for the same actions.
+    """
+
+    def __init__(self, grid_size=GRID_SIZE, seed=None, pathfinding=None, enemies=1):
+        """
+        Args:
+            grid_size: Cells across and down the square grid (at least 12)
+            seed: Seed for the game's random number generator
+            pathfinding: "greedy" to step towards the player's head, or "bfs"
+                to follow the shortest path to it around the snakes; by
+                default "bfs" for a swarm, where greedy anti-snakes would
+                each walk into the bodies around them, and "greedy" otherwise
+            enemies: Number of anti-snakes; after the first, they start on
+                random cells at least half the grid away from the player
+        """
+        if grid_size < 12:
+            raise ValueError("The grid must be at least 12 cells across")
+        if pathfinding is None:
+            pathfinding = "bfs" if enemies > 1 else "greedy"
+        if pathfinding not in PATHFINDING_MODES:
+            raise ValueError(f"Unknown pathfinding mode {pathfinding!r}; "
+                             f"choose from {', '.join(PATHFINDING_MODES)}")
+        if enemies < 1:
+            raise ValueError("There must be at least one anti-snake")
+        # Anti-snakes cover 3 cells each; keep them to an eighth of the grid
+        # so there is always room to respawn them away from the player
+        if enemies > 1 and 3 * enemies > grid_size * grid_size // 8:
+            raise ValueError(f"{enemies} anti-snakes do not fit on a {grid_size}x{grid_size} grid")
+        self.grid_size = grid_size
+        self.pathfinding = pathfinding
+        self.enemies = enemies
+        self.field = DistanceField(grid_size) if pathfinding == "bfs" else None
+        self.rng = random.Random(seed)
+        self.restart_game()
+
+    @property
+    def anti_snake(self):
+        """The first anti-snake, the only one outside swarm mode."""
+        return self.anti_snakes[0]
+
+    def restart_game(self):
+        """Start a new game on the same grid, continuing the random stream."""
+        self.snake = Snake(self.grid_size)
+        self.food = Food(self.rng, self.grid_size)
+        self.anti_snakes = [AntiSnake(self.grid_size)]
+        # Where the anti-snakes are, for collisions between them (swarm mode only)
+        self.swarm = None
+        if self.enemies > 1:
+            self.swarm = SpatialHash([self.anti_snake.body])
+            for _ in range(self.enemies - 1):
+                anti_snake = AntiSnake(self.grid_size)
+                self.place_anti_snake(anti_snake)
+                self.anti_snakes.append(anti_snake)
+        self.score = 0
+        self.ticks = 0
+        self.game_over = False
+        self.game_over_reason = ""
+
+    def turn(self, direction):
+        """Point the player's snake in direction, unless that would reverse it."""
+        current = self.snake.direction
+        if direction != (-current[0], -current[1]):
+            self.snake.direction = direction
+
+    def step(self, action=None):
+        """
+        Advance one tick.
+
+        Args:
+            action: UP, DOWN, LEFT or RIGHT to turn the player's snake first,
+                or None to keep going
+
+        Returns:
+            False once the game is over, else True
+        """
+        if action is not None:
+            self.turn(action)
+        self.update()
+        return not self.game_over
+
+    def update(self):
+        """Advance one tick with the snake's current direction."""
+        if self.game_over:
+            return
+        self.ticks += 1
+        snake, anti_snakes = self.snake, self.anti_snakes
+        snake.move_snake()
+        head = snake.body.cells[0]
+
+        # Move anti-snakes with AI pathfinding; in bfs mode one search from
+        # the player's head serves every anti-snake
+        field = self.field
+        if field is None:
+            for anti_snake in anti_snakes:
+                anti_snake.ai_pathfinding(head)
+                anti_snake.move_anti_snake()
+        else:
+            field.compute(head, [snake.body] + [anti_snake.body for anti_snake in anti_snakes])
+            for anti_snake in anti_snakes:
+                anti_snake.follow_field(field)
+                anti_snake.move_anti_snake()
+
+        self.check_collision()
+        self.check_fail()
+        self.check_anti_snake_collision()
+
+    def check_collision(self):
+        """Eat food under the head, and move food that is under the body."""
+        body = self.snake.body
+        if self.food.pos == body.cells[0]:
+            self.food.randomize()
+            self.snake.add_block()
+            self.score += 1
+
+        if body.behind_head(self.food.pos):
+            self.food.randomize()
+
+    def check_fail(self):
+        if self.snake.check_collision():
+            self.game_over = True
+            self.game_over_reason = "Hit wall or yourself!"
+
+    def check_anti_snake_collision(self):
+        """Check if anti-snakes catch the player or hit obstacles"""
+        body = self.snake.body
+        player_head = body.cells[0]
+        swarm = self.swarm
+        if swarm is not None:
+            swarm = self.swarm = SpatialHash(anti_snake.body for anti_snake in self.anti_snakes)
+
+        for anti_snake in self.anti_snakes:
+            anti_head = anti_snake.body.cells[0]
+            # Check if anti-snake catches player
+            if anti_head == player_head:
+                self.game_over = True
+                self.game_over_reason = "Caught by Anti-Snake!"
+                return
+
+            # Check if anti-snake hits player's body
+            if anti_head in body.occupied:
+                self.game_over = True
+                self.game_over_reason = "Anti-Snake hit you!"
+                return
+
+            # Anti-snake collision with walls - respawn it
+            if anti_snake.check_wall_collision():
+                self.respawn_anti_snake(anti_snake)
+
+            # Anti-snake collision with itself - respawn it
+            if anti_snake.check_self_collision():
+                self.respawn_anti_snake(anti_snake)
+
+            # Anti-snake collision with another anti-snake - respawn it
+            if swarm is not None:
+                anti_head = anti_snake.body.cells[0]
+                if swarm.count(anti_head) > anti_snake.body.occupied[anti_head]:
+                    self.respawn_anti_snake(anti_snake)
+
+    def place_anti_snake(self, anti_snake):
+        """
+        Put an anti-snake of a swarm on a random free spot at least half the
+        grid from the player, heading left, or at the corner farthest from
+        the player if no such spot turns up.
+        """
+        size = self.grid_size
+        player_x, player_y = self.snake.body.cells[0]
+        player = self.snake.body.occupied
+        swarm = self.swarm
+        for _ in range(100):
+            x = self.rng.randrange(size - 2)
+            y = self.rng.randrange(size)
+            if abs(x - player_x) + abs(y - player_y) < size // 2:
+                continue
+            cells = [(x, y), (x + 1, y), (x + 2, y)]
+            if not any(cell in swarm or cell in player for cell in cells):
+                break
+        else:
+            x, y = self.farthest_corner()
+            cells = [(x, y), (x + 1, y), (x + 2, y)]
+        anti_snake.body = Body(cells)
+        anti_snake.direction = LEFT
+        swarm.add(anti_snake.body)
+
+    def respawn_anti_snake(self, anti_snake=None):
+        """
+        Respawn an anti-snake (by default the first) at the corner farthest
+        from the player, or in swarm mode wherever place_anti_snake puts it
+        """
+        if anti_snake is None:
+            anti_snake = self.anti_snake
+        if self.swarm is not None:
+            self.swarm.remove(anti_snake.body)
+            self.place_anti_snake(anti_snake)
+            return
+
+        # Reset anti-snake at the farthest corner
+        x, y = self.farthest_corner()
+        anti_snake.body = Body([(x, y), (x + 1, y), (x + 2, y)])
+        anti_snake.direction = LEFT
+
+    def farthest_corner(self):
+        """The respawn corner farthest from the player's head."""
+        player_x, player_y = self.snake.body.head
+        far = self.grid_size - 3
+        corners = [(2, 2), (far, 2), (2, far), (far, far)]
+
+        best_corner = corners[0]
+        max_distance = 0
+        for corner in corners:
+            distance = abs(corner[0] - player_x) + abs(corner[1] - player_y)
+            if distance > max_distance:
+                max_distance = distance
+                best_corner = corner
+        return best_corner
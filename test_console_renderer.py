@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Test file for the console renderer
+"""
+
+import io
+import os
+import unittest
+from unittest.mock import patch
+
+from console_renderer import (CLEAR_BELOW, CLEAR_LINE_END, CLEAR_SCREEN, ConsoleRenderer,
+                              changed_runs, move_to)
+from tic_tac_toe import TicTacToe
+
+
+class Terminal(io.StringIO):
+    """A text buffer that reports itself as a terminal and counts writes."""
+
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def isatty(self):
+        return True
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+    def take(self):
+        """The text written since the last take."""
+        text = self.getvalue()
+        self.seek(0)
+        self.truncate()
+        return text
+
+
+@patch("console_renderer.shutil.get_terminal_size", return_value=os.terminal_size((80, 24)))
+@patch.dict(os.environ, {"TERM": "xterm"})
+class TestConsoleRenderer(unittest.TestCase):
+    """Test cases for diff redraws."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.terminal = Terminal()
+        self.renderer = ConsoleRenderer(self.terminal)
+
+    def test_first_frame_clears(self, _):
+        """The first frame clears the screen and is written in full, in one write."""
+        self.renderer.render(["one", "two"])
+        self.assertTrue(self.renderer.ansi)
+        self.assertEqual(self.terminal.take(), CLEAR_SCREEN + "one\ntwo\n")
+        self.assertEqual(self.terminal.writes, 1)
+
+    def test_only_changes_are_written(self, _):
+        """Later frames move to changed characters and erase what is below the frame."""
+        self.renderer.render(["   X |   |  ", "Player: O"])
+        self.terminal.take()
+        self.renderer.render(["   X | O |  ", "Player: X"])
+        self.assertEqual(self.terminal.take(),
+                         move_to(0, 7) + "O" + move_to(1, 8) + "X" + move_to(2, 0) + CLEAR_BELOW)
+        self.assertEqual(self.terminal.writes, 2)
+
+        self.renderer.render(["   X | O |  ", "Player: X"])
+        self.assertEqual(self.terminal.take(), move_to(2, 0) + CLEAR_BELOW)
+
+    def test_shorter_lines_and_frames(self, _):
+        """Text left over from longer lines, and from extra lines, is erased."""
+        self.renderer.render(["Position must be between 1 and 9!", "b", "c"])
+        self.terminal.take()
+        self.renderer.render(["Position taken!", "b"])
+        text = self.terminal.take()
+        self.assertIn(move_to(0, 15) + CLEAR_LINE_END, text)
+        self.assertTrue(text.endswith(move_to(2, 0) + CLEAR_BELOW))
+
+    def test_full_redraws(self, get_terminal_size):
+        """Frames too tall for the terminal, and frames after reset, are drawn in full."""
+        self.renderer.render(["a"] * 10)
+        get_terminal_size.return_value = os.terminal_size((80, 12))
+        self.renderer.render(["b"] * 10)
+        self.assertTrue(self.terminal.take().endswith(CLEAR_SCREEN + "\n".join(["b"] * 10) + "\n"))
+
+        get_terminal_size.return_value = os.terminal_size((80, 24))
+        self.renderer.reset()
+        self.renderer.render(["b"] * 10)
+        self.assertTrue(self.terminal.take().startswith(CLEAR_SCREEN))
+
+    def test_plain_output(self, _):
+        """Without a terminal, frames are written in full with no escape sequences."""
+        stream = io.StringIO()
+        renderer = ConsoleRenderer(stream)
+        self.assertFalse(renderer.ansi)
+        renderer.render(["one"])
+        renderer.render(["two"])
+        self.assertEqual(stream.getvalue(), "one\ntwo\n")
+        with patch.dict(os.environ, {"TERM": "dumb"}):
+            self.assertFalse(ConsoleRenderer(self.terminal).ansi)
+
+    def test_changed_runs(self, _):
+        """Differences close together are merged into one run."""
+        self.assertEqual(changed_runs("abcdef", "abcdef"), [])
+        self.assertEqual(changed_runs("abc", "abcde"), [(3, 5)])
+        self.assertEqual(changed_runs("a-c-e", "a+c+e"), [(1, 4)])
+        self.assertEqual(changed_runs("x" + " " * 20 + "x", "y" + " " * 20 + "y"),
+                         [(0, 1), (21, 22)])
+
+    def test_tic_tac_toe_redraw(self, _):
+        """A move redraws the two squares that changed, not the whole board."""
+        game = TicTacToe()
+        game.renderer = ConsoleRenderer(self.terminal)
+        game.display_board()
+        full = self.terminal.take()
+        game.make_move(5)
+        game.switch_player()
+        game.display_board()
+        diff = self.terminal.take()
+        self.assertNotIn(CLEAR_SCREEN, diff)
+        self.assertEqual(diff, move_to(4, 19) + "O" + move_to(16, 7) + "X"
+                         + move_to(len(game.board_lines()), 0) + CLEAR_BELOW)
+        self.assertLess(len(diff) * 5, len(full))
+
+
+if __name__ == "__main__":
+    unittest.main()
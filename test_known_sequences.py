@@ -0,0 +1,97 @@
+"""
+Test file for the known integer sequence index
+"""
+
+import math
+import os
+import tempfile
+import unittest
+from itertools import islice
+from known_sequences import KnownSequenceIndex, MAX_VALUE, default_index
+
+
+class TestKnownSequenceIndex(unittest.TestCase):
+    """Test cases for KnownSequenceIndex."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Build one small index for every test."""
+        cls.index = KnownSequenceIndex.build(max_terms=100)
+
+    def test_lookup(self):
+        """Windows and longer runs of each family predict the next term."""
+        cases = [
+            ([1, 2, 6], (24, "Factorial", 0.9)),
+            ([2, 6, 24, 120, 720], (5040, "Factorial", 0.9)),
+            ([1, 7, 49], (343, "Powers of 7", 0.85)),
+            ([16, 25, 36], (49, "Perfect Squares", 0.85)),
+            ([27, 64, 125], (216, "Cubes", 0.85)),
+            ([10, 15, 21], (28, "Triangular Numbers", 0.85)),
+            ([5, 14, 42], (132, "Catalan Numbers", 0.85)),
+            ([23, 29, 31, 37], (41, "Primes", 0.85)),
+        ]
+        for integers, expected in cases:
+            with self.subTest(integers=integers):
+                self.assertEqual(self.index.lookup(integers), expected)
+
+    def test_misses(self):
+        """Unknown windows, broken runs and runs past the last term return None."""
+        self.assertIsNone(self.index.lookup([1, 2, 3]))
+        self.assertIsNone(self.index.lookup([1, 2, 6, 25]))
+        self.assertIsNone(self.index.lookup([97 * 97, 98 * 98, 99 * 99]))
+        self.assertIsNone(self.index.lookup([2 ** 61, 2 ** 62, 2 ** 63]))
+
+    def test_shared_windows(self):
+        """A window in several families goes to the most confident one, then the first listed."""
+        self.assertEqual(self.index.lookup([1, 1, 2]), (6, "Factorial", 0.9))
+        self.assertEqual(self.index.lookup([1, 1, 2, 5]), (14, "Catalan Numbers", 0.85))
+        self.assertEqual(self.index.lookup([0, 1, 8]), (27, "Cubes", 0.85))
+
+    def test_save_and_load(self):
+        """An index survives a round trip through its file format."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "known_sequences.bin")
+            self.index.save(path)
+            loaded = KnownSequenceIndex.load(path)
+
+            self.assertEqual(len(loaded), len(self.index))
+            self.assertEqual(loaded.names, self.index.names)
+            self.assertEqual(loaded.terms, self.index.terms)
+            self.assertEqual(list(loaded.windows()), list(self.index.windows()))
+
+            with open(path, "wb") as file:
+                file.write(b"not an index")
+            with self.assertRaises(ValueError):
+                KnownSequenceIndex.load(path)
+
+    def test_build_limits(self):
+        """Terms stay in 64-bit range and max_terms is validated."""
+        for terms in self.index.terms:
+            self.assertLessEqual(max(terms), MAX_VALUE)
+        with self.assertRaises(ValueError):
+            KnownSequenceIndex.build(max_terms=3)
+
+    def test_continuation(self):
+        """Families continue past their indexed terms; custom ones stop at the end."""
+        terms = self.index.continuation([1, 2, 6])
+        self.assertEqual([next(terms) for _ in range(3)], [24, 120, 720])
+
+        # This index holds squares up to 99 ** 2 and primes up to 541
+        squares = list(islice(self.index.continuation([9216, 9409, 9604]), 4))
+        self.assertEqual(squares, [99 ** 2, 100 ** 2, 101 ** 2, 102 ** 2])
+        factorials = list(islice(self.index.continuation([1, 2, 6]), 30))
+        self.assertEqual(factorials[-1], math.factorial(33))
+        primes = list(islice(self.index.continuation([509, 521, 523]), 4))
+        self.assertEqual(primes, [541, 547, 557, 563])
+
+        custom = KnownSequenceIndex([("Evens", 0.9, [2, 4, 6, 8, 10])])
+        self.assertEqual(list(custom.continuation([4, 6, 8])), [10])
+        self.assertIsNone(custom.continuation([1, 2, 3]))
+
+    def test_default_index_is_shared(self):
+        """default_index builds once."""
+        self.assertIs(default_index(), default_index())
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
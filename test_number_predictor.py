@@ -3,9 +3,21 @@ Test file for Number Predictor
 Tests various sequence types and edge cases
 """
 
+import csv
+import functools
 import unittest
 import math
-from number_predictor import NumberPredictor
+import os
+import random
+import tempfile
+from fractions import Fraction
+from number_predictor import (DetectorStats, NumberPredictor, PATTERN_NAMES, SequenceFeatures,
+                              SequenceModel, main, predict_csv)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 class TestNumberPredictor(unittest.TestCase):
@@ -107,6 +119,26 @@ class TestNumberPredictor(unittest.TestCase):
         self.assertEqual(prediction, 120)
         self.assertIn("Factorial", pattern)
     
+    def test_known_sequences(self):
+        """Well-known integer sequences are recognised by index lookup."""
+        cases = [
+            ([120, 720, 5040], 40320, "Factorial"),
+            ([1, 8, 27, 64], 125, "Cubes"),
+            ([1, 2, 5, 14, 42], 132, "Catalan Numbers"),
+            ([7, 11, 13, 17], 19, "Primes"),
+            ([7.0, 49.0, 343.0, 2401.0, 16807.0], 117649, "Geometric Sequence"),
+        ]
+        for sequence, expected, expected_pattern in cases:
+            with self.subTest(sequence=sequence):
+                prediction, pattern, confidence = self.predictor.predict_next(sequence)
+                self.assertEqual(prediction, expected)
+                self.assertEqual(pattern, expected_pattern)
+        
+        # Powers too large for the index still go through the float path
+        features = SequenceFeatures([2.0 ** 70, 2.0 ** 71, 2.0 ** 72])
+        self.assertEqual(self.predictor._known_sequence(features), None)
+        self.assertEqual(self.predictor._power_sequence(features), (2 ** 73, "Powers of 2", 0.85))
+    
     def test_harmonic_sequences(self):
         """Test harmonic sequence predictions."""
         # Use a simpler harmonic-like sequence that's more likely to be detected correctly
@@ -119,13 +151,10 @@ class TestNumberPredictor(unittest.TestCase):
     
     def test_edge_cases(self):
         """Test edge cases and error handling."""
-        # Wrong number of inputs
+        # Too few inputs
         with self.assertRaises(ValueError):
             self.predictor.predict_next([1, 2])
         
-        with self.assertRaises(ValueError):
-            self.predictor.predict_next([1, 2, 3, 4])
-        
         # Zeros in sequence
         prediction, pattern, confidence = self.predictor.predict_next([0, 1, 2])
         self.assertEqual(prediction, 3)
@@ -145,6 +174,641 @@ class TestNumberPredictor(unittest.TestCase):
         prediction, pattern, confidence = self.predictor.predict_next([2, 3, 5])
         self.assertIsInstance(prediction, (int, float))
 
+    def test_detectors_signal_misses_without_raising(self):
+        """Detectors return None instead of raising when they don't match."""
+        for sequence in ([0, 1, 2], [-5, 0.3, 17], [float('inf'), 1, 2], [-1, -1, -1]):
+            features = SequenceFeatures(sequence)
+            for method in self.predictor.prediction_methods:
+                with self.subTest(sequence=sequence, method=method.__name__):
+                    result = method(features)
+                    if result is not None:
+                        self.assertEqual(len(result), 3)
+
+        features = SequenceFeatures([0, 1, 2])
+        self.assertIsNone(self.predictor._geometric_sequence(features))
+        self.assertIsNone(self.predictor._harmonic_sequence(features))
+        self.assertIsNone(self.predictor._known_sequence(features))
+
+
+    def test_longer_sequences(self):
+        """Extra terms that fit the pattern raise the confidence."""
+        _, pattern, short_confidence = self.predictor.predict_next([2, 4, 6])
+        prediction, pattern, confidence = self.predictor.predict_next([2, 4, 6, 8, 10])
+        self.assertEqual(prediction, 12)
+        self.assertIn("Arithmetic", pattern)
+        self.assertGreater(confidence, short_confidence)
+        
+        prediction, pattern, _ = self.predictor.predict_next([3, 6, 12, 24, 48])
+        self.assertEqual(prediction, 96)
+        self.assertEqual(pattern, "Geometric Sequence")
+        
+        prediction, pattern, _ = self.predictor.predict_next([1, 1, 2, 3, 5, 8, 13])
+        self.assertEqual(prediction, 21)
+        self.assertEqual(pattern, "Fibonacci-like")
+        
+        prediction, pattern, _ = self.predictor.predict_next([1, 2, 6, 24, 120])
+        self.assertEqual(prediction, 720)
+        self.assertEqual(pattern, "Factorial")
+        
+        prediction, pattern, _ = self.predictor.predict_next([2, 9, 28, 65, 126])
+        self.assertEqual(prediction, 217)
+        self.assertEqual(pattern, "Higher Order Polynomial")
+
+    def test_longer_sequences_check_every_term(self):
+        """A term that breaks the pattern is not ignored."""
+        prediction, pattern, _ = self.predictor.predict_next([1, 2, 4, 8, 17])
+        self.assertNotEqual(pattern, "Geometric Sequence")
+        self.assertNotEqual(pattern, "Powers of 2")
+
+    def test_fit_polynomial(self):
+        """_fit_polynomial interpolates any degree."""
+        xs = [0, 1, 2, 3]
+        ys = [2 * x ** 3 - x + 5 for x in xs]
+        coeffs = self.predictor._fit_polynomial(xs, ys, 3)
+        for actual, expected in zip(coeffs, [2, 0, -1, 5]):
+            self.assertAlmostEqual(actual, expected)
+        self.assertAlmostEqual(self.predictor._evaluate_polynomial(coeffs, 4), 129)
+        
+        with self.assertRaises(ValueError):
+            self.predictor._fit_polynomial([0, 1], [1, 2], 2)
+
+
+    def test_linear_recurrences(self):
+        """Integer linear recurrences are found with their coefficients."""
+        cases = [
+            ([1, 1, 2, 4, 7, 13, 24], 44, (1, 1, 1)),      # Tribonacci
+            ([0, 1, 2, 5, 12, 29, 70], 169, (2, 1)),       # Pell
+            ([1, 3, 7, 15, 31, 63], 127, (3, -2)),         # 2^n - 1
+            ([1, 0, 0, 1, 0, 0, 1, 0, 0], 1, (0, 0, 1)),   # Periodic
+        ]
+        for sequence, expected, coefficients in cases:
+            with self.subTest(sequence=sequence):
+                prediction, pattern, confidence = self.predictor.predict_next(sequence)
+                self.assertEqual(prediction, expected)
+                self.assertEqual(pattern, "Linear Recurrence")
+                self.assertGreaterEqual(confidence, 0.85)
+                self.assertEqual(self.predictor.find_recurrence(sequence),
+                                 (len(coefficients), coefficients))
+
+    def test_find_recurrence(self):
+        """find_recurrence needs integers and enough terms to check the fit."""
+        lucas = [2, 1, 3, 4, 7, 11, 18]
+        self.assertEqual(self.predictor.find_recurrence(lucas), (2, (1, 1)))
+        self.assertEqual(self.predictor.find_recurrence([1, 2, 4, 8]), (1, (2,)))
+        self.assertIsNone(self.predictor.find_recurrence([1, 2, 4, 8, 17]))
+        self.assertIsNone(self.predictor.find_recurrence([1, 1, 2, 4, 7, 13, 24], max_order=2))
+        self.assertIsNone(self.predictor.find_recurrence([1.5, 2, 3, 4, 5]))
+        
+        # Averaging the previous two terms
+        recurrence = self.predictor.find_recurrence([16, 8, 12, 10, 11])
+        self.assertEqual(recurrence.order, 2)
+        self.assertEqual(recurrence.coefficients, (Fraction(1, 2), Fraction(1, 2)))
+
+    def test_linear_recurrence_result_types(self):
+        """Rational coefficients give floats, and whole predictions from integer terms stay ints."""
+        # a(n) = a(n-1) + a(n-2) / 2
+        sequence = [4, 8, 8, 12, 14, 19]
+        prediction, pattern, _ = self.predictor.predict_next([float(x) for x in sequence])
+        self.assertEqual(pattern, "Linear Recurrence")
+        self.assertIs(type(prediction), float)
+        self.assertEqual(prediction, 23.5)
+        terms, _, _ = self.predictor.predict_horizon([float(x) for x in sequence], 3)
+        self.assertEqual([type(term) for term in terms], [float] * 3)
+
+        prediction = self.predictor.predict_next(sequence)[0]
+        self.assertIs(type(prediction), float)
+        self.assertEqual(prediction, 23.5)
+        terms, _, _ = self.predictor.predict_horizon(sequence, 3)
+        self.assertEqual(list(terms), [23.5, 30.75, 38.875])
+        # Pell numbers: whole terms stay exact
+        prediction = self.predictor.predict_next([0, 1, 2, 5, 12, 29, 70])[0]
+        self.assertIs(type(prediction), int)
+        self.assertEqual(prediction, 169)
+
+    def test_linear_recurrence_needs_longer_inputs(self):
+        """Three-term sequences are never reported as recurrences."""
+        for sequence in make_mixed_corpus(500, seed=5):
+            with self.subTest(sequence=sequence):
+                self.assertNotEqual(self.predictor.predict_next(sequence)[1], "Linear Recurrence")
+
+
+class TestPredictHorizon(unittest.TestCase):
+    """Test cases for multi-step predict_horizon."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.predictor = NumberPredictor()
+
+    def horizon(self, sequence, k):
+        terms, pattern, confidence = self.predictor.predict_horizon(sequence, k)
+        return list(terms), pattern
+
+    def test_patterns(self):
+        """Each pattern's model generates the terms that follow."""
+        cases = [
+            ([1, 3, 5], [7, 9, 11, 13], "Arithmetic Sequence"),
+            ([2, 6, 18], [54, 162, 486, 1458], "Geometric Sequence"),
+            ([1, 1, 2, 3, 5], [8, 13, 21, 34], "Fibonacci-like"),
+            ([1, 4, 9, 16], [25, 36, 49, 64], "Perfect Squares"),
+            ([0, 1, 3, 6, 10], [15, 21, 28, 36], "Triangular Numbers"),
+            ([1, 8, 27, 64], [125, 216, 343, 512], "Cubes"),
+            ([2, 3, 5, 7, 11], [13, 17, 19, 23], "Primes"),
+            ([0, 0, 1, 1, 2, 4, 7, 13], [24, 44, 81, 149], "Linear Recurrence"),
+            ([1, -3, 5, -7], [9, -11, 13, -15], "Alternating Arithmetic Sequence"),
+            ([1, 2, 4, 7, 11], [16, 22, 29, 37], "Quadratic Polynomial"),
+        ]
+        for sequence, expected, expected_pattern in cases:
+            with self.subTest(sequence=sequence):
+                self.assertEqual(self.horizon(sequence, 4), (expected, expected_pattern))
+
+    def test_first_term_matches_predict_next(self):
+        """The first term, pattern and confidence are those of predict_next."""
+        for sequence in make_mixed_corpus(2000, seed=11):
+            terms, pattern, confidence = self.predictor.predict_horizon(sequence, 3)
+            prediction = next(terms)
+            with self.subTest(sequence=sequence):
+                self.assertEqual((pattern, confidence), self.predictor.predict_next(sequence)[1:])
+                self.assertEqual(repr(prediction), repr(self.predictor.predict_next(sequence)[0]))
+
+    def test_matches_repeated_prediction(self):
+        """Exact patterns agree with appending predictions and predicting again."""
+        for sequence in ([3, 7, 11], [5, 10, 20], [1, 4, 9], [2, 3, 5], [1, 2, 6], [1, 1, 3, 5, 11]):
+            expected = list(sequence)
+            for _ in range(6):
+                expected.append(self.predictor.predict_next(expected)[0])
+            with self.subTest(sequence=sequence):
+                self.assertEqual(self.horizon(sequence, 6)[0], expected[len(sequence):])
+
+    def test_beyond_known_sequence_index(self):
+        """Known families carry on exactly past the indexed 64-bit terms."""
+        terms, pattern = self.horizon([1, 2, 6], 30)
+        self.assertEqual(pattern, "Factorial")
+        self.assertEqual(terms[-1], math.factorial(33))
+
+    def test_lazy(self):
+        """Terms are generated on demand, so k can be huge."""
+        terms, _, _ = self.predictor.predict_horizon([2, 4, 6], 10 ** 12)
+        self.assertEqual([next(terms) for _ in range(3)], [8, 10, 12])
+        self.assertEqual(self.horizon([1, 2, 3], 0)[0], [])
+
+    def test_invalid_arguments(self):
+        """Short sequences and negative horizons are rejected."""
+        with self.assertRaises(ValueError):
+            self.predictor.predict_horizon([1, 2], 3)
+        with self.assertRaises(ValueError):
+            self.predictor.predict_horizon([1, 2, 3], -1)
+
+
+class TestExactArithmetic(unittest.TestCase):
+    """Test cases for int and Fraction sequences beyond float precision."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.predictor = NumberPredictor()
+
+    def test_large_powers(self):
+        """Powers of 3 past 2**53 stay geometric and are predicted exactly."""
+        for sequence in ([3 ** 40, 3 ** 41, 3 ** 42], [3 ** n for n in range(60, 66)]):
+            prediction, pattern, _ = self.predictor.predict_next(sequence)
+            with self.subTest(start=sequence[0]):
+                self.assertEqual(pattern, "Geometric Sequence")
+                self.assertEqual(prediction, sequence[-1] * 3)
+                self.assertIsInstance(prediction, int)
+
+    def test_large_squares_and_triangular_numbers(self):
+        """Squares and triangular numbers are recognized with integer square roots."""
+        n = 10 ** 30
+        squares = [(n + i) ** 2 for i in range(4)]
+        self.assertEqual(self.predictor.predict_next(squares), ((n + 4) ** 2, "Perfect Squares", 0.925))
+
+        triangular = [(n + i) * (n + i + 1) // 2 for i in range(4)]
+        prediction, pattern, _ = self.predictor.predict_next(triangular)
+        self.assertEqual(pattern, "Triangular Numbers")
+        self.assertEqual(prediction, (n + 4) * (n + 5) // 2)
+
+    def test_no_tolerance_matches(self):
+        """Terms within 1e-10 of a constant ratio are not taken for one."""
+        prediction, pattern, _ = self.predictor.predict_next([10 ** 12, 10 ** 12 + 5, 10 ** 12 + 7])
+        self.assertEqual((prediction, pattern), (10 ** 12 + 6, "Quadratic Polynomial"))
+        self.assertEqual(self.predictor.predict_next([1.0e12, 1.0e12 + 5, 1.0e12 + 7])[1],
+                         "Geometric Sequence")
+
+    def test_beyond_float_range(self):
+        """Integers too large for a float are still predicted."""
+        self.assertEqual(self.predictor.predict_next([10 ** 400, 2 * 10 ** 400, 3 * 10 ** 400]),
+                         (4 * 10 ** 400, "Arithmetic Sequence", 0.95))
+        terms, pattern, _ = self.predictor.predict_horizon([7 ** 500, 7 ** 501, 7 ** 502], 3)
+        self.assertEqual((list(terms), pattern), ([7 ** 503, 7 ** 504, 7 ** 505], "Geometric Sequence"))
+
+    def test_result_types(self):
+        """Int inputs give ints when the result is whole, Fractions give Fractions."""
+        self.assertEqual(repr(self.predictor.predict_next([1, 2, 3])[0]), "4")
+        self.assertEqual(repr(self.predictor.predict_next([1.0, 2.0, 3.0])[0]), "4.0")
+        self.assertEqual(self.predictor.predict_next([27, 18, 12]), (8, "Geometric Sequence", 0.95))
+        self.assertEqual(self.predictor.predict_next([4, 6, 9])[0], 13.5)
+
+        reciprocals = [Fraction(1, n) for n in range(2, 6)]
+        self.assertEqual(self.predictor.predict_next(reciprocals), (Fraction(1, 6), "Harmonic", 0.9))
+        self.assertEqual(self.predictor.predict_next([Fraction(1, 3), Fraction(2, 3), 1])[0], Fraction(4, 3))
+
+    def test_matches_float_path(self):
+        """Small integers get the same pattern and value as the same floats."""
+        for sequence in make_mixed_corpus(2000, seed=12):
+            if not all(float(x).is_integer() for x in sequence):
+                continue
+            integers = [int(x) for x in sequence]
+            with self.subTest(sequence=integers):
+                expected = self.predictor.predict_next([float(x) for x in integers])
+                prediction, pattern, confidence = self.predictor.predict_next(integers)
+                self.assertEqual((pattern, confidence), expected[1:])
+                self.assertAlmostEqual(prediction, expected[0], delta=1e-9 * max(abs(expected[0]), 1))
+
+    def test_exact_cache_keys(self):
+        """Large integers differing in the last digit do not share a cache entry."""
+        predictor = NumberPredictor(cache_size=4)
+        first = predictor.predict_next([3 ** 40, 3 ** 41, 3 ** 42])
+        second = predictor.predict_next([3 ** 40, 3 ** 41, 3 ** 42 + 1])
+        self.assertNotEqual(first, second)
+        self.assertEqual(predictor.cache_info().misses, 2)
+
+
+class TestSequenceModel(unittest.TestCase):
+    """Test cases for the streaming SequenceModel."""
+
+    def test_append(self):
+        """Appending terms updates the detected degree and prediction."""
+        model = SequenceModel([1, 4, 9])
+        self.assertEqual(len(model), 3)
+        self.assertEqual(model.degree, None)
+        self.assertEqual(model.predict_next(), (16, "Quadratic Polynomial", 0.8))
+        
+        model.append(16)
+        self.assertEqual(model.degree, 2)
+        prediction, pattern, confidence = model.predict_next()
+        self.assertEqual(prediction, 25)
+        self.assertEqual(pattern, "Quadratic Polynomial")
+        
+        model.extend([25, 36])
+        self.assertEqual(model.predict_next()[0], 49)
+        self.assertGreater(model.predict_next()[2], confidence)
+
+    def test_no_polynomial(self):
+        """None is returned once no polynomial fits."""
+        model = SequenceModel([1, 2, 4, 8, 16, 32, 64, 128, 256], max_degree=3)
+        self.assertIsNone(model.degree)
+        self.assertIsNone(model.predict_next())
+
+    def test_too_short(self):
+        """At least 3 terms are needed to predict."""
+        with self.assertRaises(ValueError):
+            SequenceModel([1, 2]).predict_next()
+        with self.assertRaises(ValueError):
+            SequenceModel(max_degree=0)
+
+    def test_matches_polynomial_detector(self):
+        """The streaming model agrees with the detector on the full sequence."""
+        predictor = NumberPredictor()
+        rng = random.Random(4)
+        for _ in range(500):
+            coeffs = [rng.randint(-5, 5) for _ in range(rng.randint(1, 8))]
+            sequence = [float(sum(c * x ** i for i, c in enumerate(coeffs)))
+                        for x in range(rng.randint(3, 12))]
+            if rng.random() < 0.3:
+                sequence[rng.randrange(len(sequence))] += rng.random()
+            with self.subTest(sequence=sequence):
+                self.assertEqual(SequenceModel(sequence).predict_next(),
+                                 predictor._polynomial_sequence(SequenceFeatures(sequence)))
+
+
+class TestPredictionCache(unittest.TestCase):
+    """Test cases for the optional LRU prediction cache."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.predictor = NumberPredictor(cache_size=2)
+
+    def test_disabled_by_default(self):
+        """Without a cache_size nothing is cached."""
+        predictor = NumberPredictor()
+        predictor.predict_next([1, 2, 3])
+        predictor.predict_next([1, 2, 3])
+        self.assertEqual(predictor.cache_info(), (0, 0, 0, 0, 0))
+
+    def test_hits_and_misses(self):
+        """Repeated sequences are served from the cache."""
+        first = self.predictor.predict_next([2, 4, 8])
+        second = self.predictor.predict_next([2, 4, 8])
+        self.assertEqual(first, second)
+
+        info = self.predictor.cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (1, 1, 1))
+
+    def test_tolerance_aware_keys(self):
+        """Sequences within the 1e-10 tolerance share an entry."""
+        self.predictor.predict_next([1.0, 2.0, 3.0])
+        self.predictor.predict_next([1.0 + 1e-13, 2.0, 3.0 - 1e-13])
+        self.assertEqual(self.predictor.cache_info().hits, 1)
+
+        self.predictor.predict_next([1.0, 2.0, 3.001])
+        self.assertEqual(self.predictor.cache_info().misses, 2)
+
+    def test_lru_eviction(self):
+        """The least recently used entry is evicted first."""
+        self.predictor.predict_next([1, 2, 3])
+        self.predictor.predict_next([2, 4, 8])
+        self.predictor.predict_next([1, 2, 3])  # refresh [1, 2, 3]
+        self.predictor.predict_next([1, 4, 9])  # evicts [2, 4, 8]
+
+        info = self.predictor.cache_info()
+        self.assertEqual((info.evictions, info.currsize), (1, 2))
+
+        self.predictor.predict_next([1, 2, 3])
+        self.assertEqual(self.predictor.cache_info().hits, 2)
+        self.predictor.predict_next([2, 4, 8])
+        self.assertEqual(self.predictor.cache_info().misses, 4)
+
+    def test_clear_cache(self):
+        """clear_cache empties the cache and resets the counters."""
+        self.predictor.predict_next([1, 2, 3])
+        self.predictor.predict_next([1, 2, 3])
+        self.predictor.clear_cache()
+        self.assertEqual(self.predictor.cache_info(), (0, 0, 0, 2, 0))
+
+    def test_negative_size(self):
+        """A negative cache size is rejected."""
+        with self.assertRaises(ValueError):
+            NumberPredictor(cache_size=-1)
+
+
+class TestPredictCsv(unittest.TestCase):
+    """Test cases for bulk CSV prediction."""
+
+    def setUp(self):
+        """Write a small input file."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.input_path = os.path.join(self.directory.name, "sequences.csv")
+        self.output_path = os.path.join(self.directory.name, "predictions.csv")
+        self.rows = make_mixed_corpus(300, seed=7) + [[1, 2, 4, 8, 16]]
+        with open(self.input_path, "w") as file:
+            file.write("a,b,c\n")
+            for row in self.rows:
+                file.write(",".join(map(repr, row)) + "\n")
+            file.write("1,2\nx,y,z\n")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def read_output(self):
+        with open(self.output_path, newline="") as file:
+            return list(csv.reader(file))
+
+    def assert_predictions(self, output):
+        predictor = NumberPredictor()
+        self.assertEqual(output[0], ["prediction", "pattern", "confidence"])
+        self.assertEqual(len(output), len(self.rows) + 3)
+        for row, (prediction, pattern, confidence) in zip(self.rows, output[1:]):
+            expected = predictor.predict_next(row)
+            self.assertEqual(float(prediction), expected[0])
+            self.assertEqual(pattern, expected[1])
+            self.assertEqual(float(confidence), expected[2])
+        self.assertEqual(output[-2][1], "Error: At least 3 numbers are required for prediction")
+        self.assertTrue(output[-1][1].startswith("Error: could not convert"))
+
+    def test_single_process(self):
+        """Every row is predicted in order, errors included."""
+        rows = predict_csv(self.input_path, self.output_path, workers=1, skip_header=True)
+        self.assertEqual(rows, len(self.rows) + 2)
+        self.assert_predictions(self.read_output())
+
+    def test_process_pool(self):
+        """Several workers and small chunks give the same output in input order."""
+        predict_csv(self.input_path, self.output_path, workers=2, chunk_size=7, skip_header=True)
+        self.assert_predictions(self.read_output())
+
+    def test_command_line(self):
+        """main() runs the bulk mode when given --input."""
+        main(["--input", self.input_path, "--output", self.output_path,
+              "--workers", "1", "--skip-header"])
+        self.assert_predictions(self.read_output())
+        
+        with self.assertRaises(SystemExit):
+            main(["--input", self.input_path])
+
+    def test_integer_rows(self):
+        """Integer rows print whole predictions as ints and the rest as floats, never fractions."""
+        with open(self.input_path, "w") as file:
+            file.write("4,8,8,12,14,19\n0,1,2,5,12,29,70\n")
+            file.write("10000000000000000,20000000000000000,30000000000000000\n")
+        predict_csv(self.input_path, self.output_path, workers=1)
+        predictions = [row[:2] for row in self.read_output()[1:]]
+        self.assertEqual(predictions, [["23.5", "Linear Recurrence"], ["169", "Linear Recurrence"],
+                                       ["40000000000000000", "Arithmetic Sequence"]])
+
+
+def make_mixed_corpus(size, seed=0):
+    """Build a seeded list of 3-number sequences covering every detector."""
+    rng = random.Random(seed)
+    factorials = [1, 1, 2, 6, 24, 120, 720, 5040]
+    rows = []
+    for _ in range(size):
+        kind = rng.randrange(11)
+        start = rng.randint(-20, 20)
+        step = rng.randint(-9, 9)
+        ratio = rng.choice([-3, -2, -0.5, 0.5, 1.5, 2, 3])
+        n = abs(start)
+        if kind == 0:
+            row = [start, start + step, start + 2 * step]
+        elif kind == 1:
+            row = [start, start * ratio, start * ratio * ratio]
+        elif kind == 2:
+            row = [n * n, (n + 1) ** 2, (n + 2) ** 2]
+        elif kind == 3:
+            row = [n * (n + 1) / 2, (n + 1) * (n + 2) / 2, (n + 2) * (n + 3) / 2]
+        elif kind == 4:
+            row = [start, step, start + step]
+        elif kind == 5:
+            i = rng.randrange(len(factorials) - 2)
+            row = factorials[i:i + 3]
+        elif kind == 6:
+            base = rng.choice([2, 3, 4, 5, 10])
+            power = rng.randint(-3, 8)
+            row = [base ** power, base ** (power + 1), base ** (power + 2)]
+        elif kind == 7:
+            row = [start, -(start + step), start + 2 * step]
+        elif kind == 8:
+            row = [rng.uniform(-100, 100) for _ in range(3)]
+        elif kind == 9:
+            row = [rng.choice([0, -0.1, -1, 1, 0.05]) for _ in range(3)]
+        else:
+            row = [start + rng.random() * 0.01, start + step + rng.random() * 0.01, start + 2 * step]
+        rows.append([float(x) for x in row])
+    return rows
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestPredictBatch(unittest.TestCase):
+    """Test cases for the vectorized predict_batch API."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.predictor = NumberPredictor()
+
+    def test_matches_predict_next(self):
+        """Every row should match predict_next exactly."""
+        rows = make_mixed_corpus(5000)
+        predictions, codes, confidences = self.predictor.predict_batch(rows)
+
+        for i, row in enumerate(rows):
+            with self.subTest(row=row):
+                prediction, pattern, confidence = self.predictor.predict_next(row)
+                self.assertEqual(PATTERN_NAMES[codes[i]], pattern)
+                self.assertEqual(confidences[i], confidence)
+                self.assertTrue(math.isclose(predictions[i], prediction, rel_tol=1e-12))
+
+    def test_known_sequences(self):
+        """Batch results should decode to the expected patterns."""
+        predictions, codes, confidences = self.predictor.predict_batch(
+            np.array([[1, 3, 5], [2, 6, 18], [1, 4, 9], [1, 2, 6]])
+        )
+        self.assertEqual(predictions.tolist(), [7, 54, 16, 24])
+        self.assertEqual(
+            [PATTERN_NAMES[code] for code in codes],
+            ["Arithmetic Sequence", "Geometric Sequence", "Perfect Squares", "Factorial"],
+        )
+
+    def test_invalid_shape(self):
+        """Only (N, 3) input is accepted."""
+        with self.assertRaises(ValueError):
+            self.predictor.predict_batch([[1, 2, 3, 4]])
+
+        with self.assertRaises(ValueError):
+            self.predictor.predict_batch([1, 2, 3])
+
+    def test_empty_batch(self):
+        """An empty batch gives empty results."""
+        predictions, codes, confidences = self.predictor.predict_batch(np.empty((0, 3)))
+        self.assertEqual(len(predictions), 0)
+        self.assertEqual(len(codes), 0)
+        self.assertEqual(len(confidences), 0)
+
+
+class TestAdaptiveCascade(unittest.TestCase):
+    """Test cases for adaptive detector ordering."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.predictor = NumberPredictor(adaptive=True)
+
+    def test_matches_full_scan(self):
+        """The adaptive cascade returns exactly what the full scan does, across reorderings."""
+        rng = random.Random(5)
+        sequences = make_mixed_corpus(3000, seed=5)
+        for _ in range(2000):
+            start, step, length = rng.randint(-20, 20), rng.randint(-5, 5), rng.randint(4, 10)
+            sequences.append(rng.choice([
+                [start + step * i for i in range(length)],
+                [start * 3 ** i for i in range(length)],
+                [(start + i) ** 3 for i in range(length)],
+                [(-1) ** i * (start + step * i) for i in range(length)],
+                [rng.uniform(-10, 10) for _ in range(length)],
+            ]))
+        rng.shuffle(sequences)
+
+        full = NumberPredictor()
+        mismatches = [sequence for sequence in sequences
+                      if repr(self.predictor.predict_next(sequence)) != repr(full.predict_next(sequence))]
+        self.assertEqual(mismatches, [])
+        self.assertNotEqual(self.predictor.detector_order,
+                            [method.__name__ for method in full.prediction_methods])
+
+    def test_skips_detectors_that_cannot_win(self):
+        """Nothing runs after an exact arithmetic match: no detector can beat 0.95."""
+        called = []
+
+        def record(method):
+            @functools.wraps(method)
+            def wrapper(features):
+                called.append(method.__name__)
+                return method(features)
+            return wrapper
+
+        self.predictor.prediction_methods = [record(m) for m in self.predictor.prediction_methods]
+        self.assertEqual(self.predictor.predict_next([1, 3, 5]), (7, "Arithmetic Sequence", 0.95))
+        self.assertEqual(called, ["_arithmetic_sequence"])
+
+        called.clear()
+        self.predictor.predict_next([2, 6, 18])
+        self.assertEqual(called, ["_arithmetic_sequence", "_geometric_sequence"])
+
+    def test_reorders_by_workload(self):
+        """The detector that keeps winning moves to the front."""
+        for i in range(2048):
+            self.predictor.predict_next([i + 1, 2 * (i + 1), 4 * (i + 1)])
+        self.assertEqual(self.predictor.detector_order[0], "_geometric_sequence")
+
+
+class TestProfiling(unittest.TestCase):
+    """Test cases for per-detector profiling counters."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.predictor = NumberPredictor()
+
+    def test_disabled_by_default(self):
+        """Without profiling nothing is counted."""
+        self.predictor.predict_next([1, 3, 5])
+        stats = self.predictor.stats()
+        self.assertEqual(list(stats), [m.__name__ for m in self.predictor.prediction_methods])
+        self.assertEqual(set(stats.values()), {DetectorStats(0, 0, 0, 0)})
+
+    def test_counts_calls_and_hits(self):
+        """Every detector is called once per prediction; hits count its matches."""
+        with self.predictor.profile():
+            self.assertTrue(self.predictor.profiling)
+            for sequence in ([1, 3, 5], [2, 6, 18], [0.37, -12.5, 88.1]):
+                self.predictor.predict_next(sequence)
+        self.assertFalse(self.predictor.profiling)
+        self.predictor.predict_next([1, 3, 5])
+
+        stats = self.predictor.stats()
+        for name, counters in stats.items():
+            with self.subTest(detector=name):
+                self.assertEqual(counters.calls, 3)
+                self.assertEqual(counters.errors, 0)
+                self.assertGreater(counters.time_ns, 0)
+        self.assertEqual(stats["_arithmetic_sequence"].hits, 1)
+        self.assertEqual(stats["_geometric_sequence"].hits, 1)
+        self.assertEqual(stats["_linear_recurrence"].hits, 0)
+
+    def test_profiling_does_not_change_results(self):
+        """Profiled predictions are those of the plain and adaptive scans."""
+        sequences = make_mixed_corpus(500, seed=13)
+        expected = [repr(self.predictor.predict_next(s)) for s in sequences]
+        for predictor in (NumberPredictor(profiling=True), NumberPredictor(adaptive=True, profiling=True)):
+            self.assertEqual([repr(predictor.predict_next(s)) for s in sequences], expected)
+            self.assertEqual(predictor.stats()["_custom_patterns"].calls, 500)
+
+    def test_counts_errors(self):
+        """A detector that raises is counted and the exception propagates."""
+        def broken(features):
+            raise ZeroDivisionError("broken detector")
+
+        self.predictor.prediction_methods.append(broken)
+        with self.predictor.profile():
+            with self.assertRaises(ZeroDivisionError):
+                self.predictor.predict_next([1, 3, 5])
+        counters = self.predictor.stats()["broken"]
+        self.assertEqual((counters.calls, counters.hits, counters.errors), (1, 0, 1))
+
+    def test_clear_stats(self):
+        """clear_stats resets the counters; stats() is a snapshot."""
+        with self.predictor.profile():
+            self.predictor.predict_next([1, 4, 9])
+        snapshot = self.predictor.stats()
+        self.predictor.clear_stats()
+        self.assertEqual(snapshot["_quadratic_sequence"].calls, 1)
+        self.assertEqual(self.predictor.stats()["_quadratic_sequence"].calls, 0)
+
 
 def run_example_predictions():
     """Run some example predictions to demonstrate functionality."""
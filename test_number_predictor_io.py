@@ -0,0 +1,102 @@
+"""
+Test file for the binary prediction job format
+"""
+
+import os
+import tempfile
+import unittest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from test_number_predictor import make_mixed_corpus
+
+if np is not None:
+    from number_predictor import NumberPredictor
+    from number_predictor_io import (HEADER_SIZE, create_input, create_output, main, open_input,
+                                     open_output, predict_file, write_input)
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestBinaryJobs(unittest.TestCase):
+    """Test cases for memory-mapped job files."""
+
+    def setUp(self):
+        """Set up a scratch directory."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.input_path = os.path.join(self.directory.name, "jobs.bin")
+        self.output_path = os.path.join(self.directory.name, "predictions.bin")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_input_round_trip(self):
+        """Sequences written to an input file are mapped back unchanged."""
+        sequences = np.array(make_mixed_corpus(100, seed=8))
+        self.assertEqual(write_input(self.input_path, sequences), 100)
+        self.assertEqual(os.path.getsize(self.input_path), HEADER_SIZE + 100 * 3 * 8)
+
+        mapped = open_input(self.input_path)
+        self.assertIsInstance(mapped, np.memmap)
+        np.testing.assert_array_equal(mapped, sequences)
+
+    def test_create_input_in_slices(self):
+        """A producer can fill a created input file slice by slice."""
+        matrix = create_input(self.input_path, 10)
+        matrix[:5] = [[1, 2, 3]] * 5
+        matrix[5:] = [[2, 4, 8]] * 5
+        matrix.flush()
+        del matrix
+        np.testing.assert_array_equal(open_input(self.input_path)[4:6], [[1, 2, 3], [2, 4, 8]])
+
+    def test_predict_file(self):
+        """Predictions match predict_batch, across slice boundaries."""
+        sequences = np.array(make_mixed_corpus(500, seed=9))
+        write_input(self.input_path, sequences)
+        self.assertEqual(predict_file(self.input_path, self.output_path, slice_rows=7), 500)
+
+        expected = NumberPredictor().predict_batch(sequences)
+        output = open_output(self.output_path)
+        np.testing.assert_array_equal(output.predictions, expected[0])
+        np.testing.assert_array_equal(output.pattern_ids, expected[1])
+        np.testing.assert_array_equal(output.confidences, expected[2])
+
+    def test_empty_job(self):
+        """A job with no rows produces an empty output file."""
+        write_input(self.input_path, np.zeros((0, 3)))
+        self.assertEqual(predict_file(self.input_path, self.output_path), 0)
+        self.assertEqual(len(open_output(self.output_path).predictions), 0)
+        self.assertEqual(os.path.getsize(self.output_path), HEADER_SIZE)
+
+    def test_invalid_files(self):
+        """Wrong magic, truncated files and bad shapes are rejected."""
+        write_input(self.input_path, [[1, 2, 3]] * 4)
+        with self.assertRaises(ValueError):
+            open_output(self.input_path)
+
+        with open(self.input_path, "r+b") as file:
+            file.truncate(HEADER_SIZE + 8)
+        with self.assertRaises(ValueError):
+            open_input(self.input_path)
+
+        with open(self.input_path, "wb") as file:
+            file.write(b"short")
+        with self.assertRaises(ValueError):
+            open_input(self.input_path)
+
+        with self.assertRaises(ValueError):
+            write_input(self.input_path, [[1, 2, 3, 4]])
+        with self.assertRaises(ValueError):
+            create_output(self.output_path, -1)
+
+    def test_command_line(self):
+        """main() predicts an input file into an output file."""
+        write_input(self.input_path, [[1, 3, 5], [2, 6, 18]])
+        main([self.input_path, self.output_path])
+        np.testing.assert_array_equal(open_output(self.output_path).predictions, [7, 54])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
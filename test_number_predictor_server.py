@@ -0,0 +1,185 @@
+"""
+Test file for the micro-batching prediction server
+"""
+
+import asyncio
+import json
+import os
+import socket
+import tempfile
+import unittest
+
+from number_predictor import NumberPredictor
+from number_predictor_server import MicroBatcher, PredictionServer, _percentile
+
+
+async def exchange(address, requests, unix=False):
+    """Pipeline requests over one connection and return the decoded responses."""
+    if unix:
+        reader, writer = await asyncio.open_unix_connection(address)
+    else:
+        reader, writer = await asyncio.open_connection(*address)
+    for request in requests:
+        writer.write(request if isinstance(request, bytes) else json.dumps(request).encode() + b"\n")
+    await writer.drain()
+    responses = [json.loads(await reader.readline()) for _ in requests]
+    writer.close()
+    await writer.wait_closed()
+    return responses
+
+
+class TestMicroBatcher(unittest.TestCase):
+    """Test cases for batching concurrent predictions."""
+
+    def setUp(self):
+        self.predictor = NumberPredictor()
+
+    def test_concurrent_requests_share_a_batch(self):
+        """Requests made together are evaluated as one batch."""
+        sequences = [[1, 3, 5], [2, 6, 18], [1, 4, 9], [0.37, -12.5, 88.1], [1, 1, 2, 3, 5, 8]]
+        batcher = MicroBatcher(self.predictor, max_batch_size=100, max_delay=0.01)
+
+        async def run():
+            return await asyncio.gather(*(batcher.predict(s) for s in sequences))
+
+        results = asyncio.run(run())
+        for sequence, (prediction, pattern, confidence) in zip(sequences, results):
+            expected = self.predictor.predict_next(sequence)
+            self.assertAlmostEqual(prediction, expected[0])
+            self.assertEqual(pattern, expected[1])
+            self.assertAlmostEqual(confidence, expected[2])
+
+        stats = batcher.stats()
+        self.assertEqual(stats["requests"], 5)
+        self.assertEqual(stats["batch_sizes"], {"5": 1})
+
+    def test_full_batch_flushes_immediately(self):
+        """A batch is flushed on reaching max_batch_size without waiting for the deadline."""
+        batcher = MicroBatcher(self.predictor, max_batch_size=4, max_delay=60)
+
+        async def run():
+            return await asyncio.wait_for(
+                asyncio.gather(*(batcher.predict([i, i + 1, i + 2]) for i in range(8))), 5)
+
+        results = asyncio.run(run())
+        self.assertEqual([prediction for prediction, _, _ in results], list(range(3, 11)))
+        self.assertEqual(batcher.stats()["batch_sizes"], {"4": 2})
+
+    def test_invalid_settings(self):
+        """Batch sizes below 1 and negative deadlines are rejected."""
+        with self.assertRaises(ValueError):
+            MicroBatcher(max_batch_size=0)
+        with self.assertRaises(ValueError):
+            MicroBatcher(max_delay=-1)
+
+    def test_percentile(self):
+        """Percentiles use the nearest rank."""
+        values = list(range(1, 101))
+        self.assertEqual(_percentile(values, 0.50), 50)
+        self.assertEqual(_percentile(values, 0.99), 99)
+        self.assertEqual(_percentile([7], 0.99), 7)
+        self.assertEqual(_percentile([], 0.5), 0.0)
+
+
+class TestPredictionServer(unittest.TestCase):
+    """Test cases for the newline-delimited JSON protocol."""
+
+    def run_server(self, client, unix_path=None, predictor=None):
+        """Start a server, run client(address) against it and return its result."""
+        async def run():
+            server = PredictionServer(MicroBatcher(predictor, max_batch_size=64, max_delay=0.005))
+            if unix_path:
+                await server.start_unix(unix_path)
+                address = unix_path
+            else:
+                await server.start_tcp("127.0.0.1", 0)
+                address = server.address
+            try:
+                return await client(address), server.batcher.stats()
+            finally:
+                await server.close()
+
+        return asyncio.run(run())
+
+    def test_requests_and_responses(self):
+        """Bare lists and request objects are answered in order, with ids echoed."""
+        requests = [[1, 3, 5], {"id": "squares", "sequence": [1, 4, 9]}, [1, 2, 3, 4]]
+        responses, _ = self.run_server(lambda address: exchange(address, requests))
+
+        self.assertEqual(responses[0]["pattern"], "Arithmetic Sequence")
+        self.assertEqual(responses[0]["prediction"], 7)
+        self.assertEqual(responses[1]["id"], "squares")
+        self.assertEqual(responses[1]["prediction"], 16)
+        self.assertEqual(responses[2]["prediction"], 5)
+        self.assertNotIn("id", responses[0])
+
+    def test_large_integers(self):
+        """Integers float64 cannot hold exactly are predicted exactly, not in the float batch."""
+        requests = [[10 ** 17, 10 ** 17 + 1, 10 ** 17 + 3], [3 ** 34, 3 ** 35, 3 ** 36], [1, 3, 5]]
+        responses, stats = self.run_server(lambda address: exchange(address, requests))
+
+        predictor = NumberPredictor()
+        for request, response in zip(requests, responses):
+            prediction, pattern, _ = predictor.predict_next(request)
+            self.assertEqual((response["prediction"], response["pattern"]), (prediction, pattern))
+        self.assertEqual(responses[0]["prediction"], 100000000000000006)
+        self.assertEqual(responses[1]["prediction"], 3 ** 37)
+        self.assertEqual(stats["requests"], 3)
+
+    def test_malformed_requests(self):
+        """Malformed requests get an error response without closing the connection."""
+        requests = [b"not json\n", [1, 2], ["a", "b", "c"], {"id": 3}, [1, 3, 5]]
+        responses, _ = self.run_server(lambda address: exchange(address, requests))
+
+        for response in responses[:4]:
+            self.assertIn("error", response)
+        self.assertEqual(responses[3]["id"], 3)
+        self.assertEqual(responses[4]["prediction"], 7)
+
+    def test_failed_requests(self):
+        """Requests that fail while predicting or encoding get an error; later ones are still answered."""
+        class FaultyPredictor(NumberPredictor):
+            def predict_next(self, sequence):
+                if sequence[0] == 0:
+                    return object(), "Unencodable", 1.0
+                if sequence[0] == -1:
+                    raise RuntimeError("predictor crashed")
+                return super().predict_next(sequence)
+
+        requests = [[0, 1, 2, 3], {"id": 2, "sequence": [-1, 1, 2, 3]}, [4, 8, 8, 12, 14, 19],
+                    [1, 2, 3, 4]]
+        responses, _ = self.run_server(lambda address: exchange(address, requests),
+                                       predictor=FaultyPredictor())
+
+        self.assertIn("error", responses[0])
+        self.assertEqual(responses[1], {"error": "predictor crashed", "id": 2})
+        # An exact Fraction prediction is sent as a float
+        self.assertEqual(responses[2]["prediction"], 23.5)
+        self.assertEqual(responses[3]["prediction"], 5)
+
+    def test_connections_are_batched_together(self):
+        """Requests from concurrent connections share batches and show up in stats."""
+        async def clients(address):
+            batches = [[[i, i + 2, i + 4]] * 10 for i in range(8)]
+            await asyncio.gather(*(exchange(address, batch) for batch in batches))
+            return await exchange(address, [{"command": "stats"}])
+
+        (stats,), server_stats = self.run_server(clients)
+        self.assertEqual(stats["requests"], 80)
+        self.assertLess(stats["batches"], 80)
+        self.assertEqual(sum(int(size) * count for size, count in stats["batch_sizes"].items()), 80)
+        self.assertGreaterEqual(stats["latency_ms"]["p99"], stats["latency_ms"]["p50"])
+        self.assertEqual(server_stats["requests"], 80)
+
+    @unittest.skipUnless(hasattr(socket, "AF_UNIX"), "Unix sockets are not available")
+    def test_unix_socket(self):
+        """The server also listens on a Unix socket."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "predictor.sock")
+            responses, _ = self.run_server(
+                lambda address: exchange(address, [[2, 6, 18]], unix=True), unix_path=path)
+        self.assertEqual(responses[0]["prediction"], 54)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test file for the Snake game logic
+"""
+
+import os
+import unittest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from snake_game import CELL_NUMBER, AntiSnake, Body, Game, Snake
+
+
+class TestBody(unittest.TestCase):
+    """Test cases for the deque body and its occupancy counts."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.body = Body([(5, 10), (4, 10), (3, 10)])
+
+    def test_move_and_grow(self):
+        """The head is pushed and the tail popped, or kept when growing."""
+        self.body.move((0, 1))
+        self.assertEqual(list(self.body), [(5, 11), (5, 10), (4, 10)])
+        self.assertNotIn((3, 10), self.body)
+        self.body.move((1, 0), grow=True)
+        self.assertEqual(list(self.body), [(6, 11), (5, 11), (5, 10), (4, 10)])
+        self.assertEqual(self.body.head, (6, 11))
+        self.assertEqual(self.body[-1], (4, 10))
+        self.assertEqual(len(self.body), 4)
+        self.assertEqual(set(self.body.occupied), set(self.body))
+
+    def test_overlaps(self):
+        """A head on its own body is seen from the occupancy counts."""
+        body = Body([(2, 2), (2, 3), (3, 3), (3, 2), (3, 1)])
+        self.assertFalse(body.head_overlaps())
+        body.move((1, 0))  # Into (3, 2), still covered after the tail moves
+        self.assertTrue(body.head_overlaps())
+        self.assertTrue(body.behind_head((3, 2)))
+        self.assertFalse(body.behind_head((9, 9)))
+
+    def test_following_the_tail(self):
+        """Moving into the cell the tail leaves is not a collision."""
+        body = Body([(2, 2), (2, 3), (3, 3), (3, 2)])
+        body.move((1, 0))
+        self.assertEqual(body.head, (3, 2))
+        self.assertFalse(body.head_overlaps())
+        self.assertFalse(body.behind_head((3, 2)))
+
+
+class TestSnakeGame(unittest.TestCase):
+    """Test cases for collisions in Game."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.game = Game()
+
+    def test_wall_collision(self):
+        """Leaving the grid ends the game."""
+        self.game.snake = Snake()
+        self.game.snake.body = Body([(CELL_NUMBER - 1, 0), (CELL_NUMBER - 2, 0)])
+        self.game.snake.move_snake()
+        self.game.check_fail()
+        self.assertTrue(self.game.game_over)
+
+    def test_eating_food(self):
+        """Food under the head scores and grows the snake on its next move."""
+        self.game.food.pos = (6, 10)
+        self.game.snake.move_snake()
+        self.game.check_collision()
+        self.assertEqual(self.game.score, 1)
+        self.game.snake.move_snake()
+        self.assertEqual(len(self.game.snake.body), 4)
+
+    def test_food_under_body_moves(self):
+        """Food placed under the body is moved elsewhere."""
+        self.game.food.pos = (3, 10)
+        self.game.check_collision()
+        self.assertEqual(self.game.score, 0)
+        self.assertNotEqual(self.game.food.pos, (3, 10))
+
+    def test_anti_snake_collisions(self):
+        """The anti-snake ends the game on the player and respawns off the grid."""
+        self.game.anti_snake.body = Body([(4, 10), (4, 11), (4, 12)])
+        self.game.check_anti_snake_collision()
+        self.assertEqual(self.game.game_over_reason, "Anti-Snake hit you!")
+
+        game = Game()
+        game.anti_snake.body = Body([(-1, 5), (0, 5), (1, 5)])
+        game.check_anti_snake_collision()
+        self.assertFalse(game.game_over)
+        self.assertEqual(len(game.anti_snake.body), 3)
+        self.assertEqual(game.anti_snake.body.head, (CELL_NUMBER - 3, CELL_NUMBER - 3))
+
+    def test_pathfinding_avoids_own_body(self):
+        """The anti-snake does not turn into its own body or reverse."""
+        anti_snake = AntiSnake()
+        anti_snake.body = Body([(10, 10), (10, 11), (11, 11), (11, 10)])
+        anti_snake.direction = (0, -1)
+        anti_snake.ai_pathfinding((20, 0))
+        # Right would be as close, but is body; down would reverse
+        self.assertEqual(anti_snake.direction, (0, -1))
+
+
+if __name__ == "__main__":
+    unittest.main()
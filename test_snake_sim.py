@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Test file for the headless Snake simulation
+"""
+
+import os
+import subprocess
+import sys
+import unittest
+
+from snake_sim import (DOWN, GRID_SIZE, LEFT, RIGHT, UP, AntiSnake, Body, DistanceField, SnakeSim,
+                       SpatialHash)
+
+
+class TestSnakeSim(unittest.TestCase):
+    """Test cases for stepping SnakeSim without pygame."""
+
+    def play(self, seed, actions):
+        """The snake and anti-snake heads and the food after each step."""
+        sim = SnakeSim(seed=seed)
+        trace = []
+        for action in actions:
+            sim.step(action)
+            trace.append((sim.snake.body.head, sim.anti_snake.body.head, sim.food.pos))
+        return trace
+
+    def test_seed_replays_game(self):
+        """The same seed and actions replay the same game."""
+        actions = [None, DOWN, None, None, RIGHT, UP, None, None] * 3
+        self.assertEqual(self.play(7, actions), self.play(7, actions))
+        self.assertNotEqual(SnakeSim(seed=7).food.pos, SnakeSim(seed=8).food.pos)
+
+    def test_step_moves_one_cell(self):
+        """Each step moves the snake one cell, turning first if asked to."""
+        sim = SnakeSim(seed=1)
+        self.assertTrue(sim.step())
+        self.assertEqual(sim.snake.body.head, (6, 10))
+        sim.step(DOWN)
+        self.assertEqual(sim.snake.body.head, (6, 11))
+        self.assertEqual(sim.ticks, 2)
+
+    def test_reversing_is_ignored(self):
+        """Turning straight back keeps the snake's direction."""
+        sim = SnakeSim(seed=1)
+        sim.step(LEFT)
+        self.assertEqual(sim.snake.direction, RIGHT)
+        self.assertEqual(sim.snake.body.head, (6, 10))
+
+    def test_game_over(self):
+        """step returns False once the game is over, and does nothing after that."""
+        sim = SnakeSim(seed=1)
+        sim.snake.body = Body([(GRID_SIZE - 1, 0), (GRID_SIZE - 2, 0)])
+        self.assertFalse(sim.step())
+        self.assertEqual(sim.game_over_reason, "Hit wall or yourself!")
+        ticks = sim.ticks
+        self.assertFalse(sim.step(DOWN))
+        self.assertEqual(sim.ticks, ticks)
+
+        sim.restart_game()
+        self.assertFalse(sim.game_over)
+        self.assertEqual(sim.score, 0)
+
+    def test_grid_size(self):
+        """Other grid sizes are supported, down to 12 cells."""
+        sim = SnakeSim(grid_size=50, seed=1)
+        self.assertEqual(sim.anti_snake.body.head, (45, 40))
+        with self.assertRaises(ValueError):
+            SnakeSim(grid_size=11)
+
+    def test_no_pygame(self):
+        """The simulation does not import pygame."""
+        result = subprocess.run([sys.executable, "-c",
+                                 "import sys, snake_sim; print('pygame' in sys.modules)"],
+                                cwd=os.path.dirname(os.path.abspath(__file__)),
+                                capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), "False")
+
+
+class TestDistanceField(unittest.TestCase):
+    """Test cases for BFS pathfinding."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.field = DistanceField(12)
+        # A wall of body from (6, 0) down to (6, 10), leaving a gap at the bottom
+        self.wall = Body([(6, y) for y in range(11)])
+
+    def test_distances_go_around_bodies(self):
+        """Distances are path lengths around bodies, not straight lines."""
+        self.field.compute((8, 0), [self.wall])
+        self.assertEqual(self.field.distance((8, 0)), 0)
+        self.assertEqual(self.field.distance((9, 1)), 2)
+        # Left beside the wall, down to the gap, under it and back up the other side
+        self.assertEqual(self.field.distance((4, 0)), 1 + 11 + 2 + 11 + 1)
+        self.assertIsNone(self.field.distance((6, 5)))
+        self.assertIsNone(self.field.distance((-1, 0)))
+
+    def test_next_move(self):
+        """Chasers step to the neighbour nearest the target along a path."""
+        self.field.compute((8, 0), [self.wall])
+        self.assertEqual(self.field.next_move((5, 0)), DOWN)
+        self.assertEqual(self.field.next_move((8, 3)), UP)
+        self.assertEqual(self.field.next_move((9, 0)), LEFT)
+        self.field.compute((-1, 0), [self.wall])
+        self.assertIsNone(self.field.next_move((5, 0)))
+
+    def test_follow_field(self):
+        """An anti-snake goes around a body the greedy step would walk into, or falls back on it."""
+        anti_snake = AntiSnake(12)
+        anti_snake.body = Body([(5, 2), (4, 2), (3, 2)])
+        anti_snake.direction = RIGHT
+        self.field.compute((8, 2), [self.wall, anti_snake.body])
+        anti_snake.follow_field(self.field)
+        self.assertEqual(anti_snake.direction, DOWN)
+
+        # Sealed off from the target: the greedy step, straight at it
+        sealed = Body([(6, y) for y in range(12)])
+        self.field.compute((8, 2), [sealed, anti_snake.body])
+        anti_snake.follow_field(self.field)
+        self.assertEqual(anti_snake.direction, RIGHT)
+
+    def test_bfs_mode(self):
+        """SnakeSim chases with the distance field in bfs mode."""
+        sim = SnakeSim(seed=1, pathfinding="bfs")
+        while sim.step():
+            pass
+        self.assertEqual(sim.field.target, sim.snake.body.head)
+        with self.assertRaises(ValueError):
+            SnakeSim(pathfinding="astar")
+
+
+class TestSwarm(unittest.TestCase):
+    """Test cases for many anti-snakes."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.sim = SnakeSim(grid_size=64, seed=3, pathfinding="bfs", enemies=50)
+
+    def assert_swarm_matches(self, sim):
+        """The spatial hash holds exactly the anti-snakes' cells."""
+        expected = SpatialHash(anti_snake.body for anti_snake in sim.anti_snakes)
+        self.assertEqual(sim.swarm.occupied, expected.occupied)
+
+    def test_spawn(self):
+        """Anti-snakes start apart from each other and away from the player."""
+        self.assertEqual(len(self.sim.anti_snakes), 50)
+        self.assertIs(self.sim.anti_snake, self.sim.anti_snakes[0])
+        self.assertEqual(max(self.sim.swarm.occupied.values()), 1)
+        self.assertEqual(len(self.sim.swarm.occupied), 150)
+        player_x, player_y = self.sim.snake.body.head
+        for anti_snake in self.sim.anti_snakes[1:]:
+            x, y = anti_snake.body.head
+            self.assertGreaterEqual(abs(x - player_x) + abs(y - player_y), 32)
+
+    def test_enemy_collision_respawns(self):
+        """An anti-snake running into another one is respawned elsewhere."""
+        first, second = self.sim.anti_snakes[:2]
+        x, y = first.body.head
+        second.body = Body([(x + 1, y), (x + 1, y - 1), (x + 1, y - 2)])
+        self.sim.check_anti_snake_collision()
+        self.assertFalse(self.sim.game_over)
+        self.assertEqual(first.body.head, (x, y))
+        self.assertNotIn((x + 1, y), second.body)
+        self.assert_swarm_matches(self.sim)
+
+    def test_player_collision(self):
+        """Any anti-snake reaching the player ends the game."""
+        last = self.sim.anti_snakes[-1]
+        last.body = Body([(4, 10), (4, 11), (4, 12)])
+        self.sim.check_anti_snake_collision()
+        self.assertEqual(self.sim.game_over_reason, "Anti-Snake hit you!")
+
+    def test_games(self):
+        """Swarm games replay from their seed and keep the spatial hash in step."""
+        def play(sim):
+            for _ in range(40):
+                if not sim.step():
+                    sim.restart_game()
+                self.assert_swarm_matches(sim)
+            return [anti_snake.body.head for anti_snake in sim.anti_snakes]
+
+        self.assertEqual(play(self.sim), play(SnakeSim(grid_size=64, seed=3, pathfinding="bfs",
+                                                       enemies=50)))
+        play(SnakeSim(grid_size=64, seed=3, pathfinding="greedy", enemies=50))
+
+    def test_default_pathfinding(self):
+        """A swarm chases with bfs unless greedy is asked for; a lone anti-snake is greedy."""
+        self.assertEqual(SnakeSim(enemies=2).pathfinding, "bfs")
+        self.assertIsNotNone(SnakeSim(enemies=2).field)
+        self.assertEqual(SnakeSim().pathfinding, "greedy")
+        self.assertEqual(SnakeSim(enemies=2, pathfinding="greedy").pathfinding, "greedy")
+
+    def test_enemy_limits(self):
+        """There is at least one anti-snake, and they cover at most an eighth of the grid."""
+        with self.assertRaises(ValueError):
+            SnakeSim(enemies=0)
+        with self.assertRaises(ValueError):
+            SnakeSim(grid_size=32, enemies=43)
+        self.assertIsNone(SnakeSim().swarm)
+
+    def test_spatial_hash(self):
+        """Cells are counted over every body added and not removed."""
+        first = Body([(1, 1), (2, 1)])
+        second = Body([(2, 1), (3, 1)])
+        swarm = SpatialHash([first, second])
+        self.assertEqual(swarm.count((2, 1)), 2)
+        swarm.remove(first)
+        self.assertEqual(swarm.count((2, 1)), 1)
+        self.assertNotIn((1, 1), swarm)
+        self.assertIn((3, 1), swarm)
+
+
+if __name__ == "__main__":
+    unittest.main()
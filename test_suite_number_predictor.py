@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test file for the number predictor benchmark suite
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks"))
+
+from suite_number_predictor import (DEFAULT_OVERRIDES, FAMILIES, compare, generate_corpus,
+                                    threshold_for)
+
+
+def results(**values):
+    """A results document holding the given metric values; throughput is higher-is-better."""
+    return {"metrics": {name.replace("__", "."): {"value": value, "unit": "us",
+                                                  "higher_is_better": name.startswith("throughput")}
+                        for name, value in values.items()}}
+
+
+class TestThresholds(unittest.TestCase):
+    """Test cases for per-metric thresholds."""
+
+    def test_threshold_for(self):
+        """The longest matching prefix wins; prefixes match whole name parts."""
+        overrides = {"latency": 0.2, "latency.all.p99": 0.5, "memory": 0.25}
+        self.assertEqual(threshold_for("latency.all.p99", 0.1, overrides), 0.5)
+        self.assertEqual(threshold_for("latency.all.p50", 0.1, overrides), 0.2)
+        self.assertEqual(threshold_for("memory.predictor", 0.1, overrides), 0.25)
+        self.assertEqual(threshold_for("throughput.predict_next", 0.1, overrides), 0.1)
+        self.assertEqual(threshold_for("latency_extra", 0.1, overrides), 0.1)
+        self.assertEqual(threshold_for("latency.all.p50", 0.1, DEFAULT_OVERRIDES), 0.25)
+
+
+class TestCompare(unittest.TestCase):
+    """Test cases for comparing results with a baseline."""
+
+    def test_statuses(self):
+        """Changes beyond the threshold are regressions, in the metric's own direction."""
+        baseline = results(latency__arithmetic__mean=10.0, throughput__predict_next=1000.0,
+                           memory__predictor=100.0, latency__gone=1.0)
+        current = results(latency__arithmetic__mean=12.0, throughput__predict_next=1200.0,
+                          memory__predictor=120.0, latency__new=1.0)
+        rows = {row[0]: row for row in compare(current, baseline, 0.1, {"memory": 0.25})}
+
+        self.assertEqual(rows["latency.arithmetic.mean"][4], "regression")
+        self.assertAlmostEqual(rows["latency.arithmetic.mean"][3], 0.2)
+        # Faster throughput is an improvement: a negative change
+        self.assertAlmostEqual(rows["throughput.predict_next"][3], -0.2)
+        self.assertEqual(rows["throughput.predict_next"][4], "ok")
+        self.assertEqual(rows["memory.predictor"][4], "ok")
+        self.assertEqual(rows["latency.gone"][4], "missing")
+        self.assertEqual(rows["latency.new"][4], "new")
+
+    def test_default_overrides(self):
+        """Latency percentiles get their looser threshold unless overrides are given."""
+        baseline = results(latency__all__p99=100.0)
+        current = results(latency__all__p99=120.0)
+        self.assertEqual(compare(current, baseline, 0.1)[0][4], "ok")
+        self.assertEqual(compare(current, baseline, 0.1, {})[0][4], "regression")
+
+
+class TestCorpus(unittest.TestCase):
+    """Test cases for the synthetic corpus."""
+
+    def test_deterministic(self):
+        """The same seed gives the same corpus, another seed a different one."""
+        corpus = generate_corpus(500, seed=3)
+        self.assertEqual(corpus, generate_corpus(500, seed=3))
+        self.assertNotEqual(corpus, generate_corpus(500, seed=4))
+
+    def test_families_and_lengths(self):
+        """Every family appears, with the requested number of terms."""
+        corpus = generate_corpus(2000, seed=1, min_terms=4, max_terms=6)
+        self.assertEqual({family for family, _ in corpus}, set(FAMILIES))
+        for family, sequence in corpus:
+            self.assertGreaterEqual(len(sequence), 4)
+            self.assertLessEqual(len(sequence), 6)
+        self.assertNotIn("noise", {family for family, _ in generate_corpus(200, noise=0.0)})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,15 +4,19 @@ Test file for Tic-Tac-Toe game
 Tests the core game logic and functionality
 """
 
+import random
 import unittest
 from unittest.mock import patch, MagicMock
 import sys
 import os
+import time
 
 # Add the project directory to the path to import the game
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from tic_tac_toe import TicTacToe
+from tic_tac_toe import (FULL_BOARD, SYMMETRIES, WIN_MASKS, ComputerPlayer, MCTSPlayer,
+                         TicTacToe, bitboard_winner, canonical_key, popcount)
+from tic_tac_toe_solver import solve
 
 class TestTicTacToe(unittest.TestCase):
     """Test cases for the TicTacToe class."""
@@ -183,5 +187,295 @@ class TestTicTacToe(unittest.TestCase):
             else:
                 self.game.switch_player()
 
+class TestBitboard(unittest.TestCase):
+    """Test cases for the bitboard representation behind the board."""
+    
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.game = TicTacToe()
+    
+    def test_moves_set_bits(self):
+        """Position p sets bit p - 1 of the current player's bitboard."""
+        self.game.make_move(1)
+        self.game.switch_player()
+        self.game.make_move(9)
+        self.assertEqual((self.game.x_bits, self.game.o_bits), (0b000000001, 0b100000000))
+        self.assertEqual(popcount(self.game.x_bits | self.game.o_bits), 2)
+    
+    def test_board_view(self):
+        """Writes through board update the bitboards and reads come from them."""
+        self.game.board[2][0] = 'O'
+        self.game.board[0] = ['X', ' ', 'X']
+        self.assertEqual(self.game.o_bits, 1 << 6)
+        self.assertEqual(self.game.x_bits, 0b101)
+        self.assertEqual(self.game.board, [['X', ' ', 'X'], [' ', ' ', ' '], ['O', ' ', ' ']])
+        self.assertEqual(self.game.board[2][-3], 'O')
+        
+        self.game.board[0][0] = ' '
+        self.assertEqual(self.game.x_bits, 0b100)
+        with self.assertRaises(ValueError):
+            self.game.board[1][1] = 'Z'
+        with self.assertRaises(IndexError):
+            self.game.board[3]
+    
+    def test_masks_match_lines(self):
+        """Every mask is one row, column or diagonal of the position numbers."""
+        lines = [(1, 2, 3), (4, 5, 6), (7, 8, 9), (1, 4, 7), (2, 5, 8), (3, 6, 9), (1, 5, 9), (3, 5, 7)]
+        self.assertEqual(sorted(WIN_MASKS), sorted(sum(1 << (p - 1) for p in line) for line in lines))
+    
+    def test_winner_matches_board_scan(self):
+        """bitboard_winner agrees with scanning the grid for every legal position."""
+        def scan(board):
+            lines = [row for row in board] + [list(col) for col in zip(*board)]
+            lines += [[board[i][i] for i in range(3)], [board[i][2 - i] for i in range(3)]]
+            for line in lines:
+                if line[0] != ' ' and line.count(line[0]) == 3:
+                    return line[0]
+            return 'TIE' if all(' ' not in row for row in board) else None
+        
+        for x_bits in range(512):
+            for o_bits in range(512):
+                if x_bits & o_bits or not 0 <= popcount(x_bits) - popcount(o_bits) <= 1:
+                    continue
+                self.game.x_bits, self.game.o_bits = x_bits, o_bits
+                expected = scan([list(row) for row in self.game.board])
+                if expected in ('X', 'O') and bitboard_winner(o_bits if expected == 'X' else x_bits, 0):
+                    continue  # Both players have a line: not reachable in play
+                self.assertEqual(bitboard_winner(x_bits, o_bits), expected)
+        self.assertEqual(bitboard_winner(0b101011010, FULL_BOARD & ~0b101011010), 'TIE')
+
+class TestLargeBoard(unittest.TestCase):
+    """Test cases for N x N boards with K in a row to win."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.game = TicTacToe(15)
+    
+    def play(self, positions):
+        """Play positions in turn; returns the result after the last one."""
+        for position in positions:
+            self.game.make_move(position)
+            result = self.game.check_winner()
+            self.game.switch_player()
+        return result
+    
+    def test_board_size(self):
+        """The board, positions and win length follow the size."""
+        self.assertEqual(self.game.win_length, 5)
+        self.assertEqual(len(self.game.board), 15)
+        self.assertEqual(self.game.empty_count, 225)
+        self.assertEqual(self.game.get_position_from_number(16), (1, 0))
+        self.assertEqual(self.game.is_valid_move(225), (True, ""))
+        self.assertEqual(self.game.is_valid_move(226), (False, "Position must be between 1 and 225!"))
+        self.assertEqual(TicTacToe(4).win_length, 4)
+        self.assertEqual(TicTacToe(3).win_length, 3)
+        with self.assertRaises(ValueError):
+            TicTacToe(4, 5)
+    
+    def test_lines_through_last_move(self):
+        """Five in a row wins along rows, columns and both diagonals, finished anywhere in the line."""
+        lines = {
+            'row': [101, 102, 103, 105, 104],
+            'column': [1, 16, 46, 61, 31],
+            'diagonal': [17, 33, 49, 65, 81],
+            'anti-diagonal': [15, 29, 43, 57, 71],
+        }
+        for name, line in lines.items():
+            with self.subTest(line=name):
+                self.game.reset_game()
+                elsewhere = [211, 213, 215, 217]  # O's moves, far from the line
+                moves = [move for pair in zip(line, elsewhere) for move in pair] + [line[-1]]
+                self.assertIsNone(self.play(moves[:-1]))
+                self.assertEqual(self.play(moves[-1:]), 'X')
+    
+    def test_lines_do_not_wrap(self):
+        """A row that runs off the right edge does not continue on the next row."""
+        self.game.reset_game()
+        self.assertIsNone(self.play([13, 200, 14, 202, 15, 204, 16, 206, 17]))
+    
+    def test_tie_from_empty_count(self):
+        """The game is a tie once the last empty cell is filled without a line."""
+        game = TicTacToe(4)
+        # Rows alternate XXOO and OOXX, so no row, column or diagonal is one mark
+        for position in (1, 3, 2, 4, 7, 5, 8, 6, 9, 11, 10, 12, 15, 13, 16):
+            game.make_move(position)
+            self.assertIsNone(game.check_winner())
+            game.switch_player()
+        self.assertEqual(game.empty_count, 1)
+        game.make_move(14)
+        self.assertEqual(game.check_winner(), 'TIE')
+    
+    def test_board_edits_are_scanned(self):
+        """A line written directly to the board is found by a full scan."""
+        for col in range(5):
+            self.game.board[7][col + 3] = 'O'
+        self.assertEqual(self.game.check_winner(), 'O')
+        self.game.board[7][5] = ' '
+        self.assertIsNone(self.game.check_winner())
+        self.assertEqual(self.game.empty_count, 225 - 4)
+    
+    def test_incremental_matches_full_scan(self):
+        """Checking the last move agrees with scanning the whole board, move by move."""
+        rng = random.Random(5)
+        for size, win_length in ((5, 4), (9, 5), (20, 5)):
+            for _ in range(20):
+                game = TicTacToe(size, win_length)
+                for position in rng.sample(range(1, size * size + 1), size * size):
+                    game.make_move(position)
+                    result = game.check_winner()
+                    expected = game._scan_winner() or ('TIE' if game.empty_count == 0 else None)
+                    self.assertEqual(result, expected)
+                    if result:
+                        break
+                    game.switch_player()
+    
+    def test_computer_player_is_classic_only(self):
+        """The 3x3 computer player does not play larger boards."""
+        with self.assertRaises(ValueError):
+            ComputerPlayer().choose_move(self.game)
+
+class TestComputerPlayer(unittest.TestCase):
+    """Test cases for the negamax computer player."""
+    
+    def position(self, x_bits, o_bits):
+        """A game in the given position with the right player to move."""
+        game = TicTacToe()
+        game.x_bits, game.o_bits = x_bits, o_bits
+        if popcount(x_bits) > popcount(o_bits):
+            game.switch_player()
+        return game
+    
+    def test_plays_perfectly(self):
+        """Every configuration picks a move that keeps the solved value, in every position."""
+        solved = solve()
+        players = [ComputerPlayer(), ComputerPlayer(symmetry=False),
+                   ComputerPlayer(transpositions=False), ComputerPlayer(pruning=False)]
+        for (x_bits, o_bits), (score, move) in solved.items():
+            if not move:
+                continue
+            game = self.position(x_bits, o_bits)
+            for player in players:
+                bit = 1 << (player.choose_move(game) - 1)
+                child = (x_bits | bit, o_bits) if game.current_player == 'X' else (x_bits, o_bits | bit)
+                self.assertEqual(-solved[child][0], score)
+    
+    def test_takes_win_and_blocks(self):
+        """An immediate win comes before blocking, and a threat is blocked."""
+        player = ComputerPlayer()
+        game = self.position(0b000000011, 0b000011000)  # X to move: 3 wins
+        self.assertEqual(player.choose_move(game), 3)
+        game = self.position(0b000000011, 0b000010000)  # O to move: must block 3
+        self.assertEqual(player.choose_move(game), 3)
+    
+    def test_search_reductions(self):
+        """Pruning, the transposition table and symmetry each cut the positions searched."""
+        nodes = []
+        for options in ({'pruning': False, 'transpositions': False, 'symmetry': False},
+                        {'transpositions': False, 'symmetry': False},
+                        {'symmetry': False}, {}):
+            player = ComputerPlayer(**options)
+            player.choose_move(TicTacToe())
+            nodes.append(player.last_search.nodes)
+        self.assertEqual(nodes[0], 549945)  # Every game from the empty board
+        self.assertEqual(nodes, sorted(nodes, reverse=True))
+        self.assertLess(nodes[-1] * 100, nodes[0])
+        
+        self.assertLessEqual(player.last_search.lookups, player.last_search.nodes)
+        self.assertGreater(player.last_search.hit_rate, 0)
+    
+    def test_canonical_key(self):
+        """All 8 symmetric images of a position share a key."""
+        x_bits, o_bits = 0b000000011, 0b000010100
+        keys = {canonical_key(symmetry[x_bits], symmetry[o_bits]) for symmetry in SYMMETRIES}
+        self.assertEqual(len(keys), 1)
+        self.assertEqual(len({symmetry[x_bits] for symmetry in SYMMETRIES}), 8)
+        self.assertNotEqual(canonical_key(x_bits, o_bits), canonical_key(o_bits, x_bits))
+    
+    def test_game_over(self):
+        """There is no move to choose once the game is over."""
+        with self.assertRaises(ValueError):
+            ComputerPlayer().choose_move(self.position(0b000000111, 0b000011000))
+
+class TestMCTSPlayer(unittest.TestCase):
+    """Test cases for the Monte Carlo tree search player."""
+    
+    def player(self, **options):
+        """A player bounded by simulations rather than time, so tests are repeatable."""
+        options.setdefault('time_limit', 60)
+        options.setdefault('max_simulations', 3000)
+        return MCTSPlayer(seed=7, **options)
+    
+    def test_takes_win_and_blocks(self):
+        """An immediate win comes before blocking, and a threat is blocked."""
+        game = TicTacToe()
+        game.board = [['X', 'X', ' '], ['O', 'O', ' '], [' ', ' ', ' ']]
+        self.assertEqual(self.player().choose_move(game), 3)
+        game.board = [['X', 'X', ' '], [' ', 'O', ' '], [' ', ' ', ' ']]
+        game.current_player = 'O'
+        self.assertEqual(self.player().choose_move(game), 3)
+        
+        game = TicTacToe(7, 4)
+        game.board[3] = ['X', 'O', 'O', 'O', ' ', ' ', ' ']
+        game.board[0] = ['X', ' ', ' ', ' ', ' ', ' ', 'X']
+        self.assertEqual(self.player(max_simulations=5000).choose_move(game), 26)
+    
+    def test_time_limit(self):
+        """A search stops at the time limit and reports its simulation rate."""
+        player = MCTSPlayer(time_limit=0.05, seed=1)
+        start = time.perf_counter()
+        position = player.choose_move(TicTacToe(15))
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertTrue(TicTacToe(15).is_valid_move(position)[0])
+        stats = player.last_search
+        self.assertGreater(stats.simulations, 0)
+        self.assertAlmostEqual(stats.rate, stats.simulations / stats.seconds)
+        
+    def test_empty_budget(self):
+        """An expired time budget still plays a move; no simulations at all is refused."""
+        player = MCTSPlayer(time_limit=0, seed=1)
+        self.assertTrue(TicTacToe().is_valid_move(player.choose_move(TicTacToe()))[0])
+        self.assertEqual(player.last_search.simulations, 1)
+        self.assertIn(MCTSPlayer(max_simulations=1, seed=1).choose_move(TicTacToe()), range(1, 10))
+        for max_simulations in (0, -5):
+            with self.assertRaises(ValueError):
+                MCTSPlayer(max_simulations=max_simulations)
+    
+    def test_reuses_subtree(self):
+        """The tree below the chosen move and the opponent's reply is kept for the next move."""
+        player = self.player()
+        game = TicTacToe()
+        game.make_move(player.choose_move(game))
+        game.switch_player()
+        self.assertEqual(player.last_search.reused, 0)
+        game.make_move(next(p for p in range(1, 10) if game.is_valid_move(p)[0]))
+        game.switch_player()
+        player.choose_move(game)
+        self.assertGreater(player.last_search.reused, 0)
+        
+        # An unrelated position starts a new tree
+        player.choose_move(TicTacToe(4))
+        self.assertEqual(player.last_search.reused, 0)
+        player.reuse_tree = False
+        player.choose_move(TicTacToe(4))
+        self.assertEqual(player.last_search.reused, 0)
+    
+    def test_root_parallel(self):
+        """Worker processes grow separate trees whose visits are merged."""
+        player = self.player(workers=2, max_simulations=400)
+        try:
+            game = TicTacToe()
+            game.board = [['X', 'X', ' '], ['O', 'O', ' '], [' ', ' ', ' ']]
+            self.assertEqual(player.choose_move(game), 3)
+            self.assertEqual(player.last_search.simulations, 400)
+        finally:
+            player.close()
+    
+    def test_game_over(self):
+        """There is no move to choose once the game is over."""
+        game = TicTacToe(5, 3)
+        game.board[0] = ['O', 'O', 'O', ' ', ' ']
+        with self.assertRaises(ValueError):
+            self.player().choose_move(game)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Test file for the headless Tic-Tac-Toe self-play engine
+"""
+
+import io
+import random
+import unittest
+from contextlib import redirect_stdout
+
+from tic_tac_toe import TicTacToe
+from tic_tac_toe_selfplay import (SelfPlayStats, greedy_policy, main, perfect_policy,
+                                  play_games, random_policy)
+
+
+def first_empty_policy(game, rng):
+    """The lowest empty square: a policy defined outside the engine."""
+    return game.cells.index(0) + 1
+
+
+class TestPolicies(unittest.TestCase):
+    """Test cases for the built-in policies."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.rng = random.Random(0)
+
+    def test_random_plays_empty_squares(self):
+        """Random moves are always legal."""
+        game = TicTacToe()
+        game.board = [['X', 'O', 'X'], ['O', ' ', 'X'], ['O', 'X', ' ']]
+        moves = {random_policy(game, self.rng) for _ in range(50)}
+        self.assertEqual(moves, {5, 9})
+
+    def test_greedy_wins_then_blocks(self):
+        """Greedy takes a win before blocking, and blocks before playing at random."""
+        game = TicTacToe(5, 4)
+        game.board[0] = ['X', 'X', 'X', ' ', ' ']
+        game.board[2] = ['O', 'O', 'O', ' ', ' ']
+        self.assertEqual(greedy_policy(game, self.rng), 4)
+        game.current_player = 'O'
+        self.assertEqual(greedy_policy(game, self.rng), 14)
+        game.board[2] = ['O', ' ', ' ', ' ', ' ']
+        self.assertEqual(greedy_policy(game, self.rng), 4)  # Blocks X
+        self.assertEqual(game.board[0], ['X', 'X', 'X', ' ', ' '])  # Trial moves are undone
+
+    def test_perfect_keeps_the_value(self):
+        """Perfect play takes a win and is only defined on the classic board."""
+        game = TicTacToe()
+        game.board = [['X', 'X', ' '], ['O', 'O', ' '], [' ', ' ', ' ']]
+        self.assertEqual(perfect_policy(game, self.rng), 3)
+        with self.assertRaises(ValueError):
+            perfect_policy(TicTacToe(4), self.rng)
+
+
+class TestPlayGames(unittest.TestCase):
+    """Test cases for sharded self-play."""
+
+    def test_statistics(self):
+        """Outcomes add up to the games played, with lengths from 5 to 9 moves."""
+        stats = play_games("random", "random", 3000, seed=1, workers=1, chunk_size=1000)
+        self.assertEqual(stats.games, 3000)
+        self.assertEqual(sum(stats.lengths.values()), 3000)
+        self.assertTrue(set(stats.lengths) <= set(range(5, 10)))
+        self.assertGreater(stats.x_wins, stats.o_wins)  # Moving first is an advantage
+        self.assertGreater(stats.draws, 0)
+        self.assertTrue(5 <= stats.mean_length <= 9)
+
+    def test_perfect_play(self):
+        """Perfect play never loses, and always draws against itself."""
+        stats = play_games("perfect", "perfect", 500, workers=1)
+        self.assertEqual(stats.draws, 500)
+        self.assertEqual(stats.lengths, {9: 500})
+        self.assertEqual(play_games("perfect", "random", 1000, workers=1).o_wins, 0)
+        self.assertEqual(play_games("random", "perfect", 1000, workers=1).x_wins, 0)
+
+    def test_seeded_streams(self):
+        """Results depend on the seed and not on the number of workers."""
+        serial = play_games("random", "greedy", 2000, seed=5, workers=1, chunk_size=500)
+        parallel = play_games("random", "greedy", 2000, seed=5, workers=2, chunk_size=500)
+        self.assertEqual(serial, parallel)
+        self.assertNotEqual(serial, play_games("random", "greedy", 2000, seed=6, workers=1,
+                                               chunk_size=500))
+
+    def test_larger_boards_and_custom_policies(self):
+        """Games run on N x N boards, and any module-level function is a policy."""
+        stats = play_games(first_empty_policy, "random", 20, size=6, win_length=4, workers=1)
+        self.assertEqual(stats.games, 20)
+        self.assertTrue(min(stats.lengths) >= 7)
+        with self.assertRaises(ValueError):
+            play_games("clever", "random", 10)
+
+    def test_limits(self):
+        """No games gives empty statistics; negative games and empty chunks are rejected."""
+        stats = play_games("random", "random", 0, workers=1)
+        self.assertEqual(stats, SelfPlayStats())
+        self.assertEqual(stats.mean_length, 0.0)
+        with self.assertRaises(ValueError):
+            play_games("random", "random", -1, workers=1)
+        with self.assertRaises(ValueError):
+            play_games("random", "random", 10, workers=1, chunk_size=0)
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            main(["--games", "0", "--workers", "1"])
+        self.assertIn("no games played", output.getvalue())
+        with self.assertRaises(SystemExit):
+            main(["--chunk-size", "0"])
+
+    def test_merge(self):
+        """Merged statistics total both batches."""
+        first, second = SelfPlayStats(), SelfPlayStats()
+        first.add('X', 5)
+        second.add('TIE', 9)
+        second.add('X', 5)
+        first.merge(second)
+        self.assertEqual((first.x_wins, first.o_wins, first.draws), (2, 0, 1))
+        self.assertEqual(first.lengths, {5: 2, 9: 1})
+        self.assertAlmostEqual(first.mean_length, 19 / 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Test file for the solved Tic-Tac-Toe table
+"""
+
+import os
+import random
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from tic_tac_toe import ComputerPlayer, MCTSPlayer, TicTacToe, perfect_player
+from tic_tac_toe_solver import (BOARD_COUNT, DEFAULT_PATH, Solution, SolvedTable, TablePlayer,
+                                board_index, default_table, solve)
+
+
+def play(game, players):
+    """Play a game to the end; players maps 'X' and 'O' to move functions."""
+    while True:
+        game.make_move(players[game.current_player](game))
+        result = game.check_winner()
+        if result:
+            return result
+        game.switch_player()
+
+
+class TestSolve(unittest.TestCase):
+    """Test cases for the offline solver."""
+
+    def test_reachable_positions(self):
+        """Every position reachable in play is solved, and the game is a draw."""
+        solved = solve()
+        self.assertEqual(len(solved), 5478)
+        self.assertEqual(solved[(0, 0)][0], 0)
+
+    def test_board_index(self):
+        """The position hash is the board read as a base-3 number."""
+        self.assertEqual(board_index(0, 0), 0)
+        self.assertEqual(board_index(0b1, 0), 1)
+        self.assertEqual(board_index(0, 0b1), 2)
+        self.assertEqual(board_index(0b100000000, 0b010000000), 3 ** 8 + 2 * 3 ** 7)
+        self.assertEqual(board_index(0, 0b111111111), BOARD_COUNT - 1)
+
+
+class TestSolvedTable(unittest.TestCase):
+    """Test cases for table lookups and the table file."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.table = default_table()
+
+    def test_lookup(self):
+        """Values and moves are for the player to move."""
+        # X to move wins at once on 3
+        self.assertEqual(self.table.lookup(0b000000011, 0b000011000), Solution(1, 3))
+        # O to move must block 3 and still draws
+        self.assertEqual(self.table.lookup(0b000000011, 0b000010000), Solution(0, 3))
+        # X has won: the game is over, O lost
+        self.assertEqual(self.table.lookup(0b000000111, 0b000011000), Solution(-1, 0))
+        # O cannot have more marks than X
+        self.assertIsNone(self.table.lookup(0, 0b11))
+
+    def test_shipped_table_is_current(self):
+        """The table file in the repository matches a fresh solve."""
+        self.assertTrue(os.path.exists(DEFAULT_PATH))
+        built = SolvedTable.build()
+        self.assertEqual(self.table.reachable, built.reachable)
+        self.assertEqual(bytes(self.table._data), bytes(built._data))
+
+    def test_save_and_load(self):
+        """A saved table maps back with the same entries."""
+        built = SolvedTable.build()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "solved.bin")
+            built.save(path)
+            self.assertEqual(os.path.getsize(path), 16 + BOARD_COUNT)
+            loaded = SolvedTable.load(path)
+            self.assertEqual(loaded.reachable, 5478)
+            self.assertEqual(bytes(loaded._data), bytes(built._data))
+
+    def test_rejects_other_files(self):
+        """Files without the table header, or cut short, are rejected."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "other.bin")
+            with open(path, "wb") as file:
+                file.write(b"not a table at all")
+            with self.assertRaises(ValueError):
+                SolvedTable.load(path)
+
+            SolvedTable.build().save(path)
+            with open(path, "r+b") as file:
+                file.truncate(1000)
+            with self.assertRaises(ValueError):
+                SolvedTable.load(path)
+
+    def test_perfect_play_never_loses(self):
+        """The table player draws itself and never loses to random play."""
+        self.assertEqual(play(TicTacToe(), {'X': self.table.best_move, 'O': self.table.best_move}),
+                         'TIE')
+
+        rng = random.Random(3)
+
+        def random_move(game):
+            return rng.choice([p for p in range(1, 10) if game.is_valid_move(p)[0]])
+
+        for table_player in ('X', 'O'):
+            for _ in range(200):
+                players = {'X': random_move, 'O': random_move}
+                players[table_player] = self.table.best_move
+                with self.subTest(table_player=table_player):
+                    self.assertIn(play(TicTacToe(), players), (table_player, 'TIE'))
+
+    def test_best_move_after_game_over(self):
+        """Asking for a move in a finished game is an error."""
+        game = TicTacToe()
+        game.board = [['X', 'X', 'X'], ['O', 'O', ' '], [' ', ' ', ' ']]
+        with self.assertRaises(ValueError):
+            self.table.best_move(game)
+
+
+class TestTablePlayer(unittest.TestCase):
+    """Test cases for the solved table as the game's computer opponent."""
+
+    def test_game_uses_table(self):
+        """The classic game's computer opponent plays from the table, with no search."""
+        game = TicTacToe()
+        with patch("builtins.input", return_value="2"):
+            game.choose_opponent()
+        self.assertIsInstance(game.computer, TablePlayer)
+        game.make_move(1)
+        game.switch_player()
+        self.assertEqual(game.computer.choose_move(game), 5)
+        self.assertIn("no search", game.computer.last_search.describe())
+
+        large = TicTacToe(size=9)
+        with patch("builtins.input", return_value="2"):
+            large.choose_opponent()
+        self.assertIsInstance(large.computer, MCTSPlayer)
+
+    def test_fallback_to_search(self):
+        """Without a usable table file the opponent searches instead."""
+        with tempfile.TemporaryDirectory() as directory:
+            missing = os.path.join(directory, "missing.bin")
+            with patch("tic_tac_toe_solver.DEFAULT_PATH", missing):
+                self.assertIsInstance(perfect_player(), ComputerPlayer)
+
+            # A table file whose position count is wrong is stale
+            stale = os.path.join(directory, "stale.bin")
+            SolvedTable(bytes(BOARD_COUNT), 12).save(stale)
+            with patch("tic_tac_toe_solver.DEFAULT_PATH", stale):
+                self.assertIsInstance(perfect_player(), ComputerPlayer)
+
+        self.assertIsInstance(perfect_player(), TablePlayer)
+
+
+if __name__ == "__main__":
+    unittest.main()
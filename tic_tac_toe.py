@@ -3,89 +3,663 @@
 Tic-Tac-Toe Game
 A classic 3x3 grid game for two players.
 Players take turns placing X and O marks to get three in a row.
+Larger boards play K in a row, e.g. gomoku: --size 15 --win-length 5.
 """
 
-import os
+import argparse
+import math
+import random
 import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from console_renderer import ConsoleRenderer
+
+# Bitboards: bit i is set when position i + 1 holds the player's mark,
+# so bits 0-2 are the top row and bits 6-8 the bottom row.
+FULL_BOARD = 0b111111111
+
+# The 8 lines: rows, columns and diagonals
+WIN_MASKS = (
+    0b000000111, 0b000111000, 0b111000000,
+    0b001001001, 0b010010010, 0b100100100,
+    0b100010001, 0b001010100,
+)
+
+# Whether each of the 512 bitboards contains a line, so that checking a
+# position is one table lookup per player
+_HAS_LINE = tuple(any(bits & mask == mask for mask in WIN_MASKS) for bits in range(512))
+
+
+# Cell codes in TicTacToe.cells, one byte per square in position order
+_MARKS = (' ', 'X', 'O')
+_CODES = {' ': 0, 'X': 1, 'O': 2}
+
+# Row, column steps along a row, a column and the two diagonals
+_DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+
+def popcount(bits):
+    """Number of set bits, i.e. marks on a bitboard."""
+    return bin(bits).count("1")
+
+
+def bitboard_winner(x_bits, o_bits):
+    """Return 'X', 'O', 'TIE' or None for a position given as two bitboards."""
+    if _HAS_LINE[x_bits]:
+        return 'X'
+    if _HAS_LINE[o_bits]:
+        return 'O'
+    if x_bits | o_bits == FULL_BOARD:  # popcount(x_bits | o_bits) == 9
+        return 'TIE'
+    return None
+
+
+def line_through(cells, size, win_length, index):
+    """
+    Whether the mark at index of a size x size board of cell codes is part
+    of win_length in a row.  Only the 4 lines through index are walked, at
+    most win_length - 1 squares each way.
+    """
+    needed = win_length - 1
+    code = cells[index]
+    row, col = divmod(index, size)
+    for d_row, d_col in _DIRECTIONS:
+        count = 0
+        for step in (1, -1):
+            r, c = row + step * d_row, col + step * d_col
+            while count < needed and 0 <= r < size and 0 <= c < size and cells[r * size + c] == code:
+                count += 1
+                r += step * d_row
+                c += step * d_col
+        if count >= needed:
+            return True
+    return False
+
+
+def _square_map(transform):
+    """For each of the 512 bitboards, the bitboard with its squares moved by transform."""
+    targets = [transform(i // 3, i % 3) for i in range(9)]
+    return tuple(sum(1 << (row * 3 + col) for i, (row, col) in enumerate(targets) if bits >> i & 1)
+                 for bits in range(512))
+
+
+# The 8 symmetries of the board (the dihedral group D4): 4 rotations,
+# each with and without a mirror image, as bitboard lookup tables
+SYMMETRIES = tuple(_square_map(transform) for transform in [
+    lambda r, c: (r, c), lambda r, c: (c, 2 - r), lambda r, c: (2 - r, 2 - c),
+    lambda r, c: (2 - c, r), lambda r, c: (r, 2 - c), lambda r, c: (c, r),
+    lambda r, c: (2 - r, c), lambda r, c: (2 - c, 2 - r),
+])
+
+# Center first, then corners, then edges: the strongest moves come first,
+# so alpha-beta cuts off sooner
+_MOVE_ORDER = tuple(1 << i for i in (4, 0, 2, 6, 8, 1, 3, 5, 7))
+
+# Transposition table bounds: the stored value is exact, at least or at most
+# the true one
+_EXACT, _LOWER, _UPPER = range(3)
+
+
+def canonical_key(mover_bits, opponent_bits):
+    """The same key for all 8 symmetric images of a position."""
+    return min((symmetry[mover_bits] << 9) | symmetry[opponent_bits] for symmetry in SYMMETRIES)
+
+
+class SearchStats(namedtuple("SearchStats", ["nodes", "lookups", "hits"])):
+    """Positions visited by one search, and its transposition table lookups and hits."""
+    
+    @property
+    def hit_rate(self):
+        """Fraction of table lookups that found an entry."""
+        return self.hits / self.lookups if self.lookups else 0.0
+    
+    def describe(self):
+        """One line for the game to show after the computer's move."""
+        return f"{self.nodes} positions searched, {self.hit_rate:.0%} transposition table hits"
+
+
+class ComputerPlayer:
+    """
+    A perfect computer opponent: negamax search with alpha-beta pruning and
+    a transposition table keyed on positions reduced under the 8 board
+    symmetries.  Each can be turned off to measure what it saves.
+    """
+    
+    def __init__(self, pruning=True, transpositions=True, symmetry=True):
+        self.pruning = pruning
+        self.transpositions = transpositions
+        self.symmetry = symmetry
+        self.table = {}
+        self.last_search = SearchStats(0, 0, 0)
+        self._nodes = self._lookups = self._hits = 0
+        
+    def choose_move(self, game):
+        """Return the best position (1-9) for the current player; stats go to last_search."""
+        if not game._classic:
+            raise ValueError("The computer player only plays the classic 3x3 game")
+        if game.current_player == 'X':
+            mover, opponent = game.x_bits, game.o_bits
+        else:
+            mover, opponent = game.o_bits, game.x_bits
+        if bitboard_winner(mover, opponent) is not None:
+            raise ValueError("The game is already over")
+        
+        self._nodes = self._lookups = self._hits = 0
+        occupied = mover | opponent
+        best_move = None
+        alpha = -math.inf
+        for bit in _MOVE_ORDER:
+            if occupied & bit:
+                continue
+            score = -self._negamax(opponent, mover | bit, -math.inf, -alpha)
+            if score > alpha:
+                alpha = score
+                best_move = bit.bit_length()
+        self.last_search = SearchStats(self._nodes, self._lookups, self._hits)
+        return best_move
+        
+    def _negamax(self, mover, opponent, alpha, beta):
+        """
+        Value of the position for the player to move: positive for a win,
+        larger the sooner, negative for a loss and 0 for a draw.
+        """
+        self._nodes += 1
+        occupied = mover | opponent
+        if _HAS_LINE[opponent]:
+            return popcount(occupied) - 10
+        if occupied == FULL_BOARD:
+            return 0
+        
+        if self.transpositions:
+            key = canonical_key(mover, opponent) if self.symmetry else (mover << 9) | opponent
+            self._lookups += 1
+            entry = self.table.get(key)
+            if entry is not None:
+                self._hits += 1
+                value, bound = entry
+                if bound == _EXACT:
+                    return value
+                if bound == _LOWER:
+                    alpha = max(alpha, value)
+                else:
+                    beta = min(beta, value)
+                if alpha >= beta:
+                    return value
+        
+        original_alpha = alpha
+        best = -math.inf
+        for bit in _MOVE_ORDER:
+            if occupied & bit:
+                continue
+            score = -self._negamax(opponent, mover | bit, -beta, -alpha)
+            if score > best:
+                best = score
+                if best > alpha:
+                    alpha = best
+                    if self.pruning and alpha >= beta:
+                        break
+        
+        if self.transpositions:
+            if not self.pruning or original_alpha < best < beta:
+                bound = _EXACT
+            elif best <= original_alpha:
+                bound = _UPPER
+            else:
+                bound = _LOWER
+            self.table[key] = (best, bound)
+        return best
+
+
+def perfect_player():
+    """
+    The computer opponent for the classic board: lookups in the solved table
+    shipped with the game, with no search at move time, or ComputerPlayer's
+    search if the table file is missing, unreadable or stale.
+    """
+    # Imported here: the solver module imports this one
+    try:
+        from tic_tac_toe_solver import DEFAULT_PATH, REACHABLE_POSITIONS, SolvedTable, TablePlayer
+        table = SolvedTable.load(DEFAULT_PATH)
+    except (ImportError, OSError, ValueError):
+        return ComputerPlayer()
+    if table.reachable != REACHABLE_POSITIONS:
+        return ComputerPlayer()
+    return TablePlayer(table)
+
+
+class MCTSStats(namedtuple("MCTSStats", ["simulations", "seconds", "reused"])):
+    """Simulations run by one search, its wall-clock time and the visits kept from the last move."""
+    
+    @property
+    def rate(self):
+        """Simulations per second."""
+        return self.simulations / self.seconds if self.seconds else 0.0
+    
+    def describe(self):
+        """One line for the game to show after the computer's move."""
+        return f"{self.simulations:,} simulations, {self.rate:,.0f} per second"
+
+
+class _Node:
+    """A position in the MCTS tree, reached by mover playing move (a board index)."""
+    
+    __slots__ = ("move", "mover", "parent", "children", "untried", "empty", "result",
+                 "visits", "wins")
+    
+    def __init__(self, move, mover, parent, empty, result):
+        self.move = move
+        self.mover = mover
+        self.parent = parent
+        self.children = []
+        self.untried = None  # Empty squares not yet expanded, made on the first visit
+        self.empty = empty
+        self.result = result  # Winner's cell code, 0 for a draw, None while in play
+        self.visits = 0
+        self.wins = 0.0  # For mover, a draw counting half
+
+
+class MCTSPlayer:
+    """
+    A computer opponent for boards too large to search exhaustively: Monte
+    Carlo tree search with UCT selection and random rollouts on a bytearray
+    of cell codes.  Each move searches for time_limit seconds (or until
+    max_simulations), keeps the subtree below its move for the next one,
+    and with workers > 1 grows independent trees in worker processes from
+    the same root and plays the move with most visits across all of them.
+    """
+    
+    def __init__(self, time_limit=1.0, max_simulations=None, exploration=math.sqrt(2),
+                 reuse_tree=True, workers=1, seed=None):
+        if max_simulations is not None and max_simulations < 1:
+            raise ValueError("max_simulations must be at least 1")
+        self.time_limit = time_limit
+        self.max_simulations = max_simulations
+        self.exploration = exploration
+        self.reuse_tree = reuse_tree
+        self.workers = workers
+        self.last_search = MCTSStats(0, 0.0, 0)
+        self._rng = random.Random(seed)
+        self._root = None
+        self._root_cells = None
+        self._executor = None
+        
+    def choose_move(self, game):
+        """Return the position (1 to size * size) with the most visits; stats go to last_search."""
+        if game.check_winner() is not None:
+            raise ValueError("The game is already over")
+        mover = 2 if game.current_player == 'X' else 1  # Who made the root position's last move
+        start = time.perf_counter()
+        if self.workers > 1:
+            visits, simulations = self._search_in_workers(game, mover)
+            reused = 0
+        else:
+            root = self._reused_root(game, mover)
+            reused = root.visits
+            cells = bytes(game.cells)
+            simulations = self._search(root, cells, game.size, game.win_length,
+                                       start + self.time_limit)
+            visits = {child.move: child.visits for child in root.children}
+            if self.reuse_tree:
+                best = max(root.children, key=lambda child: child.visits)
+                best.parent = None
+                self._root = best
+                self._root_cells = bytearray(cells)
+                self._root_cells[best.move] = best.mover
+        self.last_search = MCTSStats(simulations, time.perf_counter() - start, reused)
+        return max(visits, key=visits.get) + 1
+        
+    def close(self):
+        """Shut down the worker processes, if any."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+            
+    def _reused_root(self, game, mover):
+        """The kept subtree for the game's position if it follows on from the last move, else a new root."""
+        root, cells = self._root, self._root_cells
+        self._root = self._root_cells = None
+        if root is not None and len(cells) == len(game.cells):
+            changed = [i for i in range(len(cells)) if cells[i] != game.cells[i]]
+            if not changed and root.mover == mover:
+                return root
+            if len(changed) == 1 and not cells[changed[0]] and root.mover != mover:
+                for child in root.children:
+                    if child.move == changed[0]:
+                        child.parent = None
+                        return child
+        return _Node(None, mover, None, game.empty_count, None)
+        
+    def _search(self, root, cells, size, win_length, deadline):
+        """Grow the tree from root (position cells) until deadline; returns the simulations run."""
+        rng = self._rng
+        exploration = self.exploration
+        simulations = 0
+        # At least one simulation whatever the budget, so that the root always has a move
+        while not simulations or (simulations != self.max_simulations
+                                  and time.perf_counter() < deadline):
+            board = bytearray(cells)
+            node = root
+            
+            # Selection: descend through fully expanded nodes by UCT
+            while node.result is None and node.untried is not None and not node.untried:
+                log_visits = math.log(node.visits)
+                node = max(node.children, key=lambda child: child.wins / child.visits
+                           + exploration * math.sqrt(log_visits / child.visits))
+                board[node.move] = node.mover
+            
+            # Expansion: add one child for an untried move
+            if node.result is None:
+                if node.untried is None:
+                    node.untried = [i for i in range(len(board)) if not board[i]]
+                    rng.shuffle(node.untried)
+                move = node.untried.pop()
+                mover = 3 - node.mover
+                board[move] = mover
+                if line_through(board, size, win_length, move):
+                    result = mover
+                elif node.empty == 1:
+                    result = 0
+                else:
+                    result = None
+                child = _Node(move, mover, node, node.empty - 1, result)
+                node.children.append(child)
+                node = child
+            
+            # Rollout: random moves to the end of the game
+            winner = node.result
+            if winner is None:
+                empty = [i for i in range(len(board)) if not board[i]]
+                rng.shuffle(empty)
+                mover = node.mover
+                winner = 0
+                for index in empty:
+                    mover = 3 - mover
+                    board[index] = mover
+                    if line_through(board, size, win_length, index):
+                        winner = mover
+                        break
+            
+            # Backpropagation
+            while node is not None:
+                node.visits += 1
+                if node.mover == winner:
+                    node.wins += 1
+                elif not winner:
+                    node.wins += 0.5
+                node = node.parent
+            simulations += 1
+        return simulations
+        
+    def _search_in_workers(self, game, mover):
+        """Root parallelization: one tree per worker, visit counts summed per move."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.workers)
+        max_simulations = self.max_simulations
+        if max_simulations is not None:
+            max_simulations = -(-max_simulations // self.workers)
+        futures = [self._executor.submit(_search_worker, bytes(game.cells), game.size,
+                                         game.win_length, mover, game.empty_count,
+                                         self.time_limit, max_simulations, self.exploration,
+                                         self._rng.getrandbits(64))
+                   for _ in range(self.workers)]
+        visits = {}
+        simulations = 0
+        for future in futures:
+            worker_visits, worker_simulations = future.result()
+            simulations += worker_simulations
+            for move, count in worker_visits.items():
+                visits[move] = visits.get(move, 0) + count
+        return visits, simulations
+
+
+def _search_worker(cells, size, win_length, mover, empty, time_limit, max_simulations,
+                   exploration, seed):
+    """Grow one tree in a worker process; returns (visits per move, simulations)."""
+    deadline = time.perf_counter() + time_limit
+    player = MCTSPlayer(time_limit, max_simulations, exploration, reuse_tree=False, seed=seed)
+    root = _Node(None, mover, None, empty, None)
+    simulations = player._search(root, cells, size, win_length, deadline)
+    return {child.move: child.visits for child in root.children}, simulations
+
+
+class _BoardRow:
+    """One row of TicTacToe.board, read from and written to the game's cells."""
+    
+    def __init__(self, game, row):
+        self._game = game
+        self._offset = row * game.size
+        
+    def __getitem__(self, col):
+        return self._game._cell(self._offset + range(self._game.size)[col])
+        
+    def __setitem__(self, col, mark):
+        self._game._set_cell(self._offset + range(self._game.size)[col], mark)
+        
+    def __len__(self):
+        return self._game.size
+        
+    def __iter__(self):
+        return (self._game._cell(self._offset + col) for col in range(self._game.size))
+        
+    def __eq__(self, other):
+        return list(self) == other
+        
+    def __repr__(self):
+        return repr(list(self))
+
+
+class _Board:
+    """
+    TicTacToe.board as a size x size grid of ' ', 'X' and 'O'.  Reads and
+    writes go to the game's cells and bitboards, so board[row][col] = 'X'
+    and board[row] = [...] work as they would on nested lists.
+    """
+    
+    def __init__(self, game):
+        self._game = game
+        
+    def __getitem__(self, row):
+        return _BoardRow(self._game, range(self._game.size)[row])
+        
+    def __setitem__(self, row, marks):
+        target = _BoardRow(self._game, range(self._game.size)[row])
+        for col, mark in enumerate(marks):
+            target[col] = mark
+            
+    def __len__(self):
+        return self._game.size
+        
+    def __iter__(self):
+        return (_BoardRow(self._game, row) for row in range(self._game.size))
+        
+    def __eq__(self, other):
+        return [list(row) for row in self] == other
+        
+    def __repr__(self):
+        return repr([list(row) for row in self])
+
 
 class TicTacToe:
-    def __init__(self):
-        """Initialize the game with an empty 3x3 board."""
-        self.board = [[' ' for _ in range(3)] for _ in range(3)]
-        self.current_player = 'X'
-        self.game_over = False
-        self.winner = None
+    def __init__(self, size=3, win_length=None):
+        """
+        Initialize the game with an empty board.
+        
+        Args:
+            size: Rows and columns on the board (3 for the classic game)
+            win_length: Marks in a row needed to win; defaults to
+                min(size, 5), so 3 on the classic board and 5 (gomoku) on
+                larger ones
+        """
+        if win_length is None:
+            win_length = min(size, 5)
+        if size < 1 or not 1 <= win_length <= size:
+            raise ValueError(f"Cannot get {win_length} in a row on a {size}x{size} board")
+        self.size = size
+        self.win_length = win_length
+        self._classic = size == 3 and win_length == 3
+        self.computer = None
+        self.computer_mark = 'O'
+        self.renderer = ConsoleRenderer()
+        self.reset_game()
+        
+    @property
+    def board(self):
+        """The board as rows of ' ', 'X' and 'O', backed by the cells."""
+        return _Board(self)
+        
+    @board.setter
+    def board(self, rows):
+        self._load_bitboards(0, 0)
+        for row, marks in enumerate(rows):
+            self.board[row] = marks
+            
+    @property
+    def x_bits(self):
+        """Bitboard of X's marks: bit i is set when board index i holds X."""
+        return self._x_bits
+        
+    @x_bits.setter
+    def x_bits(self, bits):
+        self._load_bitboards(bits, self._o_bits)
+        
+    @property
+    def o_bits(self):
+        """Bitboard of O's marks."""
+        return self._o_bits
+        
+    @o_bits.setter
+    def o_bits(self, bits):
+        self._load_bitboards(self._x_bits & ~bits, bits)
+        
+    def _load_bitboards(self, x_bits, o_bits):
+        """Set the whole position from two bitboards (X wins any shared square)."""
+        cell_count = len(self.cells)
+        x_bits &= (1 << cell_count) - 1
+        o_bits &= ~x_bits & ((1 << cell_count) - 1)
+        self._x_bits, self._o_bits = x_bits, o_bits
+        for index in range(cell_count):
+            self.cells[index] = 1 if x_bits >> index & 1 else 2 if o_bits >> index & 1 else 0
+        self.empty_count = cell_count - popcount(x_bits | o_bits)
+        self._edited = True
+        
+    def _cell(self, index):
+        """The mark at board index 0 to size * size - 1."""
+        return _MARKS[self.cells[index]]
+        
+    def _set_cell(self, index, mark):
+        """Put mark (' ', 'X' or 'O') at a board index."""
+        code = _CODES.get(mark)
+        if code is None:
+            raise ValueError(f"Invalid mark: {mark!r}")
+        bit = 1 << index
+        self._x_bits &= ~bit
+        self._o_bits &= ~bit
+        if code == 1:
+            self._x_bits |= bit
+        elif code == 2:
+            self._o_bits |= bit
+        self.empty_count += (code == 0) - (self.cells[index] == 0)
+        self.cells[index] = code
+        self._edited = True
         
     def display_board(self):
-        """Display the current state of the game board."""
-        os.system('cls' if os.name == 'nt' else 'clear')
-        print("\n" + "="*30)
-        print("    TIC-TAC-TOE GAME")
-        print("="*30)
-        print(f"   Current Player: {self.current_player}")
-        print("-"*30)
-        print("   Position Guide:")
-        print("   1 | 2 | 3")
-        print("  ---|---|---")
-        print("   4 | 5 | 6") 
-        print("  ---|---|---")
-        print("   7 | 8 | 9")
-        print("-"*30)
-        print("   Current Board:")
-        
-        for i in range(3):
-            row = f"   {self.board[i][0]} | {self.board[i][1]} | {self.board[i][2]}"
-            print(row)
-            if i < 2:
-                print("  ---|---|---")
-        print("-"*30)
+        """Display the current state of the game board, redrawing only what changed."""
+        self.renderer.render(self.board_lines())
+        
+    def board_lines(self):
+        """The game screen as a list of lines."""
+        width = len(str(self.size * self.size))
+        separator = "  " + "|".join(["-" * (width + 2)] * self.size)
+        lines = [
+            "",
+            "="*30,
+            "    TIC-TAC-TOE GAME",
+            "="*30,
+            f"   Current Player: {self.current_player}",
+            "-"*30,
+            "   Position Guide:",
+        ]
+        for row in range(self.size):
+            numbers = range(row * self.size + 1, (row + 1) * self.size + 1)
+            lines.append("   " + " | ".join(str(number).rjust(width) for number in numbers))
+            if row < self.size - 1:
+                lines.append(separator)
+        lines.append("-"*30)
+        lines.append("   Current Board:")
+        
+        for i, marks in enumerate(self.board):
+            lines.append("   " + " | ".join(mark.rjust(width) for mark in marks))
+            if i < self.size - 1:
+                lines.append(separator)
+        lines.append("-"*30)
+        return lines
         
     def get_position_from_number(self, num):
-        """Convert position number (1-9) to row, col coordinates."""
+        """Convert position number (1 to size * size) to row, col coordinates."""
         num -= 1  # Convert to 0-based indexing
-        row = num // 3
-        col = num % 3
+        row = num // self.size
+        col = num % self.size
         return row, col
         
     def is_valid_move(self, position):
         """Check if the move is valid (position is empty and in range)."""
-        if position < 1 or position > 9:
-            return False, "Position must be between 1 and 9!"
+        cell_count = len(self.cells)
+        if position < 1 or position > cell_count:
+            return False, f"Position must be between 1 and {cell_count}!"
             
-        row, col = self.get_position_from_number(position)
-        if self.board[row][col] != ' ':
+        if self.cells[position - 1]:
             return False, "Position already taken!"
             
         return True, ""
         
     def make_move(self, position):
         """Make a move on the board."""
-        row, col = self.get_position_from_number(position)
-        self.board[row][col] = self.current_player
+        index = position - 1
+        bit = 1 << index
+        if not self.cells[index]:
+            self.empty_count -= 1
+        if self.current_player == 'X':
+            self.cells[index] = 1
+            self._x_bits |= bit
+            self._o_bits &= ~bit
+        else:
+            self.cells[index] = 2
+            self._o_bits |= bit
+            self._x_bits &= ~bit
+        self.last_move = index
         
     def check_winner(self):
-        """Check if there's a winner or if the game is a tie."""
-        # Check rows
-        for row in self.board:
-            if row[0] == row[1] == row[2] != ' ':
-                return row[0]
-                
-        # Check columns
-        for col in range(3):
-            if self.board[0][col] == self.board[1][col] == self.board[2][col] != ' ':
-                return self.board[0][col]
-                
-        # Check diagonals
-        if self.board[0][0] == self.board[1][1] == self.board[2][2] != ' ':
-            return self.board[0][0]
-            
-        if self.board[0][2] == self.board[1][1] == self.board[2][0] != ' ':
-            return self.board[0][2]
-            
-        # Check for tie (board full)
-        if all(self.board[i][j] != ' ' for i in range(3) for j in range(3)):
-            return 'TIE'
-            
+        """
+        Check if there's a winner or if the game is a tie.
+        
+        A move can only complete the 4 lines through it, so after make_move
+        just those are walked, O(win_length), and the running empty count
+        makes the tie check O(1).  The board is scanned in full only after
+        it was edited directly.
+        """
+        if self._classic:
+            return bitboard_winner(self._x_bits, self._o_bits)
+        if self._edited:
+            winner = self._scan_winner()
+            if winner:
+                return winner
+            self._edited = False  # No lines: later moves can be checked alone
+        elif self.last_move is not None and self._has_line_through(self.last_move):
+            return _MARKS[self.cells[self.last_move]]
+        return 'TIE' if self.empty_count == 0 else None
+        
+    def _has_line_through(self, index):
+        """Whether the mark at index is part of win_length in a row."""
+        return line_through(self.cells, self.size, self.win_length, index)
+        
+    def _scan_winner(self):
+        """'X' or 'O' if either has a line anywhere on the board, else None."""
+        for code in (1, 2):
+            for index, cell in enumerate(self.cells):
+                if cell == code and self._has_line_through(index):
+                    return _MARKS[code]
         return None
         
     def switch_player(self):
@@ -99,17 +673,26 @@ class TicTacToe:
         print("="*40)
         print("   Instructions:")
         print("   - Players alternate between X and O")
-        print("   - Enter a number (1-9) to place your mark")
-        print("   - Get 3 in a row to win!")
+        print(f"   - Enter a number (1-{len(self.cells)}) to place your mark")
+        print(f"   - Get {self.win_length} in a row to win!")
         print("   - Press Enter to start...")
         input()
+        self.choose_opponent()
+        self.renderer.reset()  # The welcome text is on screen, not a board
         
         while not self.game_over:
             self.display_board()
             
+            if self.computer is not None and self.current_player == self.computer_mark:
+                position = self.computer.choose_move(self)
+                print(f"\n   Computer plays {position} ({self.computer.last_search.describe()})")
+                input("   Press Enter to continue...")
+                self.play_move(position)
+                continue
+            
             # Get player input
             try:
-                position = input(f"\n   Player {self.current_player}, enter position (1-9) or 'q' to quit: ").strip()
+                position = input(f"\n   Player {self.current_player}, enter position (1-{len(self.cells)}) or 'q' to quit: ").strip()
                 
                 if position.lower() == 'q':
                     print("\n   Thanks for playing! Goodbye!")
@@ -124,30 +707,10 @@ class TicTacToe:
                     input("   Press Enter to continue...")
                     continue
                     
-                self.make_move(position)
-                
-                # Check for winner
-                result = self.check_winner()
-                if result:
-                    self.display_board()
-                    if result == 'TIE':
-                        print("\n" + "="*30)
-                        print("     IT'S A TIE!")
-                        print("     Good game!")
-                        print("="*30)
-                    else:
-                        print("\n" + "="*30)
-                        print(f"     PLAYER {result} WINS!")
-                        print("     Congratulations!")
-                        print("="*30)
-                    self.game_over = True
-                    self.winner = result
-                else:
-                    # Switch to other player
-                    self.switch_player()
+                self.play_move(position)
                     
             except ValueError:
-                print("\n   Please enter a valid number (1-9) or 'q' to quit!")
+                print(f"\n   Please enter a valid number (1-{len(self.cells)}) or 'q' to quit!")
                 input("   Press Enter to continue...")
             except KeyboardInterrupt:
                 print("\n\n   Game interrupted. Goodbye!")
@@ -156,6 +719,43 @@ class TicTacToe:
         # Ask if they want to play again
         self.ask_play_again()
         
+    def choose_opponent(self):
+        """Ask whether O is a second player or the computer."""
+        while True:
+            choice = input("\n   Play against (1) another player or (2) the computer? ").strip()
+            if choice == '1':
+                self.computer = None
+                return
+            if choice == '2':
+                # Perfect play on the classic board; tree search on larger ones
+                self.computer = perfect_player() if self._classic else MCTSPlayer()
+                return
+            print("   Please enter 1 or 2.")
+            
+    def play_move(self, position):
+        """Make a valid move, then end the game or pass the turn."""
+        self.make_move(position)
+        
+        # Check for winner
+        result = self.check_winner()
+        if result:
+            self.display_board()
+            if result == 'TIE':
+                print("\n" + "="*30)
+                print("     IT'S A TIE!")
+                print("     Good game!")
+                print("="*30)
+            else:
+                print("\n" + "="*30)
+                print(f"     PLAYER {result} WINS!")
+                print("     Congratulations!")
+                print("="*30)
+            self.game_over = True
+            self.winner = result
+        else:
+            # Switch to other player
+            self.switch_player()
+        
     def ask_play_again(self):
         """Ask if players want to play again."""
         while True:
@@ -176,15 +776,24 @@ class TicTacToe:
                 
     def reset_game(self):
         """Reset the game for a new round."""
-        self.board = [[' ' for _ in range(3)] for _ in range(3)]
+        self.cells = bytearray(self.size * self.size)
+        self._x_bits = 0
+        self._o_bits = 0
+        self.empty_count = len(self.cells)
+        self.last_move = None
+        self._edited = False
         self.current_player = 'X'
         self.game_over = False
         self.winner = None
 
-def main():
+def main(argv=None):
     """Main function to run the Tic-Tac-Toe game."""
+    parser = argparse.ArgumentParser(description="Play Tic-Tac-Toe, or K in a row on a larger board.")
+    parser.add_argument("--size", type=int, default=3, help="rows and columns (default: 3)")
+    parser.add_argument("--win-length", type=int, help="marks in a row to win (default: min(size, 5))")
+    args = parser.parse_args(argv)
     try:
-        game = TicTacToe()
+        game = TicTacToe(args.size, args.win_length)
         game.play_game()
     except KeyboardInterrupt:
         print("\n\nGame interrupted. Goodbye!")
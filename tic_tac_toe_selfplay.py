@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Tic-Tac-Toe Self-Play
+=====================
+Plays large numbers of headless games between two policies, with no
+input or output, to compare strategies and stress the game logic.
+
+A policy is a function policy(game, rng) returning the position to play
+for game.current_player; rng is the random.Random of the games being
+played, so runs are repeatable.  Built-in policies, by name:
+
+    random   any empty square
+    greedy   win at once if possible, else block, else random
+    perfect  a random move among those keeping the solved value (3x3 only)
+
+Games are split into shards of chunk_size games.  Shard i of a run with
+seed s draws from its own random.Random("s/i"), so results depend only
+on the seed, never on how many worker processes played the shards.
+
+Usage:
+    python tic_tac_toe_selfplay.py --x random --o perfect --games 1000000
+    python tic_tac_toe_selfplay.py --size 9 --win-length 5 --x greedy --o random
+"""
+
+import argparse
+import os
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from tic_tac_toe import TicTacToe, line_through
+from tic_tac_toe_solver import default_table
+
+DEFAULT_CHUNK_SIZE = 10000
+
+
+def random_policy(game, rng):
+    """Any empty square."""
+    return rng.choice([i for i, cell in enumerate(game.cells) if not cell]) + 1
+
+
+def greedy_policy(game, rng):
+    """Win at once if possible, else block the opponent's win, else any empty square."""
+    cells, size, win_length = game.cells, game.size, game.win_length
+    empty = [i for i, cell in enumerate(cells) if not cell]
+    mover = 1 if game.current_player == 'X' else 2
+    for code in (mover, 3 - mover):
+        for index in empty:
+            cells[index] = code  # Try the square, then put it back
+            completes = line_through(cells, size, win_length, index)
+            cells[index] = 0
+            if completes:
+                return index + 1
+    return rng.choice(empty) + 1
+
+
+def perfect_policy(game, rng):
+    """A random move among those that keep the solved value of the position."""
+    if (game.size, game.win_length) != (3, 3):
+        raise ValueError("Perfect play is only solved for the classic 3x3 game")
+    table = default_table()
+    x_bits, o_bits = game.x_bits, game.o_bits
+    value = table.lookup(x_bits, o_bits).value
+    moves = []
+    for position in range(1, 10):
+        bit = 1 << (position - 1)
+        if (x_bits | o_bits) & bit:
+            continue
+        if game.current_player == 'X':
+            child = table.lookup(x_bits | bit, o_bits)
+        else:
+            child = table.lookup(x_bits, o_bits | bit)
+        if -child.value == value:
+            moves.append(position)
+    return rng.choice(moves)
+
+
+POLICIES = {
+    "random": random_policy,
+    "greedy": greedy_policy,
+    "perfect": perfect_policy,
+}
+
+
+class SelfPlayStats:
+    """Outcomes and lengths (in moves) of a batch of games, from X's side: X moves first."""
+
+    def __init__(self):
+        self.x_wins = 0
+        self.o_wins = 0
+        self.draws = 0
+        self.lengths = Counter()
+
+    @property
+    def games(self):
+        """Number of games counted."""
+        return self.x_wins + self.o_wins + self.draws
+
+    @property
+    def mean_length(self):
+        """Average moves per game."""
+        games = self.games
+        return sum(length * count for length, count in self.lengths.items()) / games if games else 0.0
+
+    def add(self, result, length):
+        """Count one game: result is 'X', 'O' or 'TIE'."""
+        if result == 'X':
+            self.x_wins += 1
+        elif result == 'O':
+            self.o_wins += 1
+        else:
+            self.draws += 1
+        self.lengths[length] += 1
+
+    def merge(self, other):
+        """Add another batch's counts to these."""
+        self.x_wins += other.x_wins
+        self.o_wins += other.o_wins
+        self.draws += other.draws
+        self.lengths.update(other.lengths)
+
+    def __eq__(self, other):
+        return (isinstance(other, SelfPlayStats)
+                and (self.x_wins, self.o_wins, self.draws, self.lengths)
+                == (other.x_wins, other.o_wins, other.draws, other.lengths))
+
+    def __repr__(self):
+        return (f"SelfPlayStats(x_wins={self.x_wins}, o_wins={self.o_wins}, draws={self.draws}, "
+                f"mean_length={self.mean_length:.2f})")
+
+
+def _policy(policy):
+    """A policy function from a name in POLICIES or the function itself."""
+    if callable(policy):
+        return policy
+    try:
+        return POLICIES[policy]
+    except KeyError:
+        raise ValueError(f"Unknown policy {policy!r}; choose from {', '.join(POLICIES)}") from None
+
+
+def _play_shard(x_policy, o_policy, games, seed, size, win_length):
+    """Play one shard of games with its own random stream; returns its SelfPlayStats."""
+    players = {'X': _policy(x_policy), 'O': _policy(o_policy)}
+    rng = random.Random(seed)
+    game = TicTacToe(size, win_length)
+    cell_count = len(game.cells)
+    stats = SelfPlayStats()
+    for _ in range(games):
+        game.reset_game()
+        while True:
+            game.make_move(players[game.current_player](game, rng))
+            result = game.check_winner()
+            if result:
+                break
+            game.switch_player()
+        stats.add(result, cell_count - game.empty_count)
+    return stats
+
+
+def play_games(x_policy, o_policy, games, seed=0, size=3, win_length=None, workers=None,
+               chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Play games between two policies and total the results.
+
+    Args:
+        x_policy, o_policy: Policy names from POLICIES, or policy functions
+            (module-level, so that worker processes can unpickle them)
+        games: Number of games
+        seed: Seed the shards' random streams are derived from
+        size, win_length: Board for TicTacToe
+        workers: Worker processes (default: CPU count); 1 plays in this process
+        chunk_size: Games per shard handed to a worker
+
+    Returns:
+        SelfPlayStats for all the games
+    """
+    if games < 0:
+        raise ValueError("games must not be negative")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    # Unknown policy names fail here rather than in a worker
+    _policy(x_policy)
+    _policy(o_policy)
+    workers = workers or os.cpu_count() or 1
+    shards = [(x_policy, o_policy, min(chunk_size, games - start), f"{seed}/{index}", size,
+               win_length)
+              for index, start in enumerate(range(0, games, chunk_size))]
+
+    total = SelfPlayStats()
+    if workers == 1 or len(shards) <= 1:
+        for shard in shards:
+            total.merge(_play_shard(*shard))
+        return total
+
+    with ProcessPoolExecutor(min(workers, len(shards))) as executor:
+        for stats in executor.map(_play_shard, *zip(*shards)):
+            total.merge(stats)
+    return total
+
+
+def main(argv=None):
+    """Play the games and print the totals."""
+    parser = argparse.ArgumentParser(description="Play headless Tic-Tac-Toe games between policies.")
+    parser.add_argument("--x", default="random", choices=POLICIES, help="policy for X")
+    parser.add_argument("--o", default="random", choices=POLICIES, help="policy for O")
+    parser.add_argument("--games", type=int, default=100000, help="games to play")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the random streams")
+    parser.add_argument("--size", type=int, default=3, help="rows and columns (default: 3)")
+    parser.add_argument("--win-length", type=int, help="marks in a row to win (default: min(size, 5))")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="games per shard handed to a worker")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    try:
+        stats = play_games(args.x, args.o, args.games, args.seed, args.size, args.win_length,
+                           args.workers, args.chunk_size)
+    except ValueError as error:
+        parser.error(str(error))
+    elapsed = time.perf_counter() - start
+
+    games = stats.games
+    if not games:
+        print(f"{args.x} (X) against {args.o} (O): no games played")
+        return
+    print(f"{args.x} (X) against {args.o} (O): {games:,} games in {elapsed:.1f} s "
+          f"({games / elapsed:,.0f} per second)")
+    print(f"  X wins {stats.x_wins:>10,} ({stats.x_wins / games:6.1%})")
+    print(f"  O wins {stats.o_wins:>10,} ({stats.o_wins / games:6.1%})")
+    print(f"  Draws  {stats.draws:>10,} ({stats.draws / games:6.1%})")
+    print(f"  Moves per game: mean {stats.mean_length:.2f}, "
+          f"shortest {min(stats.lengths)}, longest {max(stats.lengths)}")
+
+
+if __name__ == "__main__":
+    main()
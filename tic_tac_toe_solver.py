@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Tic-Tac-Toe Solver
+==================
+Solves every reachable Tic-Tac-Toe position once, offline, and stores the
+minimax value and best move of each in a compact binary table.  At run time
+the table is memory-mapped, so perfect play is a single lookup with no
+search and no start-up cost.
+
+Table file: a 16-byte header (8-byte magic, uint32 format version, uint32
+reachable position count), then one byte for each of the 3**9 boards,
+indexed by the board read as a base-3 number (square p counts 3**(p - 1)
+times 0 for empty, 1 for X and 2 for O).  A byte is 0 for a board that
+cannot occur in play; otherwise bit 7 is set, bits 2-5 hold the best move
+(0 when the game is over) and bits 0-1 hold the value for the player to
+move plus 1 (0 loss, 1 draw, 2 win).
+
+Usage:
+    python tic_tac_toe_solver.py              # rewrite tic_tac_toe_solved.bin
+    python tic_tac_toe_solver.py table.bin
+"""
+
+import argparse
+import mmap
+import os
+import struct
+from collections import namedtuple
+
+from tic_tac_toe import bitboard_winner, popcount
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tic_tac_toe_solved.bin")
+FORMAT_VERSION = 1
+BOARD_COUNT = 3 ** 9
+# Positions that can occur in play; a table holding any other count is stale
+REACHABLE_POSITIONS = 5478
+
+_MAGIC = b"TTTSOLV\0"
+_HEADER = struct.Struct("<8sII")
+_REACHABLE = 0x80
+
+# Base-3 weight of each bitboard: sum of 3**i over its set bits
+_TERNARY = tuple(sum(3 ** i for i in range(9) if bits >> i & 1) for bits in range(512))
+
+# value: 1 if the player to move wins with perfect play, 0 for a draw,
+# -1 for a loss.  move: the best position (1-9), or 0 if the game is over.
+Solution = namedtuple("Solution", ["value", "move"])
+
+
+def board_index(x_bits, o_bits):
+    """The position hash: the board as a base-3 number, a perfect index below 3**9."""
+    return _TERNARY[x_bits] + 2 * _TERNARY[o_bits]
+
+
+def solve():
+    """
+    Negamax over every position reachable from the empty board.
+
+    Returns:
+        Dict mapping (x_bits, o_bits) to (score, best_move) for the player
+        to move.  Scores are positive for a win, negative for a loss and 0
+        for a draw, larger the sooner a win comes (or the later a loss), so
+        the best move also takes the quickest win.
+    """
+    solved = {}
+
+    def search(x_bits, o_bits):
+        key = (x_bits, o_bits)
+        if key in solved:
+            return solved[key][0]
+
+        occupied = x_bits | o_bits
+        x_to_move = popcount(x_bits) == popcount(o_bits)
+        winner = bitboard_winner(x_bits, o_bits)
+        if winner == 'TIE':
+            result = (0, 0)
+        elif winner:  # The player who just moved
+            result = (-(10 - popcount(occupied)), 0)
+        else:
+            result = None
+            for position in range(1, 10):
+                bit = 1 << (position - 1)
+                if occupied & bit:
+                    continue
+                if x_to_move:
+                    score = -search(x_bits | bit, o_bits)
+                else:
+                    score = -search(x_bits, o_bits | bit)
+                if result is None or score > result[0]:
+                    result = (score, position)
+        solved[key] = result
+        return result[0]
+
+    search(0, 0)
+    return solved
+
+
+class SolvedTable:
+    """Perfect-play lookups in a solved table, usually memory-mapped from a file."""
+
+    def __init__(self, data, reachable):
+        """
+        Args:
+            data: BOARD_COUNT bytes in the table file's layout (bytes or an mmap)
+            reachable: Number of reachable positions in data
+        """
+        if len(data) < BOARD_COUNT:
+            raise ValueError("A solved table needs one byte for each of the 3**9 boards")
+        self._data = data
+        self.reachable = reachable
+
+    @classmethod
+    def build(cls) -> "SolvedTable":
+        """Solve the game and hold the table in memory."""
+        solved = solve()
+        data = bytearray(BOARD_COUNT)
+        for (x_bits, o_bits), (score, move) in solved.items():
+            value = (score > 0) - (score < 0)
+            data[board_index(x_bits, o_bits)] = _REACHABLE | move << 2 | (value + 1)
+        return cls(bytes(data), len(solved))
+
+    def save(self, path: str):
+        """Write the table file."""
+        with open(path, "wb") as file:
+            file.write(_HEADER.pack(_MAGIC, FORMAT_VERSION, self.reachable))
+            file.write(self._data[:BOARD_COUNT])
+
+    @classmethod
+    def load(cls, path: str) -> "SolvedTable":
+        """Memory-map a table file written by save."""
+        with open(path, "rb") as file:
+            header = file.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                raise ValueError(f"{path} is not a solved Tic-Tac-Toe table")
+            magic, version, reachable = _HEADER.unpack(header)
+            if magic != _MAGIC:
+                raise ValueError(f"{path} is not a solved Tic-Tac-Toe table")
+            if version != FORMAT_VERSION:
+                raise ValueError(f"{path} uses unsupported format version {version}")
+            if os.path.getsize(path) < _HEADER.size + BOARD_COUNT:
+                raise ValueError(f"{path} is truncated")
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(memoryview(mapped)[_HEADER.size:_HEADER.size + BOARD_COUNT], reachable)
+
+    def lookup(self, x_bits: int, o_bits: int):
+        """The Solution for the player to move, or None for a board that cannot occur."""
+        entry = self._data[_TERNARY[x_bits] + 2 * _TERNARY[o_bits]]
+        if not entry:
+            return None
+        return Solution((entry & 3) - 1, entry >> 2 & 15)
+
+    def best_move(self, game) -> int:
+        """The perfect move (1-9) for the current player of a TicTacToe game."""
+        if (game.size, game.win_length) != (3, 3):
+            raise ValueError("The solved table only covers the classic 3x3 game")
+        solution = self.lookup(game.x_bits, game.o_bits)
+        if solution is None or not solution.move:
+            raise ValueError("The game is over or the position cannot occur in play")
+        return solution.move
+
+
+class TableLookup:
+    """Stands in for a search's statistics: a TablePlayer move is one lookup."""
+
+    def describe(self):
+        """One line for the game to show after the computer's move."""
+        return "looked up in the solved table, no search"
+
+
+class TablePlayer:
+    """A perfect computer opponent that looks every move up in a SolvedTable."""
+
+    def __init__(self, table: SolvedTable):
+        self.table = table
+        self.last_search = TableLookup()
+
+    def choose_move(self, game) -> int:
+        """Return the best position (1-9) for the current player."""
+        return self.table.best_move(game)
+
+
+_default_table = None
+
+
+def default_table() -> SolvedTable:
+    """The table shipped at DEFAULT_PATH, mapped on first use and shared; built if missing."""
+    global _default_table
+    if _default_table is None:
+        if os.path.exists(DEFAULT_PATH):
+            _default_table = SolvedTable.load(DEFAULT_PATH)
+        else:
+            _default_table = SolvedTable.build()
+    return _default_table
+
+
+def main(argv=None):
+    """Solve the game and write the table file."""
+    parser = argparse.ArgumentParser(description="Write the solved Tic-Tac-Toe table.")
+    parser.add_argument("path", nargs="?", default=DEFAULT_PATH, help="table file to write")
+    args = parser.parse_args(argv)
+
+    table = SolvedTable.build()
+    table.save(args.path)
+    print(f"Wrote {table.reachable} positions to {args.path} "
+          f"({os.path.getsize(args.path)} bytes)")
+
+
+if __name__ == "__main__":
+    main()